@@ -6,7 +6,9 @@ Demo script for Public Health Triage Advisor - Hackathon Presentation
 import time
 import sys
 from datetime import datetime
-from public_health_triage_crew.crew import PublicHealthTriageCrew
+from public_health_triage_crew.crew_pool import get_crew_pool
+from public_health_triage_crew.emergency_fast_lane import assess_emergency
+from public_health_triage_crew.demo_utils import PRESENTATION_SCENARIOS
 
 def print_banner():
     """Print a cool banner for the demo"""
@@ -28,14 +30,7 @@ def demo_scenario_1():
     print("🎬 DEMO SCENARIO 1: EMERGENCY CASE")
     print("="*60)
     
-    scenario = {
-        'patient_name': 'Aisha Mohammed',
-        'age': 45,
-        'location': 'Lagos',
-        'symptoms': 'Severe chest pain, difficulty breathing, sweating, and pain radiating to left arm for the past 30 minutes',
-        'topic': 'Public Health Triage Advisor',
-        'current_year': str(datetime.now().year)
-    }
+    scenario = dict(PRESENTATION_SCENARIOS[0], current_year=str(datetime.now().year))
     
     print(f"👤 Patient: {scenario['patient_name']} ({scenario['age']} years old)")
     print(f"📍 Location: {scenario['location']}")
@@ -50,14 +45,7 @@ def demo_scenario_2():
     print("🎬 DEMO SCENARIO 2: MATERNAL HEALTH")
     print("="*60)
     
-    scenario = {
-        'patient_name': 'Fatima Yusuf',
-        'age': 28,
-        'location': 'Kano',
-        'symptoms': 'Pregnant woman in third trimester seeking antenatal care information, immunization schedule for her 2-year-old child, and guidance on nutrition during pregnancy',
-        'topic': 'Public Health Triage Advisor',
-        'current_year': str(datetime.now().year)
-    }
+    scenario = dict(PRESENTATION_SCENARIOS[1], current_year=str(datetime.now().year))
     
     print(f"👤 Patient: {scenario['patient_name']} ({scenario['age']} years old)")
     print(f"📍 Location: {scenario['location']}")
@@ -72,14 +60,7 @@ def demo_scenario_3():
     print("🎬 DEMO SCENARIO 3: MEDICINE AVAILABILITY")
     print("="*60)
     
-    scenario = {
-        'patient_name': 'Chukwudi Okonkwo',
-        'age': 35,
-        'location': 'Port Harcourt',
-        'symptoms': 'Patient with malaria symptoms seeking information about ACT medications, their availability, pricing, and where to find them locally',
-        'topic': 'Public Health Triage Advisor',
-        'current_year': str(datetime.now().year)
-    }
+    scenario = dict(PRESENTATION_SCENARIOS[2], current_year=str(datetime.now().year))
     
     print(f"👤 Patient: {scenario['patient_name']} ({scenario['age']} years old)")
     print(f"📍 Location: {scenario['location']}")
@@ -109,14 +90,17 @@ def run_demo():
         try:
             scenario = scenario_func()
             
-            # Initialize crew
-            crew = PublicHealthTriageCrew()
+            # Critical cases get rule-based guidance before any LLM call
+            emergency = assess_emergency(scenario)
+            if emergency:
+                print(f"\n⚡ Emergency fast lane ({emergency.elapsed_ms:.1f} ms):")
+                print(emergency.to_markdown())
             
             # Run the scenario
             print(f"\n🔄 Running Scenario {i}...")
             start_time = time.time()
             
-            result = crew.crew().kickoff(inputs=scenario)
+            result = get_crew_pool().kickoff(inputs=scenario)
             
             end_time = time.time()
             duration = end_time - start_time
@@ -1,8 +1,14 @@
 import streamlit as st
 import sys
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from public_health_triage_crew.crew import PublicHealthTriageCrew
+from public_health_triage_crew.crew_pool import get_crew_pool
+from public_health_triage_crew.emergency_fast_lane import assess_emergency
+from public_health_triage_crew.intake import build_crew_inputs, combine_symptoms
+from public_health_triage_crew.result_cache import get_result_cache
+from public_health_triage_crew.streaming import FinalAnswerStream
 
 # Page configuration
 st.set_page_config(
@@ -42,6 +48,48 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Streamlit sections for the specialist tasks, in display order
+SPECIALIST_SECTIONS = {
+    "public_health_triage_task": "🏥 Symptom Triage",
+    "maternal_child_health_task": "👶 Maternal & Child Health",
+    "medicine_availability_locator_task": "💊 Medicine Availability",
+    "health_finance_coach_task": "💰 Healthcare Financing",
+}
+
+def run_assessment_with_progress(inputs, section_placeholders, report_placeholder, model=None):
+    """Run the crew in a worker thread and render results as they arrive
+    
+    Streamlit elements may only be updated from the script thread, so the crew
+    callbacks push updates onto a queue that this thread drains. model overrides
+    the per-agent model tiers; None keeps them.
+    """
+    updates = queue.Queue()
+    report = FinalAnswerStream()
+    
+    def render(kind, payload):
+        if kind == "task" and payload.name in section_placeholders:
+            section_placeholders[payload.name].markdown(payload.raw)
+        elif kind == "chunk":
+            visible = report.feed(payload)
+            if visible:
+                report_placeholder.markdown(visible + " ▌")
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(
+            get_crew_pool(model).kickoff,
+            inputs,
+            task_callback=lambda output: updates.put(("task", output)),
+            stream_callback=lambda chunk: updates.put(("chunk", chunk)),
+        )
+        while not future.done():
+            try:
+                render(*updates.get(timeout=0.1))
+            except queue.Empty:
+                continue
+        while not updates.empty():
+            render(*updates.get_nowait())
+        return future.result()
+
 def main():
     # Header
     st.markdown('<h1 class="main-header">🏥 Nigerian Health Triage Advisor</h1>', unsafe_allow_html=True)
@@ -51,18 +99,22 @@ def main():
     with st.sidebar:
         st.header("⚙️ Configuration")
         
-        # Model selection
+        # Model selection ("Auto" runs each agent on its model tier from agents.yaml)
         model = st.selectbox(
             "Select AI Model",
-            ["gemini-1.5-flash", "gemini-1.5-pro"],
+            ["Auto (tiered)", "gemini-1.5-flash", "gemini-1.5-pro"],
             index=0
         )
+        model = None if model.startswith("Auto") else model
         
         st.markdown("---")
         st.markdown("### 📊 Quick Stats")
         st.metric("Agents", "5")
         st.metric("Tasks", "5")
         st.metric("Coverage", "Full Healthcare")
+        result_cache = get_result_cache()
+        if result_cache is not None:
+            st.metric("Report Cache Hit Rate", f"{result_cache.hit_rate:.0%}")
         
         st.markdown("---")
         st.markdown("### 📞 Emergency Numbers")
@@ -73,6 +125,11 @@ def main():
         - **Lagos State Emergency:** 767/199
         """)
         
+        st.markdown("---")
+        if st.button("🔄 Reload Crew Config", use_container_width=True):
+            get_crew_pool(model).reload()
+            st.success("✅ Crew configuration reloaded")
+        
         st.markdown("---")
         st.markdown("### ⚠️ Disclaimer")
         st.warning("This tool is for educational purposes only. Always consult healthcare professionals for medical advice.")
@@ -125,6 +182,11 @@ def main():
             if is_emergency:
                 st.error("🚨 If this is truly an emergency, please call 112 or go to the nearest hospital immediately!")
             
+            full_report_for_emergency = st.checkbox(
+                "Also generate the full AI report after the emergency guidance",
+                help="Emergency guidance is shown instantly; the full multi-agent report takes longer"
+            )
+            
             st.markdown("---")
             
             # Symptoms Section
@@ -212,23 +274,6 @@ def main():
             st.error("❌ Please describe the symptoms in the text area above.")
             return
         
-        # Handle emergency cases
-        if is_emergency:
-            st.error("🚨 EMERGENCY ALERT: Please call emergency services immediately!")
-            st.markdown("""
-            <div class="emergency-alert">
-                <h3>🚨 IMMEDIATE ACTION REQUIRED</h3>
-                <p><strong>Emergency Numbers:</strong></p>
-                <ul>
-                    <li><strong>National Emergency:</strong> 112</li>
-                    <li><strong>Police:</strong> 199</li>
-                    <li><strong>Lagos State Emergency:</strong> 767/199</li>
-                </ul>
-                <p><strong>Go to the nearest hospital immediately!</strong></p>
-            </div>
-            """, unsafe_allow_html=True)
-            return
-        
         # Collect selected symptoms
         selected_symptoms_list = []
         if fever_check: selected_symptoms_list.append("Fever")
@@ -245,9 +290,7 @@ def main():
         if nausea_check: selected_symptoms_list.append("Nausea")
         
         # Format comprehensive symptoms
-        comprehensive_symptoms = symptoms_description.strip()
-        if selected_symptoms_list:
-            comprehensive_symptoms += f"\n\nAdditional symptoms checked: {', '.join(selected_symptoms_list)}"
+        comprehensive_symptoms = combine_symptoms(symptoms_description, selected_symptoms_list)
         
         # Show what we collected (for debugging)
         with st.expander("Debug Info - Form Data Collected"):
@@ -256,53 +299,62 @@ def main():
             st.write(f"Selected Symptoms: {selected_symptoms_list}")
             st.write(f"Comprehensive Symptoms: '{comprehensive_symptoms}'")
         
+        # Prepare inputs for the crew
+        inputs = build_crew_inputs(
+            patient_name=patient_name,
+            age=age,
+            gender=gender,
+            location=location,
+            symptoms_description=symptoms_description,
+            symptom_severity=severity,
+            selected_symptoms=selected_symptoms_list,
+            phone=phone,
+            medical_history=medical_history,
+            is_emergency=is_emergency,
+        )
+        
+        # Emergency fast lane: rule-based guidance before any LLM call
+        emergency = assess_emergency(inputs)
+        if emergency:
+            st.error("🚨 EMERGENCY ALERT: Please call emergency services immediately!")
+            st.markdown(emergency.to_markdown())
+            st.caption(f"Emergency guidance generated in {emergency.elapsed_ms:.1f} ms")
+            if is_emergency and not full_report_for_emergency:
+                return
+            st.info("🤖 The full assessment report will follow below.")
+        
         # Show processing
         with st.spinner("🤖 AI Agents are analyzing your health information..."):
             try:
-                # Create crew instance
-                crew = PublicHealthTriageCrew()
-                
-                # Prepare inputs for the crew
-                inputs = {
-                    # Patient information
-                    'patient_name': patient_name.strip(),
-                    'age': str(age),
-                    'gender': gender,
-                    'location': location.strip() if location else "Nigeria",
-                    'phone': phone.strip() if phone else "Not provided",
-                    'medical_history': medical_history.strip() if medical_history else "None reported",
-                    
-                    # Symptoms information - the key data
-                    'symptoms': comprehensive_symptoms,
-                    'symptom_severity': severity,
-                    'selected_symptoms': selected_symptoms_list,
-                    
-                    # System information
-                    'topic': 'Nigerian Public Health Triage Assessment',
-                    'current_year': str(datetime.now().year),
-                    'assessment_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    
-                    # Additional context
-                    'country': 'Nigeria',
-                    'healthcare_system': 'Nigerian Healthcare System'
-                }
-                
                 # Show inputs for debugging
                 with st.expander("Debug Info - Inputs to CrewAI"):
                     st.json(inputs)
                 
-                # Run the crew
-                result = crew.crew().kickoff(inputs=inputs)
-                
-                # Display results
-                st.success("✅ Health Assessment Complete!")
+                # Specialist sections fill in as soon as each agent finishes
+                st.markdown("## 🧑‍⚕️ Specialist Findings")
+                section_placeholders = {}
+                for task_name, title in SPECIALIST_SECTIONS.items():
+                    with st.expander(title, expanded=True):
+                        section_placeholders[task_name] = st.empty()
+                        section_placeholders[task_name].caption("⏳ Waiting for this specialist...")
                 
                 # Create tabs for results
                 tab1, tab2, tab3 = st.tabs(["📋 Full Report", "📊 Summary", "📥 Download"])
                 
                 with tab1:
                     st.markdown("## 📋 Your Health Assessment Report")
-                    st.markdown(result)
+                    report_placeholder = st.empty()
+                
+                # Run the crew on a warm instance from the shared pool
+                result = run_assessment_with_progress(inputs, section_placeholders, report_placeholder, model)
+                report_placeholder.markdown(str(result))
+                completed_tasks = {output.name for output in result.tasks_output}
+                for task_name, placeholder in section_placeholders.items():
+                    if task_name not in completed_tasks:
+                        placeholder.caption("➖ Not needed for this patient")
+                
+                # Display results
+                st.success("✅ Health Assessment Complete!")
                 
                 with tab2:
                     st.markdown("## 📊 Assessment Summary")
@@ -0,0 +1,226 @@
+"""
+Batch triage over bulk intake files (JSONL or CSV)
+"""
+
+import csv
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .crew_pool import get_crew_pool
+from .emergency_fast_lane import assess_emergency
+from .intake import build_crew_inputs
+from .tools.weather_risk import WeatherRisk, get_weather_risks
+
+logger = logging.getLogger(__name__)
+
+BATCH_CONCURRENCY = int(os.getenv("TRIAGE_BATCH_CONCURRENCY", "4"))
+
+# Records read ahead together so their weather is looked up in one bulk call
+BATCH_CHUNK_SIZE = int(os.getenv("TRIAGE_BATCH_CHUNK_SIZE", "32"))
+
+# Accepted column names for each intake field, first match wins
+FIELD_ALIASES = {
+    "record_id": ("record_id", "id", "patient_id"),
+    "patient_name": ("patient_name", "name"),
+    "age": ("age",),
+    "gender": ("gender", "sex"),
+    "location": ("location", "state", "city"),
+    "phone": ("phone", "phone_number"),
+    "medical_history": ("medical_history", "history"),
+    "symptoms": ("symptoms", "symptoms_description", "additional_symptoms", "complaint"),
+    "selected_symptoms": ("selected_symptoms", "checked_symptoms"),
+    "symptom_severity": ("symptom_severity", "severity"),
+    "is_emergency": ("is_emergency", "emergency"),
+}
+
+_LIST_SEPARATOR = re.compile(r"\s*[;,|]\s*")
+
+
+def _field(record: Dict[str, Any], name: str, default: Any = "") -> Any:
+    for alias in FIELD_ALIASES[name]:
+        value = record.get(alias)
+        if value not in (None, ""):
+            return value
+    return default
+
+
+def _symptom_list(value: Any) -> list:
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value if item]
+    if isinstance(value, dict):
+        # Checkbox style {"fever": True, "cough": False}
+        return [name.replace("_", " ").title() for name, checked in value.items() if checked]
+    return [item for item in _LIST_SEPARATOR.split(str(value or "")) if item]
+
+
+def _truthy(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def read_records(path: str) -> Iterator[Tuple[str, Union[Dict[str, Any], ValueError]]]:
+    """Stream (record_id, record) pairs without loading the file into memory
+
+    Records without an ID column are identified by their line or row number,
+    which stays stable across restarts as long as the file is unchanged. A
+    JSONL line that is not a JSON object is yielded as a ValueError naming
+    the line, so one bad line fails only its own record.
+    """
+    suffix = Path(path).suffix.lower()
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        if suffix == ".csv":
+            for row_number, row in enumerate(csv.DictReader(handle), start=1):
+                yield str(_field(row, "record_id", f"row-{row_number}")), row
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+                except ValueError as e:
+                    yield f"line-{line_number}", ValueError(f"line {line_number}: {e}")
+                    continue
+                yield str(_field(record, "record_id", f"line-{line_number}")), record
+
+
+def record_to_inputs(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a bulk intake record onto the same inputs app.py builds"""
+    return build_crew_inputs(
+        patient_name=str(_field(record, "patient_name", "Unknown")),
+        age=_field(record, "age", "Unknown"),
+        gender=str(_field(record, "gender", "Other")),
+        location=str(_field(record, "location", "")),
+        symptoms_description=str(_field(record, "symptoms")),
+        symptom_severity=str(_field(record, "symptom_severity", "Moderate")),
+        selected_symptoms=_symptom_list(_field(record, "selected_symptoms", [])),
+        phone=str(_field(record, "phone", "")),
+        medical_history=str(_field(record, "medical_history", "")),
+        is_emergency=_truthy(_field(record, "is_emergency", False)),
+    )
+
+
+def completed_ids(output_path: str) -> Set[str]:
+    """IDs already written successfully, so a restarted run can skip them
+
+    The IDs are held in memory for the whole run, so resuming costs memory
+    in proportion to the records already done, unlike the rest of the batch.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partial line from an interrupted write
+            if entry.get("status") == "ok":
+                done.add(str(entry.get("record_id")))
+    return done
+
+
+def weather_for(records: Sequence[Union[Dict[str, Any], ValueError]]) -> List[Optional[WeatherRisk]]:
+    """Weather risks for a chunk of records in one bulk lookup; None where unavailable"""
+    locations = [
+        "" if isinstance(record, ValueError) else str(_field(record, "location", "")).strip() or "Nigeria"
+        for record in records
+    ]
+    try:
+        return get_weather_risks().risks_for(locations)
+    except Exception as e:
+        # Weather is context only; the records are still triaged without it
+        logger.warning("Weather risks for %d records unavailable: %s", len(records), e)
+        return [None] * len(records)
+
+
+def triage_record(
+    record_id: str, record: Union[Dict[str, Any], ValueError], weather: Optional[WeatherRisk] = None
+) -> Dict[str, Any]:
+    """Run one record through the fast lane and the crew
+
+    weather is the record's entry from weather_for(), looked up for its chunk.
+    """
+    started = time.perf_counter()
+    entry: Dict[str, Any] = {"record_id": record_id}
+    try:
+        if isinstance(record, ValueError):
+            raise record
+        inputs = record_to_inputs(record)
+        emergency = assess_emergency(inputs)
+        entry["emergency_findings"] = emergency.findings if emergency else []
+        entry["weather_risks"] = weather.risks if weather else []
+        result = get_crew_pool().kickoff(inputs)
+        entry["status"] = "ok"
+        entry["report"] = result.raw
+        entry["tasks"] = {output.name: output.raw for output in result.tasks_output}
+    except Exception as e:
+        entry["status"] = "error"
+        entry["error"] = str(e)
+    entry["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    concurrency: int = BATCH_CONCURRENCY,
+    resume: bool = True,
+    progress: Optional[Any] = print,
+) -> Dict[str, int]:
+    """Triage every record in input_path, appending results to output_path
+
+    Records are read in chunks of BATCH_CHUNK_SIZE, each sharing one weather
+    lookup. At most `concurrency` records are in flight at once and each
+    result is flushed as soon as it completes, so memory stays flat
+    regardless of file size (apart from the resume IDs, see completed_ids)
+    and an interrupted run loses at most the in-flight records.
+    """
+    skip = completed_ids(output_path) if resume else set()
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+    in_flight = threading.BoundedSemaphore(max(1, concurrency))
+    write_lock = threading.Lock()
+
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as output, \
+            ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+
+        def write(future: Future) -> None:
+            try:
+                entry = future.result()
+                with write_lock:
+                    output.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    output.flush()
+                    counts[entry["status"]] += 1
+                    if progress:
+                        progress(f"[{entry['status']}] {entry['record_id']} ({entry['elapsed_s']}s)")
+            finally:
+                in_flight.release()
+
+        def submit(chunk: List[Tuple[str, Union[Dict[str, Any], ValueError]]]) -> None:
+            weather = weather_for([record for _, record in chunk])
+            for (record_id, record), risk in zip(chunk, weather):
+                in_flight.acquire()
+                executor.submit(triage_record, record_id, record, risk).add_done_callback(write)
+
+        chunk: List[Tuple[str, Union[Dict[str, Any], ValueError]]] = []
+        for record_id, record in read_records(input_path):
+            if record_id in skip:
+                counts["skipped"] += 1
+                continue
+            chunk.append((record_id, record))
+            if len(chunk) >= BATCH_CHUNK_SIZE:
+                submit(chunk)
+                chunk = []
+        if chunk:
+            submit(chunk)
+
+    return counts
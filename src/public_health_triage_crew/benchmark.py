@@ -0,0 +1,289 @@
+"""
+End-to-end latency benchmark over the demo scenarios with a per-task and per-agent breakdown
+"""
+
+import json
+import os
+import platform
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from crewai.utilities.events import crewai_event_bus
+from crewai.utilities.events.agent_events import AgentExecutionCompletedEvent, AgentExecutionStartedEvent
+from crewai.utilities.events.llm_events import LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent
+from crewai.utilities.events.task_events import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent
+from crewai.utilities.events.tool_usage_events import ToolUsageErrorEvent, ToolUsageFinishedEvent
+
+from .crew import HANDOFF_SUMMARIES, PARALLEL_SPECIALISTS, TEMPLATE_REPORT
+from .crew_pool import get_crew_pool
+from .demo_utils import DEMO_SCENARIOS, PRESENTATION_SCENARIOS, demo_scenario_inputs
+from .llm import LLM_BACKEND
+from .model_tiers import MODEL_TIERS
+from .rate_limiter import estimate_tokens
+from .task_cache import get_task_cache
+
+BENCHMARK_ITERATIONS = int(os.getenv("TRIAGE_BENCHMARK_ITERATIONS", "3"))
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Linearly interpolated percentile; 0.0 for no samples"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Count, mean and percentiles of a list of durations in seconds"""
+    summary = {"n": len(values), "mean": round(sum(values) / len(values), 4) if values else 0.0}
+    for q in PERCENTILES:
+        summary[f"p{q}"] = round(percentile(values, q), 4)
+    return summary
+
+
+def benchmark_scenarios() -> List[Tuple[str, Dict[str, Any]]]:
+    """(name, inputs) for demo.py's scenarios followed by the web demo patients"""
+    year = str(datetime.now().year)
+    scenarios = [
+        (f"demo-{index}", dict(scenario, current_year=year))
+        for index, scenario in enumerate(PRESENTATION_SCENARIOS, start=1)
+    ]
+    scenarios += [(f"webdemo-{scenario['name']}", demo_scenario_inputs(scenario)) for scenario in DEMO_SCENARIOS]
+    return scenarios
+
+
+class EventCollector:
+    """Turns crewai events from one kickoff into timings and counters
+
+    Events arrive synchronously on the thread doing the work, so starts are
+    matched to completions by task, agent and thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: Dict[Any, float] = {}
+        self.task_seconds: Dict[str, float] = {}
+        self.agent_seconds: Dict[str, float] = defaultdict(float)
+        self.llm_seconds: List[float] = []
+        self.llm_calls: Dict[str, int] = defaultdict(int)
+        self.prompt_tokens: Dict[str, int] = defaultdict(int)
+        self.completion_tokens: Dict[str, int] = defaultdict(int)
+        self.tool_seconds: Dict[str, List[float]] = defaultdict(list)
+        self.tool_errors: Dict[str, int] = defaultdict(int)
+
+    def _start(self, key: Any) -> None:
+        with self._lock:
+            self._started[key] = time.perf_counter()
+
+    def _stop(self, key: Any) -> Optional[float]:
+        with self._lock:
+            started = self._started.pop(key, None)
+        return None if started is None else time.perf_counter() - started
+
+    def on_task_started(self, source: Any, event: TaskStartedEvent) -> None:
+        self._start(("task", id(event.task)))
+
+    def on_task_finished(self, source: Any, event: Any) -> None:
+        elapsed = self._stop(("task", id(event.task)))
+        if elapsed is not None and event.task is not None:
+            self.task_seconds[event.task.name] = elapsed
+
+    def on_agent_started(self, source: Any, event: AgentExecutionStartedEvent) -> None:
+        self._start(("agent", id(event.agent), id(event.task)))
+
+    def on_agent_completed(self, source: Any, event: AgentExecutionCompletedEvent) -> None:
+        elapsed = self._stop(("agent", id(event.agent), id(event.task)))
+        if elapsed is not None:
+            with self._lock:
+                self.agent_seconds[event.agent.role.strip()] += elapsed
+
+    def on_llm_started(self, source: Any, event: LLMCallStartedEvent) -> None:
+        self._start(("llm", threading.get_ident()))
+        with self._lock:
+            self.prompt_tokens[event.task_name or "unknown"] += estimate_tokens(event.messages or "")
+
+    def on_llm_finished(self, source: Any, event: Any) -> None:
+        elapsed = self._stop(("llm", threading.get_ident()))
+        task = event.task_name or "unknown"
+        with self._lock:
+            self.llm_calls[task] += 1
+            if elapsed is not None:
+                self.llm_seconds.append(elapsed)
+            if isinstance(event, LLMCallCompletedEvent):
+                self.completion_tokens[task] += estimate_tokens(str(event.response))
+
+    def on_tool_finished(self, source: Any, event: ToolUsageFinishedEvent) -> None:
+        with self._lock:
+            self.tool_seconds[event.tool_name].append((event.finished_at - event.started_at).total_seconds())
+
+    def on_tool_error(self, source: Any, event: ToolUsageErrorEvent) -> None:
+        with self._lock:
+            self.tool_errors[event.tool_name] += 1
+
+
+_active: Optional[EventCollector] = None
+_registered = False
+
+
+def _forward(method: str):
+    def handler(source: Any, event: Any) -> None:
+        collector = _active
+        if collector is not None:
+            getattr(collector, method)(source, event)
+    return handler
+
+
+def _ensure_registered() -> None:
+    # Handlers stay registered for the process; they are no-ops between runs
+    global _registered
+    if _registered:
+        return
+    for event_type, method in (
+        (TaskStartedEvent, "on_task_started"),
+        (TaskCompletedEvent, "on_task_finished"),
+        (TaskFailedEvent, "on_task_finished"),
+        (AgentExecutionStartedEvent, "on_agent_started"),
+        (AgentExecutionCompletedEvent, "on_agent_completed"),
+        (LLMCallStartedEvent, "on_llm_started"),
+        (LLMCallCompletedEvent, "on_llm_finished"),
+        (LLMCallFailedEvent, "on_llm_finished"),
+        (ToolUsageFinishedEvent, "on_tool_finished"),
+        (ToolUsageErrorEvent, "on_tool_error"),
+    ):
+        crewai_event_bus.register_handler(event_type, _forward(method))
+    _registered = True
+
+
+def run_once(inputs: Dict[str, Any], cold: bool = True) -> Dict[str, Any]:
+    """Kick off one assessment and return its timings and counters"""
+    global _active
+    _ensure_registered()
+    if cold and get_task_cache() is not None:
+        get_task_cache().clear()
+    collector = EventCollector()
+    _active = collector
+    started = time.perf_counter()
+    try:
+        result = get_crew_pool().kickoff(inputs, use_cache=False)
+        error = None
+    except Exception as e:
+        result = None
+        error = str(e)
+    finally:
+        _active = None
+    usage = result.token_usage if result is not None else None
+    return {
+        "wall_seconds": time.perf_counter() - started,
+        "error": error,
+        "tasks": dict(collector.task_seconds),
+        "agents": dict(collector.agent_seconds),
+        "llm_seconds": list(collector.llm_seconds),
+        "llm_calls": dict(collector.llm_calls),
+        "prompt_tokens": dict(collector.prompt_tokens),
+        "completion_tokens": dict(collector.completion_tokens),
+        "reported_tokens": usage.total_tokens if usage else 0,
+        "tool_seconds": {name: list(values) for name, values in collector.tool_seconds.items()},
+        "tool_errors": dict(collector.tool_errors),
+    }
+
+
+def run_benchmark(iterations: int = BENCHMARK_ITERATIONS, cold: bool = True, progress: Optional[Any] = print) -> Dict[str, Any]:
+    """Run every scenario `iterations` times and aggregate the samples"""
+    runs: List[Dict[str, Any]] = []
+    for iteration in range(1, iterations + 1):
+        for name, inputs in benchmark_scenarios():
+            run = run_once(inputs, cold=cold)
+            run["scenario"] = name
+            run["iteration"] = iteration
+            runs.append(run)
+            if progress:
+                status = "failed" if run["error"] else "ok"
+                progress(f"[{iteration}/{iterations}] {name}: {run['wall_seconds']:.2f}s {status}")
+
+    wall: Dict[str, List[float]] = defaultdict(list)
+    tasks: Dict[str, List[float]] = defaultdict(list)
+    agents: Dict[str, List[float]] = defaultdict(list)
+    tools: Dict[str, List[float]] = defaultdict(list)
+    llm_calls: Dict[str, int] = defaultdict(int)
+    prompt_tokens: Dict[str, int] = defaultdict(int)
+    completion_tokens: Dict[str, int] = defaultdict(int)
+    llm_seconds: List[float] = []
+    for run in runs:
+        wall["all"].append(run["wall_seconds"])
+        wall[run["scenario"]].append(run["wall_seconds"])
+        for task, seconds in run["tasks"].items():
+            tasks[task].append(seconds)
+        for role, seconds in run["agents"].items():
+            agents[role].append(seconds)
+        for tool, values in run["tool_seconds"].items():
+            tools[tool].extend(values)
+        for task, count in run["llm_calls"].items():
+            llm_calls[task] += count
+        for task, count in run["prompt_tokens"].items():
+            prompt_tokens[task] += count
+        for task, count in run["completion_tokens"].items():
+            completion_tokens[task] += count
+        llm_seconds.extend(run["llm_seconds"])
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "backend": LLM_BACKEND,
+            "models": MODEL_TIERS,
+            "parallel_specialists": PARALLEL_SPECIALISTS,
+            "handoff_summaries": HANDOFF_SUMMARIES,
+            "template_report": TEMPLATE_REPORT,
+            "iterations": iterations,
+            "cold": cold,
+            "python": platform.python_version(),
+        },
+        "errors": sum(1 for run in runs if run["error"]),
+        "wall": {name: summarize(values) for name, values in wall.items()},
+        "tasks": {name: summarize(values) for name, values in tasks.items()},
+        "agents": {role: summarize(values) for role, values in agents.items()},
+        "llm": {
+            "latency": summarize(llm_seconds),
+            "calls_per_run": {task: round(count / len(runs), 2) for task, count in llm_calls.items()},
+            "prompt_tokens_per_run": {task: round(count / len(runs)) for task, count in prompt_tokens.items()},
+            "completion_tokens_per_run": {task: round(count / len(runs)) for task, count in completion_tokens.items()},
+            "reported_tokens_per_run": round(sum(run["reported_tokens"] for run in runs) / len(runs)) if runs else 0,
+        },
+        "tools": {name: summarize(values) for name, values in tools.items()},
+        "runs": runs,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Lines describing how p50/p95 moved per section entry between two results"""
+    lines = []
+    for section in ("wall", "tasks", "agents", "tools"):
+        for name, stats in current.get(section, {}).items():
+            before = baseline.get(section, {}).get(name)
+            if not before:
+                continue
+            for key in ("p50", "p95"):
+                old, new = before[key], stats[key]
+                change = f"{(new - old) / old:+.1%}" if old else "n/a"
+                lines.append(f"{section}/{name} {key}: {old:.3f}s -> {new:.3f}s ({change})")
+    return lines
+
+
+def format_report(results: Dict[str, Any]) -> str:
+    """Human-readable table of the aggregated results"""
+    lines = [f"Backend: {results['meta']['backend']}  Iterations: {results['meta']['iterations']}  Errors: {results['errors']}"]
+    for section in ("wall", "tasks", "agents", "tools"):
+        lines.append(f"\n{section.upper():<48} {'n':>4} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for name, stats in sorted(results[section].items(), key=lambda item: -item[1]["p50"]):
+            lines.append(f"{name[:48]:<48} {stats['n']:>4} {stats['p50']:>8.3f} {stats['p95']:>8.3f} {stats['p99']:>8.3f}")
+    lines.append("\nLLM calls per run: " + json.dumps(results["llm"]["calls_per_run"]))
+    lines.append("Estimated prompt tokens per run: " + json.dumps(results["llm"]["prompt_tokens_per_run"]))
+    lines.append("Estimated completion tokens per run: " + json.dumps(results["llm"]["completion_tokens_per_run"]))
+    return "\n".join(lines)
@@ -0,0 +1,114 @@
+"""
+Tool lookups determined by the intake, run concurrently before kickoff and injected into the task descriptions
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from .emergency_fast_lane import hospital_type
+from .tools.emergency_tools import (
+    EmergencyTools,
+    emergency_triage_assessment,
+    get_emergency_contacts,
+    nearest_hospital_finder,
+)
+from .tools.health_tools import disease_outbreak_info, phc_locations, weather_health_risk
+from .tools.tool_cache import ToolMemo, get_tool_memo, is_failure
+
+logger = logging.getLogger(__name__)
+
+# Look the intake's location and symptoms up before kickoff instead of leaving it to agent tool calls
+CONTEXT_PREFETCH = os.getenv("TRIAGE_CONTEXT_PREFETCH", "true").lower() in ("1", "true", "yes")
+
+# Seconds the whole prefetch stage may take; lookups still running are left to the agents
+PREFETCH_TIMEOUT = float(os.getenv("TRIAGE_PREFETCH_TIMEOUT", "5"))
+
+# Lookups run at once, shared by every concurrent kickoff
+PREFETCH_WORKERS = int(os.getenv("TRIAGE_PREFETCH_WORKERS", "8"))
+
+# Placeholder value for a lookup that is disabled, failed or did not finish in time
+NOT_PREFETCHED = "Not looked up in advance; use your tools if you need it."
+
+
+@dataclass(frozen=True)
+class ContextLookup:
+    """A tool call whose arguments follow from the intake, and the task placeholder it fills"""
+
+    placeholder: str
+    tool: Any
+    arguments: Callable[[Mapping[str, Any]], Dict[str, Any]]
+
+
+def _location(inputs: Mapping[str, Any]) -> Dict[str, Any]:
+    return {"location": str(inputs.get("location") or "Nigeria")}
+
+
+def _hospital_arguments(inputs: Mapping[str, Any]) -> Dict[str, Any]:
+    findings = EmergencyTools.detect_critical_symptoms(str(inputs.get("symptoms") or ""))
+    return {**_location(inputs), "emergency_type": hospital_type(findings, inputs.get("age"))}
+
+
+# Arguments are those an agent would pass for the same intake, so its own calls hit the run's memo
+CONTEXT_LOOKUPS = (
+    ContextLookup("emergency_screen", emergency_triage_assessment, lambda inputs: {"symptoms": str(inputs.get("symptoms") or "")}),
+    ContextLookup("emergency_contacts", get_emergency_contacts, _location),
+    ContextLookup("nearest_hospitals", nearest_hospital_finder, _hospital_arguments),
+    ContextLookup("nearby_phcs", phc_locations, _location),
+    ContextLookup("outbreak_context", disease_outbreak_info, _location),
+    ContextLookup("weather_context", weather_health_risk, _location),
+)
+
+CONTEXT_PLACEHOLDERS = tuple(lookup.placeholder for lookup in CONTEXT_LOOKUPS)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """Return the process-wide prefetch thread pool"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="context-prefetch")
+    return _executor
+
+
+def _run(lookup: ContextLookup, inputs: Mapping[str, Any], memo: ToolMemo) -> str:
+    result = memo.call(lookup.tool.name, lookup.tool.func, **lookup.arguments(inputs))
+    return NOT_PREFETCHED if is_failure(result) else str(result).strip()
+
+
+def prefetch_context(
+    inputs: Mapping[str, Any],
+    memo: Optional[ToolMemo] = None,
+    timeout: float = PREFETCH_TIMEOUT,
+    enabled: bool = CONTEXT_PREFETCH,
+) -> Dict[str, str]:
+    """Value of every context placeholder for an intake
+
+    The lookups run concurrently through memo, so tool calls the agents
+    still make with the same arguments are answered from the run's results.
+    Every placeholder is always present; lookups that fail or are still
+    running at the deadline get NOT_PREFETCHED.
+    """
+    if not enabled:
+        return {placeholder: NOT_PREFETCHED for placeholder in CONTEXT_PLACEHOLDERS}
+    memo = memo or get_tool_memo()
+    executor = get_prefetch_executor()
+    futures = {lookup.placeholder: executor.submit(_run, lookup, inputs, memo) for lookup in CONTEXT_LOOKUPS}
+    deadline = time.monotonic() + timeout
+    context = {}
+    for placeholder, future in futures.items():
+        try:
+            context[placeholder] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception as e:
+            logger.warning("Context lookup %s not prefetched: %s", placeholder, str(e) or type(e).__name__)
+            context[placeholder] = NOT_PREFETCHED
+    return context
@@ -2,20 +2,66 @@
 crew file for the Public Health Triage Advisor project
 """
 
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from crewai import Agent, Crew, Process, Task, LLM
 from crewai.project import CrewBase, agent, crew, task
+from crewai.project.utils import memoize
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
+from crewai.agents.agent_builder.utilities.base_token_process import TokenProcess
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.types.usage_metrics import UsageMetrics
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from .tools.health_tools import create_health_tools
+from .tools.health_tools import create_health_tools, medicine_prices_bulk
 from .tools.emergency_tools import create_emergency_tools
+from .tools.custom_tool import create_custom_tools
+from .tools.price_store import MEDICINES_FILE
+from .tools.tool_cache import ToolMemo
+from .task_cache import declared_key_fields, get_task_cache
+from .task_conditions import evaluate, intake_facts, should_run
+from .streaming import stream_task
+from .context_prefetch import prefetch_context
+from .llm import create_llm, requires_api_key
+from .model_tiers import DEFAULT_TIER, ESCALATION_TIER, confidence_issue, tier_model
+from .report_renderer import render_report, write_report
+from .schemas import get_schema
+from .tasks import HANDOFF_INSTRUCTION, AggregatorTask, SpecialistTask
+from .tracing import get_tracer
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini (model can be read at import-time; API key check is deferred)
-GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+# Run the four specialist tasks concurrently and join them in the aggregator
+PARALLEL_SPECIALISTS = os.getenv("TRIAGE_PARALLEL_SPECIALISTS", "true").lower() in ("1", "true", "yes")
+
+# Stream the aggregator's report token by token so the UI can render it progressively
+STREAM_REPORT = os.getenv("TRIAGE_STREAM_REPORT", "true").lower() in ("1", "true", "yes")
+
+# Specialists end with a bounded handoff summary and the aggregator reads only those
+HANDOFF_SUMMARIES = os.getenv("TRIAGE_HANDOFF_SUMMARIES", "true").lower() in ("1", "true", "yes")
+
+# Specialists return their output_schema and the report is rendered locally, without the aggregator LLM
+TEMPLATE_REPORT = os.getenv("TRIAGE_TEMPLATE_REPORT", "false").lower() in ("1", "true", "yes")
+
+# Code object shared by every method wrapped in crewai.project's memoize, and the
+# closure cell holding its results (None if a crewai upgrade changed that layout)
+_MEMOIZED_CODE = memoize(lambda: None).__code__
+_MEMOIZED_CACHE_CELL = _MEMOIZED_CODE.co_freevars.index("cache") if "cache" in _MEMOIZED_CODE.co_freevars else None
+_release_warned = False
+
+
+def _warn_release_unsupported(error: Exception) -> None:
+    """Log, once per process, that crews can no longer be dropped from crewai's memoize caches"""
+    global _release_warned
+    if not _release_warned:
+        _release_warned = True
+        logger.warning("Cannot release crews from crewai's memoize caches (%s); pooled crews will not be "
+                       "garbage collected until the process exits", error)
 
 
 @CrewBase
@@ -25,31 +71,70 @@ class PublicHealthTriageCrew():
     agents: List[BaseAgent]
     tasks: List[Task]
 
-    def __init__(self):
-        """Initialize the crew with Gemini LLM"""
+    def __init__(
+        self,
+        parallel: Optional[bool] = None,
+        model: Optional[str] = None,
+        template_report: Optional[bool] = None,
+    ):
+        """Initialize the crew with Gemini LLM
+
+        Args:
+            parallel: Fan the specialist tasks out concurrently instead of running
+                them one after another. Defaults to TRIAGE_PARALLEL_SPECIALISTS.
+            model: Gemini model for every agent, overriding the per-agent
+                model_tier in agents.yaml (and therefore escalation).
+            template_report: Have the specialists return structured fields and
+                render the report locally instead of running the aggregator.
+                Defaults to TRIAGE_TEMPLATE_REPORT.
+        """
+        self.parallel = PARALLEL_SPECIALISTS if parallel is None else parallel
+        self.model = model
+        self.template_report = TEMPLATE_REPORT if template_report is None else template_report
+        self._crews_by_tasks: Dict[Tuple[str, ...], Crew] = {}
+        self._llms: Dict[Tuple[Any, ...], LLM] = {}
+        self._escalated: Dict[str, Tuple[LLM, str]] = {}
+        self._tool_memo = ToolMemo()
+        self._custom_tools = {tool.name: tool for tool in create_custom_tools(self._tool_memo)}
+
         # Ensure latest env vars are loaded and validate API key at runtime (not import-time)
         load_dotenv()
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key or api_key == "your_gemini_api_key_here":
+        self._api_key = os.getenv("GEMINI_API_KEY")
+        if requires_api_key() and (not self._api_key or self._api_key == "your_gemini_api_key_here"):
             raise ValueError(
                 "GEMINI_API_KEY not found. Please set it in your .env file or environment variables. "
-                "You can get one from https://makersuite.google.com/app/apikey"
+                "You can get one from https://makersuite.google.com/app/apikey "
+                "(or set TRIAGE_LLM_BACKEND=stub or replay to run offline)"
             )
 
-        # Use CrewAI's LLM class with improved configuration
-        self.llm = LLM(
-            model=f"gemini/{GEMINI_MODEL}",
-            api_key=api_key,
-            temperature=0.7,
-            max_tokens=4000  # Ensure comprehensive responses
-        )
+    def _tier_llm(self, tier: str, stream: bool = False, temperature: float = 0.7, max_tokens: int = 4000) -> LLM:
+        """CrewAI LLM for a model tier and parameters, shared by agents that agree on them"""
+        model = self.model or tier_model(tier)
+        key = (model, stream, temperature, max_tokens)
+        if key not in self._llms:
+            # CrewAI LLM for the configured backend (see TRIAGE_LLM_BACKEND)
+            self._llms[key] = create_llm(
+                model=f"gemini/{model}",
+                api_key=self._api_key,
+                temperature=temperature,
+                max_tokens=max_tokens,  # Ensure comprehensive responses
+                stream=stream
+            )
+        return self._llms[key]
+
+    def _agent_llm(self, name: str, tier: Optional[str] = None, stream: bool = False) -> LLM:
+        """LLM for an agent from its model_tier, temperature and max_tokens in agents.yaml"""
+        config = self.agents_config[name]
+        params = {key: config[key] for key in ('temperature', 'max_tokens') if key in config}
+        return self._tier_llm(tier or config.get('model_tier', DEFAULT_TIER), stream=stream, **params)
 
     @agent
     def public_health_triage(self) -> Agent:
         return Agent(
             config=self.agents_config['public_health_triage'],
-            llm=self.llm,
-            tools=create_emergency_tools() + create_health_tools(),
+            llm=self._agent_llm('public_health_triage'),
+            tools=create_emergency_tools(self._tool_memo) + create_health_tools(self._tool_memo),
+            cache=False,  # Memoized by ToolMemo instead (see _build_crew)
             verbose=True,
             max_iter=2,  # Reduce iterations to avoid complexity
             memory=False  # Disable memory to avoid embedder issues
@@ -59,7 +144,7 @@ class PublicHealthTriageCrew():
     def maternal_child_health(self) -> Agent:
         return Agent(
             config=self.agents_config['maternal_child_health'],
-            llm=self.llm,
+            llm=self._agent_llm('maternal_child_health'),
             verbose=True,
             max_iter=2,
             memory=False
@@ -69,7 +154,9 @@ class PublicHealthTriageCrew():
     def medicine_availability_locator(self) -> Agent:
         return Agent(
             config=self.agents_config['medicine_availability_locator'],
-            llm=self.llm,
+            llm=self._agent_llm('medicine_availability_locator'),
+            tools=[self._tool_memo.tool(medicine_prices_bulk), self._custom_tools['csv_lookup']],
+            cache=False,
             verbose=True,
             max_iter=2,
             memory=False
@@ -79,7 +166,9 @@ class PublicHealthTriageCrew():
     def health_finance_coach(self) -> Agent:
         return Agent(
             config=self.agents_config['health_finance_coach'],
-            llm=self.llm,
+            llm=self._agent_llm('health_finance_coach'),
+            tools=[self._custom_tools['web_fetch'], self._custom_tools['web_fetch_many']],
+            cache=False,
             verbose=True,
             max_iter=2,
             memory=False
@@ -89,7 +178,7 @@ class PublicHealthTriageCrew():
     def public_health_aggregator(self) -> Agent:
         return Agent(
             config=self.agents_config['public_health_aggregator'],
-            llm=self.llm,
+            llm=self._agent_llm('public_health_aggregator', stream=STREAM_REPORT),
             verbose=True,
             max_iter=2,
             memory=False
@@ -113,6 +202,15 @@ class PublicHealthTriageCrew():
         - selected_symptoms: List of specific symptoms selected by the patient
         - medical_history: Any existing medical conditions or relevant history
         
+        Already looked up for the patient's location ({location}) and symptoms; use these
+        directly and call a tool only for something they do not cover:
+        - Emergency screen: {emergency_screen}
+        - Emergency contacts: {emergency_contacts}
+        - Nearest hospitals: {nearest_hospitals}
+        - Nearby PHCs: {nearby_phcs}
+        - Disease outbreaks: {outbreak_context}
+        - Weather health risks: {weather_context}
+        
         Based on this information, classify urgency as:
         - Home Care: Mild symptoms manageable with rest and basic care
         - Primary Health Centre (PHC): Moderate symptoms requiring basic medical attention
@@ -123,7 +221,7 @@ class PublicHealthTriageCrew():
         Provide specific, actionable recommendations.
         """
         
-        return Task(config=task_config)
+        return self._specialist_task(task_config)
 
     @task
     def maternal_child_health_task(self) -> Task:
@@ -143,9 +241,11 @@ class PublicHealthTriageCrew():
         
         Tailor advice based on patient's age, gender, location, and specific symptoms if related to maternal or child health.
         Reference Nigerian health policies and available free services.
+        
+        PHCs near the patient ({location}) offering these free services: {nearby_phcs}
         """
         
-        return Task(config=task_config)
+        return self._specialist_task(task_config)
 
     @task
     def medicine_availability_locator_task(self) -> Task:
@@ -165,9 +265,15 @@ class PublicHealthTriageCrew():
         
         Consider the patient's location to suggest regional availability and pricing variations.
         Highlight cost-effective options and government subsidy programs.
+        
+        Price all candidate medicines with a single medicine_prices_bulk call for the
+        patient's location rather than one call per medicine. For brands, strengths,
+        pack sizes and prescription status, use csv_lookup on the medicine list at
+        """ + MEDICINES_FILE + """
+        (e.g. query "generic:amox" or "category:antimalarial").
         """
         
-        return Task(config=task_config)
+        return self._specialist_task(task_config)
 
     @task
     def health_finance_coach_task(self) -> Task:
@@ -188,9 +294,14 @@ class PublicHealthTriageCrew():
         
         Based on patient location and symptoms, suggest the most cost-effective care pathway.
         Include eligibility requirements and application processes for insurance/assistance programs.
+        
+        PHCs near the patient ({location}) where free services can be accessed: {nearby_phcs}
+        
+        To confirm current scheme details, fetch the relevant pages (for example
+        https://www.nhia.gov.ng) with web_fetch, or several at once with web_fetch_many.
         """
         
-        return Task(config=task_config)
+        return self._specialist_task(task_config)
 
     @task
     def public_health_aggregator_task(self) -> Task:
@@ -242,19 +353,278 @@ class PublicHealthTriageCrew():
         Include specific facility names, contact information, and cost estimates where possible.
         """
         
-        return Task(
+        # The aggregator is the join point: it waits for every specialist and
+        # reads their outputs explicitly, whether they ran in parallel or not
+        return AggregatorTask(
             config=task_config,
-            output_file='nigerian_health_assessment_report.md'
+            context=self.specialist_tasks(),
+            output_file='nigerian_health_assessment_report.md',
+            handoff_summaries=HANDOFF_SUMMARIES
+        )
+
+    def _specialist_task(self, task_config: Dict[str, Any]) -> Task:
+        for key in ('cache_key_fields', 'run_when', 'escalate_when'):
+            task_config.pop(key, None)
+        required_terms = task_config.pop('confident_when_mentions', None)
+        schema = task_config.pop('output_schema', None)
+        if self.template_report and schema:
+            # crewai appends the schema to the prompt and validates the answer against it
+            task_config['output_pydantic'] = get_schema(schema)
+        elif HANDOFF_SUMMARIES:
+            task_config['expected_output'] = task_config['expected_output'] + HANDOFF_INSTRUCTION
+        # crewai only wires a guardrail up while validating a new Task, so it has to
+        # go to the constructor; the closure finds the task once it exists
+        guardrail = None
+        if required_terms is not None:
+            guardrail = self._confidence_guardrail(lambda: task, required_terms)
+        task = SpecialistTask(config=task_config, async_execution=self.parallel, guardrail=guardrail)
+        return task
+
+    def _confidence_guardrail(
+        self, owner: Callable[[], Task], required_terms: List[str]
+    ) -> Callable[[TaskOutput], Tuple[bool, Any]]:
+        """Guardrail that re-runs a low-confidence answer once on the escalation tier"""
+        def guardrail(output: TaskOutput) -> Tuple[bool, Any]:
+            issue = confidence_issue(output.raw, required_terms)
+            if issue and self._escalate(owner(), f"low confidence: {issue}"):
+                return False, f"{issue}. Give a clear, specific assessment."
+            return True, output
+        return guardrail
+
+    def _escalate(self, task: Task, reason: str) -> bool:
+        """Move a task's agent to the escalation tier until the next reset
+
+        Returns False when the task already escalated this run or its agent
+        is on the escalation model already, so there is nothing to retry on.
+        """
+        current = task.agent.llm
+        if task.name in self._escalated:
+            return False
+        stronger = self._tier_llm(
+            ESCALATION_TIER, stream=current.stream, temperature=current.temperature, max_tokens=current.max_tokens
         )
+        if stronger.model == current.model:
+            return False
+        self._escalated[task.name] = (current, reason)
+        task.agent.llm = stronger  # Agent builds a fresh executor per execution
+        return True
+
+    def specialist_tasks(self) -> List[Task]:
+        """Return the independent specialist tasks feeding the aggregator"""
+        return [
+            self.public_health_triage_task(),
+            self.maternal_child_health_task(),
+            self.medicine_availability_locator_task(),
+            self.health_finance_coach_task(),
+        ]
+
+    def kickoff(
+        self,
+        inputs: Dict[str, Any],
+        task_callback: Optional[Callable[[TaskOutput], None]] = None,
+        stream_callback: Optional[Callable[[str], None]] = None,
+    ) -> CrewOutput:
+        """Run one assessment, reusing cached specialist outputs where declared
+
+        Args:
+            inputs: Intake fields interpolated into the tasks, along with the
+                context prefetched from them (see context_prefetch.py)
+            task_callback: Called with each TaskOutput as soon as that task finishes
+            stream_callback: Called with each text chunk the aggregator streams
+        """
+        self.crew()  # Instantiate agents and tasks on first use
+        self._tool_memo.new_run()
+        with get_tracer().span("crew", "crew", parallel=self.parallel) as span:
+            # Lookups fixed by the intake fill the context placeholders in tasks.yaml,
+            # so agents answer from them instead of spending iterations on tool calls
+            with get_tracer().span("context_prefetch", "prefetch"):
+                inputs = {**inputs, **prefetch_context(inputs, self._tool_memo)}
+            result = self._run_assessment(inputs, task_callback, stream_callback, span)
+            span.set(tool_calls=self._tool_memo.stats(run_only=True))
+            return result
+
+    def _run_assessment(
+        self,
+        inputs: Dict[str, Any],
+        task_callback: Optional[Callable[[TaskOutput], None]],
+        stream_callback: Optional[Callable[[str], None]],
+        span: Any,
+    ) -> CrewOutput:
+        # Callers may kick off the same instance repeatedly without the pool's
+        # reset, and a specialist skipped below must not hand the aggregator
+        # its output from the previous patient
+        self.reset()
+        cache = get_task_cache()
+        aggregator = self.public_health_aggregator_task()
+
+        # Skip specialists whose run_when does not hold for this patient; the
+        # aggregator sees them without output and leaves their sections out
+        facts = intake_facts(inputs)
+        specialists = [task for task in self.specialist_tasks() if should_run(self.tasks_config[task.name], facts)]
+        span.set(skipped_tasks=[task.name for task in self.specialist_tasks() if task not in specialists])
+
+        # Intakes matching escalate_when go straight to the escalation tier
+        for specialist in specialists:
+            condition = self.tasks_config[specialist.name].get('escalate_when')
+            if condition is not None and evaluate(condition, facts):
+                self._escalate(specialist, "escalate_when matched")
+
+        # Outputs are cached per model and format so a fast-tier or free-text
+        # answer never stands in for a strong-tier or structured one
+        cache_names = {
+            task.name: f"{task.name}@{task.agent.llm.model}" + (":structured" if task.output_pydantic else "")
+            for task in specialists
+        }
+        pending = []
+        for specialist in specialists:
+            fields = declared_key_fields(self.tasks_config[specialist.name])
+            cached = cache.get(cache_names[specialist.name], fields, inputs) if cache and fields else None
+            if cached is None:
+                pending.append(specialist)
+            else:
+                # The aggregator reads this through its context like a fresh output
+                specialist.output = cached
+        span.set(task_cache_hits=[task.name for task in specialists if task not in pending])
+
+        if task_callback:
+            for specialist in specialists:
+                if specialist not in pending:
+                    task_callback(specialist.output)
+
+        get_tracer().bind_tasks(pending if self.template_report else pending + [aggregator], span)
+        if self.template_report:
+            result = self._render_report(specialists, pending, aggregator, inputs, task_callback)
+        else:
+            subset = self._crew_for(pending + [aggregator])
+            subset.task_callback = task_callback
+            try:
+                with stream_task(aggregator, stream_callback):
+                    result = subset.kickoff(inputs=inputs)
+            finally:
+                subset.task_callback = None
+        span.set(
+            aggregator_context_tokens=aggregator.context_tokens,
+            escalations={name: reason for name, (_, reason) in self._escalated.items()},
+        )
+        if result.token_usage:
+            span.set(
+                prompt_tokens=result.token_usage.prompt_tokens,
+                completion_tokens=result.token_usage.completion_tokens,
+                successful_requests=result.token_usage.successful_requests,
+            )
+
+        if cache:
+            for specialist in pending:
+                fields = declared_key_fields(self.tasks_config[specialist.name])
+                if fields and specialist.output is not None:
+                    cache.put(cache_names[specialist.name], fields, inputs, specialist.output)
+        result.tasks_output = [task.output for task in specialists + [aggregator] if task.output is not None]
+        return result
+
+    def _render_report(
+        self,
+        specialists: List[Task],
+        pending: List[Task],
+        aggregator: Task,
+        inputs: Dict[str, Any],
+        task_callback: Optional[Callable[[TaskOutput], None]],
+    ) -> CrewOutput:
+        """Run the pending specialists and render their fields into the report locally"""
+        # A crew may not end with several async tasks and would join them one
+        # by one, so each specialist gets a single-task crew of its own
+        crews = [self._crew_for([task]) for task in pending]
+        for single in crews:
+            single.task_callback = task_callback
+        try:
+            if self.parallel and len(crews) > 1:
+                with ThreadPoolExecutor(max_workers=len(crews)) as executor:
+                    results = list(executor.map(lambda single: single.kickoff(inputs=inputs), crews))
+            else:
+                results = [single.kickoff(inputs=inputs) for single in crews]
+        finally:
+            for single in crews:
+                single.task_callback = None
+
+        report = render_report(inputs, {task.name: task.output for task in specialists})
+        write_report(report, aggregator.output_file)
+        aggregator.output = TaskOutput(
+            name=aggregator.name,
+            description=aggregator.description,
+            expected_output=aggregator.expected_output,
+            raw=report,
+            agent="Report renderer",
+        )
+        if task_callback:
+            task_callback(aggregator.output)
+        token_usage = UsageMetrics()
+        for result in results:
+            token_usage.add_usage_metrics(result.token_usage)
+        return CrewOutput(raw=report, token_usage=token_usage)
+
+    def _crew_for(self, tasks: List[Task]) -> Crew:
+        """Crew over a subset of tasks, built once per distinct subset"""
+        if len(tasks) == len(self.tasks):
+            return self.crew()
+        key = tuple(task.name for task in tasks)
+        if key not in self._crews_by_tasks:
+            self._crews_by_tasks[key] = self._build_crew(tasks)
+        return self._crews_by_tasks[key]
+
+    def reset(self) -> None:
+        """Clear per-run state so a warm instance can serve the next kickoff"""
+        for owned_task in self.tasks:
+            owned_task.output = None
+            owned_task.callback = None  # Crew.kickoff copies task_callback onto tasks
+            owned_task.retry_count = 0  # Guardrail retries count per run
+            if owned_task.name in self._escalated:
+                owned_task.agent.llm = self._escalated.pop(owned_task.name)[0]
+        for owned_agent in self.agents:
+            owned_agent._token_process = TokenProcess()
+            owned_agent._times_executed = 0
+            owned_agent.tools_results = []
+        self.crew().usage_metrics = None
+        for partial in self._crews_by_tasks.values():
+            partial.usage_metrics = None
+
+    def release(self) -> None:
+        """Let a crew that will not be used again be garbage collected
+
+        crewai.project's @agent/@task/@crew memoize results in a dict on each
+        decorated method keyed on the instance, so without this every crew,
+        its agents and LLM clients stay alive for the life of the process.
+        This reaches into memoize's closure, so if a crewai release changes
+        its layout the crew is left memoized and a warning is logged instead.
+        """
+        try:
+            caches = []
+            for klass in type(self).__mro__:
+                for attribute in vars(klass).values():
+                    if getattr(attribute, "__code__", None) is not _MEMOIZED_CODE:
+                        continue
+                    cache = attribute.__closure__[_MEMOIZED_CACHE_CELL].cell_contents
+                    if not isinstance(cache, dict):
+                        raise TypeError(f"memoize cache is a {type(cache).__name__}")
+                    caches.append(cache)
+            for cache in caches:
+                for key in [key for key in list(cache) if key[0] and key[0][0] is self]:
+                    cache.pop(key, None)
+        except (AttributeError, IndexError, TypeError, ValueError) as e:
+            _warn_release_unsupported(e)
 
     @crew
     def crew(self) -> Crew:
         """Creates the Public Health Triage Advisor crew with improved configuration"""
+        return self._build_crew(self.tasks)
+
+    def _build_crew(self, tasks: List[Task]) -> Crew:
+        # Sequential process still applies in parallel mode: the async specialist
+        # tasks are started together and the synchronous aggregator joins them
         return Crew(
             agents=self.agents,
-            tasks=self.tasks,
+            tasks=tasks,
             process=Process.sequential,
             verbose=True,
             memory=False,  # Disable memory to avoid embedder issues
-            max_rpm=10,  # Rate limiting for API calls
+            cache=False,  # Tools are memoized with TTLs by ToolMemo; crewai's tool cache never expires
+            # No max_rpm: TriageLLM rate-limits every call across all crews
         )
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""
+Process-wide pool of warm PublicHealthTriageCrew instances
+"""
+
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from dotenv import find_dotenv, load_dotenv
+
+from .crew import PublicHealthTriageCrew
+from .result_cache import get_result_cache
+from .task_cache import get_task_cache
+from .tools.outbreak_monitor import get_outbreak_monitor
+from .tools.symptom_matcher import get_default_matcher
+from .tools.tool_cache import get_shared_tool_cache
+from .tracing import get_tracer
+
+# Upper bound on crews alive at once; extra kickoffs wait for one to be returned
+CREW_POOL_SIZE = int(os.getenv("TRIAGE_CREW_POOL_SIZE", "4"))
+
+CONFIG_DIR = Path(__file__).parent / "config"
+
+
+def _config_stamp() -> Tuple[float, ...]:
+    """Modification times of everything a crew is built from"""
+    paths = sorted(CONFIG_DIR.glob("*.yaml"))
+    dotenv_path = find_dotenv(usecwd=True)
+    if dotenv_path:
+        paths.append(Path(dotenv_path))
+    stamp = []
+    for path in paths:
+        try:
+            stamp.append(path.stat().st_mtime)
+        except OSError:
+            stamp.append(0.0)
+    return tuple(stamp)
+
+
+class CrewPool:
+    """Bounded pool of pre-built crews that are reset between kickoffs
+
+    Building a PublicHealthTriageCrew parses the YAML config, creates the LLM
+    client, five agents and their tools. The pool pays that cost once per slot
+    and hands each kickoff an instance nobody else is using. Instances are
+    reset on return, and released for garbage collection when the pool is
+    reloaded.
+    """
+
+    def __init__(
+        self,
+        size: int = CREW_POOL_SIZE,
+        factory: Optional[Callable[[], PublicHealthTriageCrew]] = None,
+        auto_reload: bool = True,
+        model: Optional[str] = None,
+    ):
+        self.size = max(1, size)
+        self.auto_reload = auto_reload
+        self.model = model
+        self._factory = factory or partial(PublicHealthTriageCrew, model=model)
+        self._idle: "queue.LifoQueue[Tuple[int, PublicHealthTriageCrew]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._config_stamp = _config_stamp()
+        self.built = 0
+        self.reused = 0
+
+    def _build(self) -> PublicHealthTriageCrew:
+        instance = self._factory()
+        instance.crew()  # Instantiate agents, tasks and the LLM up front
+        with self._lock:
+            self.built += 1
+        return instance
+
+    def _take(self) -> Tuple[int, PublicHealthTriageCrew]:
+        while True:
+            try:
+                generation, instance = self._idle.get_nowait()
+            except queue.Empty:
+                generation = self._generation
+                return generation, self._build()
+            if generation == self._generation:
+                with self._lock:
+                    self.reused += 1
+                return generation, instance
+            instance.release()
+
+    def warm(self, count: Optional[int] = None) -> None:
+        """Pre-build instances so the first kickoffs skip construction"""
+        count = self.size if count is None else min(count, self.size)
+        built = []
+        for _ in range(count - self._idle.qsize()):
+            built.append((self._generation, self._build()))
+        for item in built:
+            self._idle.put(item)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[PublicHealthTriageCrew]:
+        """Borrow an instance for the duration of one kickoff"""
+        if self.auto_reload:
+            self.reload_if_changed()
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No crew available in the pool after {timeout}s")
+        try:
+            generation, instance = self._take()
+            try:
+                yield instance
+            finally:
+                instance.reset()
+                if generation == self._generation:
+                    self._idle.put((generation, instance))
+                else:
+                    instance.release()
+        finally:
+            self._slots.release()
+
+    def kickoff(
+        self,
+        inputs: Dict[str, Any],
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+        task_callback: Optional[Callable[[Any], None]] = None,
+        stream_callback: Optional[Callable[[str], None]] = None,
+    ) -> Any:
+        """Run a full assessment on a pooled crew, consulting the result cache first
+
+        The callbacks are forwarded to PublicHealthTriageCrew.kickoff(); on a
+        cache hit task_callback still receives every cached task output.
+        """
+        with get_tracer().span("kickoff", "kickoff", model=self.model) as span:
+            cache = get_result_cache() if use_cache else None
+            # Reports from a model override must not be served to tiered runs
+            cache_inputs = dict(inputs, gemini_model=self.model) if self.model else inputs
+            if cache is not None:
+                cached = cache.get(cache_inputs)
+                span.set(result_cache_hit=cached is not None)
+                if cached is not None:
+                    if task_callback:
+                        for output in cached.tasks_output:
+                            task_callback(output)
+                    return cached
+            with self.checkout(timeout=timeout) as instance:
+                result = instance.kickoff(inputs, task_callback=task_callback, stream_callback=stream_callback)
+            if cache is not None:
+                cache.put(cache_inputs, result)
+            return result
+
+    def reload(self) -> None:
+        """Drop every idle instance; checked-out ones are discarded on return"""
+        load_dotenv(override=True)
+        get_default_matcher.cache_clear()
+        for cache in (get_result_cache(), get_task_cache()):
+            if cache is not None:
+                cache.clear()  # Cached outputs were produced from the old prompts
+        get_shared_tool_cache().clear()  # Tool answers may depend on reloaded settings and data files
+        with self._lock:
+            self._generation += 1
+            self._config_stamp = _config_stamp()
+        while True:
+            try:
+                _, instance = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            instance.release()
+
+    def reload_if_changed(self) -> bool:
+        """Reload when a config YAML file or .env changed on disk"""
+        if _config_stamp() == self._config_stamp:
+            return False
+        self.reload()
+        return True
+
+
+_pools: Dict[Optional[str], CrewPool] = {}
+_pool_lock = threading.Lock()
+
+
+def get_crew_pool(model: Optional[str] = None) -> CrewPool:
+    """Return the process-wide crew pool for a model override, creating it on first use
+
+    The default (model=None) pool runs every agent on its configured model tier.
+    """
+    pool = _pools.get(model)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(model)
+            if pool is None:
+                pool = _pools[model] = CrewPool(model=model)
+                get_outbreak_monitor()  # Starts loading surveillance data before the first tool call
+    return pool
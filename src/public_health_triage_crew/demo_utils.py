@@ -6,90 +6,132 @@ import streamlit as st
 from datetime import datetime
 import random
 
-def load_demo_data():
-    """Load sample demo data for testing the application"""
-    
-    demo_scenarios = [
-        {
-            "name": "Amina Ibrahim",
-            "age": 28,
-            "gender": "Female",
-            "location": "Kano, Nigeria",
-            "phone": "+234 803 123 4567",
-            "medical_history": "No known allergies. Previous normal delivery 3 years ago.",
-            "symptoms": {
-                "fever": True,
-                "headache": True,
-                "fatigue": True,
-                "joint_pain": True,
-                "difficulty_breathing": False,
-                "cough": False,
-                "abdominal_pain": False,
-                "vomiting": False,
-                "diarrhea": False,
-                "dizziness": False,
-                "nausea": False,
-                "skin_rash": False,
-                "sleep_problems": True
-            },
-            "additional_symptoms": "Started with mild headache 3 days ago. Fever began yesterday evening (feels like 38-39°C). Body aches and joint pains, especially in knees and back. Feeling very tired and weak. No appetite. Symptoms seem to be getting worse.",
-            "severity": "Moderate"
+from .intake import build_crew_inputs
+
+# Sample patients in the web form's shape, used by the "Load demo data" button
+DEMO_SCENARIOS = [
+    {
+        "name": "Amina Ibrahim",
+        "age": 28,
+        "gender": "Female",
+        "location": "Kano, Nigeria",
+        "phone": "+234 803 123 4567",
+        "medical_history": "No known allergies. Previous normal delivery 3 years ago.",
+        "symptoms": {
+            "fever": True,
+            "headache": True,
+            "fatigue": True,
+            "joint_pain": True,
+            "difficulty_breathing": False,
+            "cough": False,
+            "abdominal_pain": False,
+            "vomiting": False,
+            "diarrhea": False,
+            "dizziness": False,
+            "nausea": False,
+            "skin_rash": False,
+            "sleep_problems": True
         },
-        {
-            "name": "Chidi Okafor",
-            "age": 45,
-            "gender": "Male",
-            "location": "Lagos, Nigeria",
-            "phone": "+234 701 987 6543",
-            "medical_history": "Hypertension (managed with medication). Diabetes Type 2 diagnosed 2 years ago.",
-            "symptoms": {
-                "chest_pain": True,
-                "difficulty_breathing": True,
-                "dizziness": True,
-                "fatigue": True,
-                "fever": False,
-                "headache": False,
-                "cough": False,
-                "abdominal_pain": False,
-                "vomiting": False,
-                "diarrhea": False,
-                "joint_pain": False,
-                "nausea": True,
-                "skin_rash": False,
-                "sleep_problems": True
-            },
-            "additional_symptoms": "Sharp chest pain started this morning, especially when taking deep breaths. Feeling short of breath even when sitting. Dizzy when standing up. Had similar but milder episode last week. Taking medication for blood pressure and diabetes regularly.",
-            "severity": "Severe"
+        "additional_symptoms": "Started with mild headache 3 days ago. Fever began yesterday evening (feels like 38-39°C). Body aches and joint pains, especially in knees and back. Feeling very tired and weak. No appetite. Symptoms seem to be getting worse.",
+        "severity": "Moderate"
+    },
+    {
+        "name": "Chidi Okafor",
+        "age": 45,
+        "gender": "Male",
+        "location": "Lagos, Nigeria",
+        "phone": "+234 701 987 6543",
+        "medical_history": "Hypertension (managed with medication). Diabetes Type 2 diagnosed 2 years ago.",
+        "symptoms": {
+            "chest_pain": True,
+            "difficulty_breathing": True,
+            "dizziness": True,
+            "fatigue": True,
+            "fever": False,
+            "headache": False,
+            "cough": False,
+            "abdominal_pain": False,
+            "vomiting": False,
+            "diarrhea": False,
+            "joint_pain": False,
+            "nausea": True,
+            "skin_rash": False,
+            "sleep_problems": True
         },
-        {
-            "name": "Baby Kemi Adebayo",
-            "age": 8,
-            "gender": "Female",
-            "location": "Ibadan, Nigeria",
-            "phone": "+234 806 555 7890",
-            "medical_history": "Up to date with immunizations. No known allergies. Normal birth weight and development.",
-            "symptoms": {
-                "fever": True,
-                "cough": True,
-                "vomiting": True,
-                "diarrhea": True,
-                "fatigue": True,
-                "difficulty_breathing": False,
-                "headache": False,
-                "chest_pain": False,
-                "abdominal_pain": True,
-                "dizziness": False,
-                "joint_pain": False,
-                "nausea": True,
-                "skin_rash": False,
-                "sleep_problems": True
-            },
-            "additional_symptoms": "Child has been sick for 2 days. Started with stomach pain and loose stools (3-4 times per day). Vomited twice yesterday. Low-grade fever. Not eating well and seems very tired. Still drinking water but less than usual. No blood in stool.",
-            "severity": "Moderate"
-        }
-    ]
-    
-    return random.choice(demo_scenarios)
+        "additional_symptoms": "Sharp chest pain started this morning, especially when taking deep breaths. Feeling short of breath even when sitting. Dizzy when standing up. Had similar but milder episode last week. Taking medication for blood pressure and diabetes regularly.",
+        "severity": "Severe"
+    },
+    {
+        "name": "Baby Kemi Adebayo",
+        "age": 8,
+        "gender": "Female",
+        "location": "Ibadan, Nigeria",
+        "phone": "+234 806 555 7890",
+        "medical_history": "Up to date with immunizations. No known allergies. Normal birth weight and development.",
+        "symptoms": {
+            "fever": True,
+            "cough": True,
+            "vomiting": True,
+            "diarrhea": True,
+            "fatigue": True,
+            "difficulty_breathing": False,
+            "headache": False,
+            "chest_pain": False,
+            "abdominal_pain": True,
+            "dizziness": False,
+            "joint_pain": False,
+            "nausea": True,
+            "skin_rash": False,
+            "sleep_problems": True
+        },
+        "additional_symptoms": "Child has been sick for 2 days. Started with stomach pain and loose stools (3-4 times per day). Vomited twice yesterday. Low-grade fever. Not eating well and seems very tired. Still drinking water but less than usual. No blood in stool.",
+        "severity": "Moderate"
+    }
+]
+
+# The presentation scenarios demo.py walks through, already in crew input shape
+PRESENTATION_SCENARIOS = [
+    {
+        'patient_name': 'Aisha Mohammed',
+        'age': 45,
+        'location': 'Lagos',
+        'symptoms': 'Severe chest pain, difficulty breathing, sweating, and pain radiating to left arm for the past 30 minutes',
+        'topic': 'Public Health Triage Advisor',
+    },
+    {
+        'patient_name': 'Fatima Yusuf',
+        'age': 28,
+        'location': 'Kano',
+        'symptoms': 'Pregnant woman in third trimester seeking antenatal care information, immunization schedule for her 2-year-old child, and guidance on nutrition during pregnancy',
+        'topic': 'Public Health Triage Advisor',
+    },
+    {
+        'patient_name': 'Chukwudi Okonkwo',
+        'age': 35,
+        'location': 'Port Harcourt',
+        'symptoms': 'Patient with malaria symptoms seeking information about ACT medications, their availability, pricing, and where to find them locally',
+        'topic': 'Public Health Triage Advisor',
+    },
+]
+
+def load_demo_data():
+    """Load sample demo data for testing the application"""
+    return random.choice(DEMO_SCENARIOS)
+
+def demo_scenario_inputs(scenario):
+    """Crew inputs for a DEMO_SCENARIOS entry, as the web form would submit it"""
+    selected = [name.replace("_", " ").title() for name, checked in scenario["symptoms"].items() if checked]
+    return build_crew_inputs(
+        patient_name=scenario["name"],
+        age=scenario["age"],
+        gender=scenario["gender"],
+        location=scenario["location"],
+        symptoms_description=scenario["additional_symptoms"],
+        symptom_severity=scenario["severity"],
+        selected_symptoms=selected,
+        phone=scenario["phone"],
+        medical_history=scenario["medical_history"],
+    )
 
 def populate_demo_data():
     """Populate Streamlit session state with demo data"""
@@ -0,0 +1,110 @@
+"""
+Deterministic emergency fast lane that runs before any LLM call
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .tools.emergency_tools import EmergencyTools
+from .tools.location_resolver import resolve_location
+
+# First aid guide entry to show for each critical finding
+FIRST_AID_FOR_FINDING = {
+    "chest pain": "heart attack",
+    "heart attack": "heart attack",
+    "stroke": "stroke",
+    "not breathing": "not breathing",
+    "severe bleeding": "bleeding",
+    "head injury": "head injury",
+}
+
+# Hospital specialty to route to for each critical finding
+HOSPITAL_TYPE_FOR_FINDING = {
+    "chest pain": "cardiac",
+    "heart attack": "cardiac",
+}
+
+PEDIATRIC_AGE_LIMIT = 13
+
+
+@dataclass
+class EmergencyResult:
+    """Immediate emergency guidance assembled from the emergency tools"""
+
+    findings: List[str]
+    flagged_by_patient: bool
+    assessment: str
+    contacts: str
+    hospitals: str
+    first_aid: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def is_critical(self) -> bool:
+        return bool(self.findings)
+
+    def to_markdown(self) -> str:
+        """Render the guidance for the UI or CLI"""
+        lines = ["## 🚨 Immediate Emergency Guidance", ""]
+        if self.findings:
+            lines += [self.assessment, ""]
+        else:
+            lines += ["This intake was marked as an emergency. Call **112** or go to the nearest hospital now.", ""]
+        lines += ["### 📞 Emergency Contacts", "", self.contacts.strip(), ""]
+        lines += ["### 🏥 Nearest Hospitals", "", self.hospitals.strip(), ""]
+        if self.first_aid:
+            lines += ["### 🩹 First Aid While Waiting", ""]
+            lines += [f"- {instruction}" for instruction in self.first_aid]
+            lines.append("")
+        return "\n".join(lines)
+
+
+def hospital_type(findings: List[str], age: Any) -> str:
+    """Emergency type to route a patient with these findings to"""
+    for finding in findings:
+        if finding in HOSPITAL_TYPE_FOR_FINDING:
+            return HOSPITAL_TYPE_FOR_FINDING[finding]
+    try:
+        if int(age) < PEDIATRIC_AGE_LIMIT:
+            return "pediatric"
+    except (TypeError, ValueError):
+        pass
+    return "general"
+
+
+def assess_emergency(inputs: Dict[str, Any]) -> Optional[EmergencyResult]:
+    """Run the rule-based emergency stage on the intake inputs
+
+    Returns None when the symptoms contain no critical findings and the patient
+    did not flag the intake as an emergency, so the caller proceeds to the crew.
+    """
+    started = time.perf_counter()
+    symptoms = str(inputs.get("symptoms", ""))
+    flagged = bool(inputs.get("is_emergency", False))
+    findings = EmergencyTools.detect_critical_symptoms(symptoms)
+    if not findings and not flagged:
+        return None
+
+    # Resolved once; the tools accept the canonical id and skip re-parsing the text
+    location = str(inputs.get("location", ""))
+    resolved = resolve_location(location)
+    place = resolved.id if resolved is not None else location
+    first_aid = []
+    for finding in findings:
+        injury_type = FIRST_AID_FOR_FINDING.get(finding)
+        if injury_type:
+            instructions = EmergencyTools.first_aid_instructions(injury_type)
+            if instructions not in first_aid:
+                first_aid.append(instructions)
+
+    result = EmergencyResult(
+        findings=findings,
+        flagged_by_patient=flagged,
+        assessment=EmergencyTools.emergency_triage_assessment(symptoms),
+        contacts=EmergencyTools.get_emergency_contacts(place),
+        hospitals=EmergencyTools.nearest_hospital_finder(place, hospital_type(findings, inputs.get("age"))),
+        first_aid=first_aid,
+    )
+    result.elapsed_ms = (time.perf_counter() - started) * 1000
+    return result
@@ -0,0 +1,57 @@
+"""
+Builds crew inputs from patient intake fields
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+
+def combine_symptoms(description: str, selected_symptoms: Iterable[str] = ()) -> str:
+    """Merge the free-text description with the checked symptom list"""
+    combined = description.strip()
+    selected = list(selected_symptoms)
+    if selected:
+        combined += f"\n\nAdditional symptoms checked: {', '.join(selected)}"
+    return combined
+
+
+def build_crew_inputs(
+    patient_name: str,
+    age: Any,
+    gender: str,
+    location: Optional[str],
+    symptoms_description: str,
+    symptom_severity: str,
+    selected_symptoms: Iterable[str] = (),
+    phone: Optional[str] = None,
+    medical_history: Optional[str] = None,
+    is_emergency: bool = False,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Inputs dict for PublicHealthTriageCrew, as submitted by the web form"""
+    now = now or datetime.now()
+    selected = list(selected_symptoms)
+    return {
+        # Patient information
+        'patient_name': patient_name.strip(),
+        'age': str(age),
+        'gender': gender,
+        'location': location.strip() if location else "Nigeria",
+        'phone': phone.strip() if phone else "Not provided",
+        'medical_history': medical_history.strip() if medical_history else "None reported",
+
+        # Symptoms information - the key data
+        'symptoms': combine_symptoms(symptoms_description, selected),
+        'symptom_severity': symptom_severity,
+        'selected_symptoms': selected,
+
+        # System information
+        'topic': 'Nigerian Public Health Triage Assessment',
+        'current_year': str(now.year),
+        'assessment_date': now.strftime('%Y-%m-%d %H:%M:%S'),
+
+        # Additional context
+        'country': 'Nigeria',
+        'healthcare_system': 'Nigerian Healthcare System',
+        'is_emergency': is_emergency
+    }
@@ -0,0 +1,257 @@
+"""
+LLM clients used by every PublicHealthTriageCrew agent
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from crewai import LLM
+from crewai.utilities.events import crewai_event_bus
+from crewai.utilities.events.llm_events import (
+    LLMCallCompletedEvent,
+    LLMCallStartedEvent,
+    LLMCallType,
+    LLMStreamChunkEvent,
+)
+
+from .rate_limiter import estimate_tokens, get_rate_limiter, is_rate_limit_error
+
+# Backend: "live" (Gemini), "stub" (offline, deterministic), "record" or "replay"
+LLM_BACKEND = os.getenv("TRIAGE_LLM_BACKEND", "live").lower()
+
+# Attempts per call when the provider answers 429, before giving up to the agent
+RATE_LIMIT_RETRIES = int(os.getenv("TRIAGE_LLM_RATE_LIMIT_RETRIES", "3"))
+
+# Stub backend shape: seconds per call and characters in each final answer
+STUB_LATENCY = float(os.getenv("TRIAGE_STUB_LATENCY", "0.2"))
+STUB_OUTPUT_CHARS = int(os.getenv("TRIAGE_STUB_OUTPUT_CHARS", "1500"))
+
+# Responses captured by "record" and served by "replay"
+LLM_CASSETTE = os.getenv("TRIAGE_LLM_CASSETTE", "recordings/llm_cassette.jsonl")
+
+# Assessment timestamps differ between runs and must not change the replay key
+_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?")
+
+_STUB_SENTENCES = (
+    "Visit the nearest Primary Health Centre for an assessment.",
+    "Keep drinking clean water and oral rehydration solution.",
+    "Artemisinin-based combination therapy is available at most PHCs.",
+    "Enrol in your state health insurance scheme to reduce costs.",
+    "Return immediately if symptoms worsen or new danger signs appear.",
+    "Antenatal care and routine immunization are free at public facilities.",
+)
+
+
+class TriageLLM(LLM):
+    """crewai LLM whose calls all go through the process-wide rate limiter"""
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        limiter = get_rate_limiter()
+        estimated = estimate_tokens(messages) + (self.max_tokens or 0) // 2
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            with limiter.slot(estimated):
+                started = time.perf_counter()
+                try:
+                    response = super().call(
+                        messages,
+                        tools=tools,
+                        callbacks=callbacks,
+                        available_functions=available_functions,
+                        from_task=from_task,
+                        from_agent=from_agent,
+                    )
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt == RATE_LIMIT_RETRIES:
+                        raise
+                    limiter.on_rate_limited(e)
+                    continue  # The cooldown is applied when the next slot is taken
+            used = estimate_tokens(messages) + estimate_tokens(str(response))
+            limiter.on_success(time.perf_counter() - started, estimated, used)
+            return response
+
+
+def _emit_answer(llm: LLM, messages: Any, answer: str, from_task: Any, from_agent: Any) -> None:
+    # Offline backends emit the same events a live call would, so tracing,
+    # benchmarks and the streaming UI cannot tell the difference
+    if llm.stream:
+        for start in range(0, len(answer), 16):
+            crewai_event_bus.emit(
+                llm, LLMStreamChunkEvent(chunk=answer[start:start + 16], from_task=from_task, from_agent=from_agent)
+            )
+    crewai_event_bus.emit(
+        llm,
+        LLMCallCompletedEvent(
+            messages=messages, response=answer, call_type=LLMCallType.LLM_CALL, from_task=from_task, from_agent=from_agent
+        ),
+    )
+
+
+class StubLLM(LLM):
+    """Deterministic offline LLM with configurable latency and output size
+
+    Answers are derived from a hash of the prompt, so identical runs produce
+    identical reports, and always use the ReAct "Final Answer:" format the
+    agents parse.
+    """
+
+    def __init__(self, *args: Any, latency: float = STUB_LATENCY, output_chars: int = STUB_OUTPUT_CHARS, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.latency = latency
+        self.output_chars = output_chars
+
+    def answer_for(self, messages: Any) -> str:
+        digest = hashlib.sha256(json.dumps(messages, sort_keys=True, default=str).encode("utf-8")).digest()
+        body = []
+        length = 0
+        for index in range(len(digest) * 64):
+            if length >= self.output_chars:
+                break
+            sentence = _STUB_SENTENCES[(digest[index % len(digest)] + index) % len(_STUB_SENTENCES)]
+            body.append(sentence)
+            length += len(sentence) + 1
+        return "Thought: I now know the final answer\nFinal Answer: " + " ".join(body)[: self.output_chars]
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        crewai_event_bus.emit(
+            self, LLMCallStartedEvent(messages=messages, tools=tools, from_task=from_task, from_agent=from_agent)
+        )
+        if self.latency:
+            time.sleep(self.latency)
+        answer = self.answer_for(messages)
+        _emit_answer(self, messages, answer, from_task, from_agent)
+        return answer
+
+
+class Cassette:
+    """Recorded LLM responses keyed by model and prompt, stored as JSONL
+
+    A prompt recorded several times is replayed in the order it was recorded.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._responses: Dict[str, List[str]] = defaultdict(list)
+        self._replayed: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._responses[entry["key"]].append(entry["response"])
+
+    @staticmethod
+    def key(model: str, messages: Any) -> str:
+        prompt = _TIMESTAMP.sub("<timestamp>", json.dumps(messages, sort_keys=True, default=str))
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def next(self, key: str) -> Optional[str]:
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                return None
+            index = self._replayed[key] % len(responses)
+            self._replayed[key] += 1
+            return responses[index]
+
+    def append(self, key: str, response: str) -> None:
+        with self._lock:
+            self._responses[key].append(response)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps({"key": key, "response": response}, ensure_ascii=False) + "\n")
+
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path: str = LLM_CASSETTE) -> Cassette:
+    """Return the cassette for path, loading it once per process"""
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+class RecordReplayLLM(TriageLLM):
+    """Records live responses to a cassette, or replays them without the network"""
+
+    def __init__(self, *args: Any, mode: str = "replay", cassette: Optional[Cassette] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.mode = mode
+        self.cassette = cassette or get_cassette()
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        key = Cassette.key(self.model, messages)
+        if self.mode == "record":
+            response = super().call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+            )
+            if isinstance(response, str):
+                self.cassette.append(key, response)
+            return response
+
+        crewai_event_bus.emit(
+            self, LLMCallStartedEvent(messages=messages, tools=tools, from_task=from_task, from_agent=from_agent)
+        )
+        response = self.cassette.next(key)
+        if response is None:
+            raise LookupError(
+                f"No recorded LLM response in {self.cassette.path} for this prompt. "
+                "Re-record with TRIAGE_LLM_BACKEND=record."
+            )
+        _emit_answer(self, messages, response, from_task, from_agent)
+        return response
+
+
+def requires_api_key(backend: str = LLM_BACKEND) -> bool:
+    """Whether the backend talks to Gemini and therefore needs GEMINI_API_KEY"""
+    return backend in ("live", "record")
+
+
+def create_llm(backend: str = LLM_BACKEND, **kwargs: Any) -> LLM:
+    """Build the LLM client for the configured backend"""
+    if backend == "stub":
+        return StubLLM(**kwargs)
+    if backend in ("record", "replay"):
+        return RecordReplayLLM(mode=backend, **kwargs)
+    if backend == "live":
+        return TriageLLM(**kwargs)
+    raise ValueError(f"Unknown TRIAGE_LLM_BACKEND '{backend}'; expected live, stub, record or replay")
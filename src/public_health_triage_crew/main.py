@@ -5,24 +5,33 @@ Main entry point for the Public Health Triage Advisor project
 
 import sys
 import warnings
-from datetime import datetime
 
+from public_health_triage_crew.context_prefetch import prefetch_context
 from public_health_triage_crew.crew import PublicHealthTriageCrew
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 
+def demo_inputs(prefetch=False):
+    """
+    Complete intake for the first demo patient. crew().train and crew().test
+    bypass PublicHealthTriageCrew.kickoff, so prefetch fills the context
+    placeholders it would otherwise add.
+    """
+    from public_health_triage_crew.demo_utils import DEMO_SCENARIOS, demo_scenario_inputs
+
+    inputs = demo_scenario_inputs(DEMO_SCENARIOS[0])
+    if prefetch:
+        inputs.update(prefetch_context(inputs))
+    return inputs
+
+
 def run():
     """
     Run the crew.
     """
-    inputs = {
-        'topic': 'Public Health Triage Advisor',
-        'current_year': str(datetime.now().year)
-    }
-    
     try:
-        PublicHealthTriageCrew().crew().kickoff(inputs=inputs)
+        PublicHealthTriageCrew().kickoff(demo_inputs())
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
@@ -31,10 +40,7 @@ def train():
     """
     Train the crew for a given number of iterations.
     """
-    inputs = {
-        "topic": "Public Health Triage Advisor",
-        'current_year': str(datetime.now().year)
-    }
+    inputs = demo_inputs(prefetch=True)
     try:
         n_iterations = int(sys.argv[1])
         filename = sys.argv[2]
@@ -58,11 +64,8 @@ def test():
     """
     Test the crew execution and returns the results.
     """
-    inputs = {
-        "topic": "Public Health Triage Advisor",
-        "current_year": str(datetime.now().year)
-    }
-    
+    inputs = demo_inputs(prefetch=True)
+
     try:
         n_iterations = int(sys.argv[1])
         eval_llm = sys.argv[2]
@@ -71,5 +74,45 @@ def test():
         raise Exception(f"An error occurred while testing the crew: {e}")
 
 
+def batch():
+    """
+    Triage a JSONL or CSV intake file, writing one JSON result per line.
+    """
+    from public_health_triage_crew.batch import BATCH_CONCURRENCY, run_batch
+
+    try:
+        input_path = sys.argv[1]
+        output_path = sys.argv[2]
+        concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else BATCH_CONCURRENCY
+        counts = run_batch(input_path, output_path, concurrency=concurrency)
+        print(f"Batch complete: {counts['ok']} ok, {counts['error']} failed, {counts['skipped']} already done")
+    except Exception as e:
+        raise Exception(f"An error occurred while running the batch: {e}")
+
+
+def benchmark():
+    """
+    Benchmark the demo scenarios and write the results as JSON.
+    """
+    import json
+    from public_health_triage_crew.benchmark import (
+        BENCHMARK_ITERATIONS, compare, format_report, run_benchmark
+    )
+
+    try:
+        iterations = int(sys.argv[1]) if len(sys.argv) > 1 else BENCHMARK_ITERATIONS
+        output_path = sys.argv[2] if len(sys.argv) > 2 else "benchmark_results.json"
+        results = run_benchmark(iterations=iterations)
+        with open(output_path, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        print(format_report(results))
+        if len(sys.argv) > 3:
+            with open(sys.argv[3], encoding="utf-8") as handle:
+                print("\nCompared with " + sys.argv[3] + ":")
+                print("\n".join(compare(json.load(handle), results)))
+    except Exception as e:
+        raise Exception(f"An error occurred while benchmarking the crew: {e}")
+
+
 if __name__ == "__main__":
     run()
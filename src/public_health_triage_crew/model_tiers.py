@@ -0,0 +1,51 @@
+"""
+Model tiers for agents and the confidence check that escalates a task to a stronger tier
+"""
+
+import os
+from typing import Iterable, Optional
+
+# Fast tier keeps the historical GEMINI_MODEL so existing .env files behave the same
+GEMINI_FAST_MODEL = os.getenv("GEMINI_FAST_MODEL", os.getenv("GEMINI_MODEL", "gemini-1.5-flash"))
+GEMINI_STRONG_MODEL = os.getenv("GEMINI_STRONG_MODEL", "gemini-1.5-pro")
+
+MODEL_TIERS = {"fast": GEMINI_FAST_MODEL, "strong": GEMINI_STRONG_MODEL}
+
+# Tier for agents in agents.yaml that do not declare model_tier, and the escalation target
+DEFAULT_TIER = "strong"
+ESCALATION_TIER = "strong"
+
+# Answers shorter than this are treated as low confidence
+MIN_CONFIDENT_CHARS = int(os.getenv("TRIAGE_MIN_CONFIDENT_CHARS", "400"))
+
+HEDGING_PHRASES = (
+    "i'm not sure",
+    "i am not sure",
+    "cannot determine",
+    "unable to determine",
+    "not enough information",
+    "insufficient information",
+    "i cannot provide",
+)
+
+
+def tier_model(tier: str) -> str:
+    """Gemini model name for a tier declared in agents.yaml"""
+    try:
+        return MODEL_TIERS[tier]
+    except KeyError:
+        raise ValueError(f"Unknown model_tier '{tier}'; expected one of {sorted(MODEL_TIERS)}")
+
+
+def confidence_issue(raw: str, required_terms: Iterable[str] = ()) -> Optional[str]:
+    """Why an answer looks unreliable, or None when it passes the check"""
+    text = raw.lower()
+    if len(raw.strip()) < MIN_CONFIDENT_CHARS:
+        return "The answer is too short to be a complete assessment"
+    for phrase in HEDGING_PHRASES:
+        if phrase in text:
+            return f"The answer hedges ('{phrase}') instead of committing to an assessment"
+    terms = list(required_terms)
+    if terms and not any(term.lower() in text for term in terms):
+        return "The answer does not state one of: " + ", ".join(terms)
+    return None
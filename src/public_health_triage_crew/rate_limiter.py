@@ -0,0 +1,246 @@
+"""
+Process-wide adaptive rate limiter shared by every LLM call the crews make
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process coordination is unavailable
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Provider quota the whole process (or every process sharing the state file) stays under
+LLM_RPM = float(os.getenv("TRIAGE_LLM_RPM", "15"))
+LLM_TPM = float(os.getenv("TRIAGE_LLM_TPM", "1000000"))
+LLM_MAX_CONCURRENCY = int(os.getenv("TRIAGE_LLM_MAX_CONCURRENCY", "8"))
+
+# Calls slower than this (seconds) shrink the concurrency window; 0 disables
+LLM_LATENCY_TARGET = float(os.getenv("TRIAGE_LLM_LATENCY_TARGET", "0"))
+
+# Share the request/token budget and 429 cooldowns with other worker processes
+RATE_LIMIT_FILE = os.getenv("TRIAGE_RATE_LIMIT_FILE", "")
+
+# Fraction of a minute's quota that may be spent in one burst; the request
+# burst also always covers a full concurrency window (the parallel specialists)
+BURST_FRACTION = 0.1
+
+_RETRY_DELAY = re.compile(r"retry[ _-]?(?:delay|after)\W+(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an LLM exception is the provider refusing for quota reasons"""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "resource_exhausted" in message
+
+
+def retry_delay(error: BaseException) -> Optional[float]:
+    """Server-suggested wait in seconds, when the error message carries one"""
+    match = _RETRY_DELAY.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+def estimate_tokens(messages: Any) -> int:
+    """Rough token count (about four characters per token) for budgeting"""
+    if isinstance(messages, str):
+        return len(messages) // 4 + 1
+    return sum(len(str(message.get("content") or "")) for message in messages) // 4 + 1
+
+
+class LocalState:
+    """Limiter state held in this process only"""
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            yield self._values
+
+
+class FileState:
+    """Limiter state in a small JSON file, serialized with an exclusive flock
+
+    Every worker process pointing at the same file draws from one request and
+    token budget and honours each other's 429 cooldowns.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, Any]]:
+        with self._lock, open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                try:
+                    values = json.loads(handle.read() or "{}")
+                except json.JSONDecodeError:
+                    values = {}
+                yield values
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps(values))
+                handle.flush()
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _reserve(values: Dict[str, Any], name: str, capacity: float, rate: float, amount: float, now: float) -> float:
+    """Take amount from a token bucket and return how long to wait before using it
+
+    The bucket may go negative; later callers then wait behind earlier ones
+    instead of all waking at once when it refills.
+    """
+    tokens, updated = values.get(name, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated) * rate) - amount
+    values[name] = (tokens, now)
+    return -tokens / rate if tokens < 0 else 0.0
+
+
+class AdaptiveRateLimiter:
+    """Request/token buckets plus an AIMD concurrency window
+
+    The buckets keep the process under the configured quota. The window of
+    concurrent calls grows by one call per window of successes and halves on
+    every 429 (or shrinks slightly on calls slower than the latency target),
+    so throughput settles just under what the provider actually accepts
+    instead of oscillating between bursts and backoff storms.
+    """
+
+    def __init__(
+        self,
+        rpm: float = LLM_RPM,
+        tpm: float = LLM_TPM,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        min_concurrency: int = 1,
+        latency_target: float = LLM_LATENCY_TARGET,
+        state: Optional[Any] = None,
+    ):
+        self.request_rate = rpm / 60.0
+        self.token_rate = tpm / 60.0
+        self.request_capacity = max(1.0, min(rpm, max(rpm * BURST_FRACTION, float(max_concurrency))))
+        self.token_capacity = max(1.0, tpm * BURST_FRACTION)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.latency_target = latency_target
+        self.state = state or LocalState()
+
+        self.limit = float(max(self.min_concurrency, self.max_concurrency // 2))
+        self.in_flight = 0
+        self.calls = 0
+        self.rate_limited = 0
+        self.waited = 0.0
+        self._consecutive_429 = 0
+        self._cond = threading.Condition()
+
+    def _wait_for_budget(self, tokens: int) -> None:
+        while True:
+            with self.state.transaction() as values:
+                now = time.time()
+                cooldown = values.get("cooldown_until", 0.0) - now
+                if cooldown <= 0:
+                    wait = max(
+                        _reserve(values, "requests", self.request_capacity, self.request_rate, 1, now),
+                        _reserve(values, "tokens", self.token_capacity, self.token_rate, tokens, now),
+                    )
+            if cooldown > 0:
+                self._sleep(cooldown)
+                continue
+            self._sleep(wait)
+            return
+
+    def _sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            with self._cond:
+                self.waited += seconds
+            time.sleep(seconds)
+
+    @contextmanager
+    def slot(self, tokens: int) -> Iterator[None]:
+        """Hold one concurrent call's worth of the window and quota"""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        try:
+            self._wait_for_budget(tokens)
+            yield
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self, latency: float, estimated_tokens: int, used_tokens: int) -> None:
+        """Grow the window additively, or shrink it if the call was too slow"""
+        if used_tokens != estimated_tokens:
+            with self.state.transaction() as values:
+                # Settle the reservation with what the call actually consumed
+                _reserve(values, "tokens", self.token_capacity, self.token_rate, used_tokens - estimated_tokens, time.time())
+        with self._cond:
+            self.calls += 1
+            self._consecutive_429 = 0
+            if self.latency_target and latency > self.latency_target:
+                self.limit = max(float(self.min_concurrency), self.limit * 0.9)
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def on_rate_limited(self, error: BaseException) -> float:
+        """Halve the window and pause every caller; returns the pause in seconds"""
+        with self._cond:
+            self.calls += 1
+            self.rate_limited += 1
+            self._consecutive_429 += 1
+            self.limit = max(float(self.min_concurrency), self.limit / 2)
+            pause = retry_delay(error) or min(60.0, 2.0 ** self._consecutive_429)
+        with self.state.transaction() as values:
+            values["cooldown_until"] = max(values.get("cooldown_until", 0.0), time.time() + pause)
+        logger.warning("LLM rate limited; pausing %.1fs with concurrency window %.1f", pause, self.limit)
+        return pause
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "calls": self.calls,
+                "rate_limited": self.rate_limited,
+                "waited_s": round(self.waited, 2),
+            }
+
+
+_limiter: Optional[AdaptiveRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Return the process-wide limiter, creating it on first use"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                state: Any = None
+                if RATE_LIMIT_FILE:
+                    if fcntl is None:
+                        logger.warning("TRIAGE_RATE_LIMIT_FILE needs fcntl; limiting this process only")
+                    else:
+                        state = FileState(RATE_LIMIT_FILE)
+                _limiter = AdaptiveRateLimiter(state=state)
+    return _limiter
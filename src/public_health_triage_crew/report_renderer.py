@@ -0,0 +1,189 @@
+"""
+Deterministic Markdown report built from the specialists' structured outputs
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type
+
+from crewai.tasks.task_output import TaskOutput
+from pydantic import BaseModel
+
+from .schemas import (
+    HealthFinancePlan, MaternalChildGuidance, MedicineAvailability, TriageAssessment, parse_structured
+)
+
+REPORT_FILE = "nigerian_health_assessment_report.md"
+
+EMERGENCY_NUMBERS = (
+    ("National Emergency", "112"),
+    ("Police", "199"),
+    ("Fire Service", "112"),
+    ("Lagos State Emergency", "767/199"),
+)
+
+DISCLAIMERS = (
+    "This report is for guidance only and is not a medical diagnosis.",
+    "Seek immediate medical attention if symptoms worsen or any warning sign above appears.",
+    "Costs are estimates and vary by facility and location.",
+)
+
+# First next step for each care level; {within} is the triage's seek_care_within
+CARE_STEPS = {
+    "Home Care": "Manage at home; see a health worker {within} if symptoms do not improve.",
+    "Primary Health Centre": "Go to a primary health centre {within}.",
+    "General Hospital": "Go to a general hospital {within}.",
+    "Teaching Hospital": "Go to a teaching hospital {within}.",
+}
+EMERGENCY_STEP = "Go to the emergency department now."
+
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+
+def structured(output: Optional[TaskOutput], schema: Type[BaseModel]) -> Optional[BaseModel]:
+    """The schema-validated fields of a task output, or None if it is free text
+
+    Outputs from the task cache carry only their raw JSON, so that is parsed
+    again when the pydantic object is missing.
+    """
+    if output is None:
+        return None
+    if isinstance(output.pydantic, schema):
+        return output.pydantic
+    return parse_structured(output.raw, schema)
+
+
+def _bullets(items: List[str]) -> List[str]:
+    return [f"- {item}" for item in items if item]
+
+
+def _labelled(label: str, items: List[str]) -> List[str]:
+    return [f"**{label}:**", *_bullets(items), ""] if items else []
+
+
+def _patient_section(inputs: Mapping[str, Any]) -> List[str]:
+    fields = (
+        ("Name", inputs.get("patient_name")),
+        ("Age", inputs.get("age")),
+        ("Gender", inputs.get("gender")),
+        ("Location", inputs.get("location")),
+        ("Severity", inputs.get("symptom_severity")),
+        ("Symptoms", inputs.get("symptoms")),
+        ("Selected symptoms", ", ".join(inputs.get("selected_symptoms") or [])),
+        ("Medical history", inputs.get("medical_history")),
+    )
+    return ["## Patient Information Summary", *[f"- **{label}:** {value}" for label, value in fields if value]]
+
+
+def _triage_section(triage: TriageAssessment) -> List[str]:
+    return [
+        "## 🏥 Symptom Triage & Urgency Classification",
+        f"**Recommended facility:** {triage.care_level}  ",
+        f"**Urgency:** {triage.urgency} (seek care {triage.seek_care_within})",
+        "",
+        triage.symptom_analysis,
+        "",
+        *_labelled("Seek immediate care if", triage.warning_signs),
+        *_labelled("Initial care", triage.initial_care),
+    ]
+
+
+def _maternal_section(guidance: MaternalChildGuidance) -> List[str]:
+    return [
+        "## 👶 Maternal & Child Health Guidance",
+        guidance.summary,
+        "",
+        *_labelled("Recommendations", guidance.recommendations),
+        *_labelled("Supplements", guidance.supplements),
+        *_labelled("Immunizations", guidance.immunizations),
+        *_labelled("Danger signs", guidance.danger_signs),
+        *_labelled("Free services", guidance.free_services),
+    ]
+
+
+def _medicine_section(medicines: MedicineAvailability) -> List[str]:
+    lines = ["## 💊 Medicine Availability & Costs"]
+    if medicines.medicines:
+        lines += [
+            "| Medicine | Brands | Price (₦) | Where | Prescription |",
+            "|----------|--------|-----------|-------|--------------|",
+        ]
+        for option in medicines.medicines:
+            lines.append(
+                f"| {option.name} | {', '.join(option.brands) or '-'} | {option.price_naira} | "
+                f"{option.where_available} | {'Yes' if option.prescription_required else 'No'} |"
+            )
+        lines.append("")
+    lines += _labelled("Alternatives", medicines.alternatives)
+    lines += _labelled("Cost-saving tips", medicines.cost_saving_tips)
+    return lines
+
+
+def _finance_section(plan: HealthFinancePlan) -> List[str]:
+    lines = ["## 💰 Healthcare Financing Options"]
+    for option in plan.options:
+        lines += [
+            f"### {option.name}",
+            f"- **Covers:** {option.benefit}",
+            f"- **Eligibility:** {option.eligibility}",
+            f"- **How to enrol:** {option.how_to_enrol}",
+            "",
+        ]
+    lines += _labelled("Free services", plan.free_services)
+    lines += [f"**Most cost-effective pathway:** {plan.cheapest_pathway}", ""]
+    return lines
+
+
+def _next_steps(triage: Optional[TriageAssessment], plan: Optional[HealthFinancePlan]) -> List[str]:
+    steps = []
+    if triage is not None:
+        if triage.urgency == "Emergency":
+            steps.append(EMERGENCY_STEP)
+        else:
+            steps.append(CARE_STEPS[triage.care_level].format(within=triage.seek_care_within))
+        steps.extend(triage.initial_care[:3])
+    if plan is not None and plan.cheapest_pathway:
+        steps.append(plan.cheapest_pathway)
+    return [
+        "## 🎯 Next Steps & Action Plan",
+        *[f"{number}. {step}" for number, step in enumerate(steps, start=1)],
+        "",
+        "**Emergency contacts:**",
+        *[f"- {name}: {number}" for name, number in EMERGENCY_NUMBERS],
+    ]
+
+
+# Task name -> (schema, section renderer, heading for free-text outputs), in report order
+SECTIONS: Dict[str, Tuple[Type[BaseModel], Callable[[Any], List[str]], str]] = {
+    "public_health_triage_task": (TriageAssessment, _triage_section, "## 🏥 Symptom Triage & Urgency Classification"),
+    "maternal_child_health_task": (MaternalChildGuidance, _maternal_section, "## 👶 Maternal & Child Health Guidance"),
+    "medicine_availability_locator_task": (MedicineAvailability, _medicine_section, "## 💊 Medicine Availability & Costs"),
+    "health_finance_coach_task": (HealthFinancePlan, _finance_section, "## 💰 Healthcare Financing Options"),
+}
+
+
+def render_report(inputs: Mapping[str, Any], outputs: Mapping[str, Optional[TaskOutput]]) -> str:
+    """Markdown report in the aggregator's section layout
+
+    Sections of specialists that did not run are left out. An output that
+    failed schema validation is included as the specialist wrote it.
+    """
+    lines = [f"# Nigerian Health Assessment Report for {inputs.get('patient_name', '')}", ""]
+    lines += _patient_section(inputs) + [""]
+    fields: Dict[str, Optional[BaseModel]] = {}
+    for task_name, (schema, render, heading) in SECTIONS.items():
+        output = outputs.get(task_name)
+        if output is None:
+            continue
+        fields[task_name] = structured(output, schema)
+        lines += render(fields[task_name]) if fields[task_name] is not None else [heading, output.raw.strip()]
+        lines.append("")
+    lines += _next_steps(fields.get("public_health_triage_task"), fields.get("health_finance_coach_task"))
+    lines += ["", "## ⚠️ Important Disclaimers", *_bullets(list(DISCLAIMERS))]
+    if inputs.get("assessment_date"):
+        lines += ["", f"_Assessment date: {inputs['assessment_date']}_"]
+    return _BLANK_RUNS.sub("\n\n", "\n".join(lines)) + "\n"
+
+
+def write_report(report: str, path: str = REPORT_FILE) -> None:
+    Path(path).write_text(report, encoding="utf-8")
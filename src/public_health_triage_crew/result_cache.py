@@ -0,0 +1,204 @@
+"""
+Opt-in result cache for whole-crew kickoffs keyed on canonicalized intake
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from crewai.crews.crew_output import CrewOutput
+
+from .tools.symptom_matcher import normalize_text
+
+# Backend: "memory", "disk", or unset/"off" to disable caching
+RESULT_CACHE_BACKEND = os.getenv("TRIAGE_RESULT_CACHE", "off").lower()
+RESULT_CACHE_TTL = float(os.getenv("TRIAGE_RESULT_CACHE_TTL", "3600"))
+RESULT_CACHE_SIZE = int(os.getenv("TRIAGE_RESULT_CACHE_SIZE", "256"))
+RESULT_CACHE_PATH = os.getenv("TRIAGE_RESULT_CACHE_PATH", ".triage_cache/results.sqlite3")
+
+# Fields that change between otherwise identical intakes without changing the report;
+# patient_name is kept because the report is addressed to the patient
+VOLATILE_FIELDS = frozenset({"assessment_date", "current_year", "phone"})
+
+# Upper bounds (exclusive) of the age bands used in cache keys
+AGE_BANDS = ((1, "infant"), (5, "under-5"), (13, "child"), (18, "adolescent"), (50, "adult"), (65, "older adult"))
+
+# Only the parts of CrewOutput that round-trip through JSON
+_SERIALIZABLE = {"pydantic": True, "tasks_output": {"__all__": {"pydantic"}}}
+
+
+def age_band(age: Any) -> str:
+    """Bucket an age so near-identical intakes share a key"""
+    try:
+        years = float(age)
+    except (TypeError, ValueError):
+        return normalize_text(str(age))
+    for upper, label in AGE_BANDS:
+        if years < upper:
+            return label
+    return "elderly"
+
+
+def canonicalize_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an inputs dict to the fields that determine the report"""
+    canonical: Dict[str, Any] = {}
+    for key, value in inputs.items():
+        if key in VOLATILE_FIELDS:
+            continue
+        if key == "age":
+            canonical[key] = age_band(value)
+        elif isinstance(value, (list, tuple, set)):
+            canonical[key] = sorted({normalize_text(str(item)) for item in value})
+        elif isinstance(value, str):
+            canonical[key] = normalize_text(value)
+        else:
+            canonical[key] = value
+    return canonical
+
+
+def cache_key(inputs: Dict[str, Any]) -> str:
+    """Stable hash of the canonical inputs"""
+    payload = json.dumps(canonicalize_inputs(inputs), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created, value = entry
+            if self.ttl and time.time() - created > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskBackend:
+    """SQLite-backed LRU shared by every session and worker on the machine"""
+
+    def __init__(self, path: str = RESULT_CACHE_PATH, max_entries: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl and now - created > self.ttl:
+                self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._db.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+
+
+class ResultCache:
+    """Caches CrewOutput by canonical intake and reports its hit rate"""
+
+    def __init__(self, backend: Any):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, inputs: Dict[str, Any]) -> Optional[CrewOutput]:
+        stored = self.backend.get(cache_key(inputs))
+        self._count(stored is not None)
+        if stored is None:
+            return None
+        return CrewOutput.model_validate(json.loads(stored)["output"])
+
+    def put(self, inputs: Dict[str, Any], output: CrewOutput) -> None:
+        entry = {"output": output.model_dump(mode="json", exclude=_SERIALIZABLE)}
+        self.backend.set(cache_key(inputs), json.dumps(entry))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 4)}
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Return the process-wide result cache, or None when caching is off"""
+    global _cache
+    if RESULT_CACHE_BACKEND not in ("memory", "disk"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                backend = DiskBackend() if RESULT_CACHE_BACKEND == "disk" else MemoryBackend()
+                _cache = ResultCache(backend)
+    return _cache
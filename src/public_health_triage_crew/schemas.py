@@ -0,0 +1,91 @@
+"""
+Structured outputs the specialists return when the report is rendered from a template
+"""
+
+import re
+from typing import Dict, List, Literal, Optional, Type
+
+from pydantic import BaseModel, Field, ValidationError
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+CareLevel = Literal["Home Care", "Primary Health Centre", "General Hospital", "Teaching Hospital"]
+
+
+class TriageAssessment(BaseModel):
+    """Urgency classification from the triage specialist"""
+
+    care_level: CareLevel = Field(description="Facility level the patient should attend")
+    urgency: Literal["Routine", "Soon", "Urgent", "Emergency"] = Field(description="How quickly care is needed")
+    seek_care_within: str = Field(description="Time frame, e.g. 'within 24 hours' or 'immediately'")
+    symptom_analysis: str = Field(description="Two to four sentences explaining the classification")
+    warning_signs: List[str] = Field(default_factory=list, description="Signs that require immediate escalation")
+    initial_care: List[str] = Field(default_factory=list, description="Care steps to take now")
+
+
+class MaternalChildGuidance(BaseModel):
+    """Maternal and child health recommendations"""
+
+    summary: str = Field(description="One or two sentences on how the guidance applies to this patient")
+    recommendations: List[str] = Field(default_factory=list, description="Age-specific health recommendations")
+    supplements: List[str] = Field(default_factory=list, description="Supplements with dose, if applicable")
+    immunizations: List[str] = Field(default_factory=list, description="Due or upcoming immunizations, if applicable")
+    danger_signs: List[str] = Field(default_factory=list, description="Pregnancy or child danger signs to watch for")
+    free_services: List[str] = Field(default_factory=list, description="Free services at PHCs or hospitals")
+
+
+class MedicineOption(BaseModel):
+    name: str = Field(description="Generic name")
+    brands: List[str] = Field(default_factory=list, description="Nigerian brand equivalents")
+    price_naira: str = Field(description="Typical price range, e.g. '₦500 - ₦1,200'")
+    where_available: str = Field(description="PHC, general hospital and/or pharmacy")
+    prescription_required: bool = Field(description="Whether a prescription is needed")
+
+
+class MedicineAvailability(BaseModel):
+    """Medicine options and costs"""
+
+    medicines: List[MedicineOption] = Field(default_factory=list)
+    alternatives: List[str] = Field(default_factory=list, description="Alternatives if the options are unavailable")
+    cost_saving_tips: List[str] = Field(default_factory=list)
+
+
+class FinancingOption(BaseModel):
+    name: str = Field(description="Scheme or programme name, e.g. NHIS or a state scheme")
+    benefit: str = Field(description="What it covers for this patient")
+    eligibility: str = Field(description="Who qualifies")
+    how_to_enrol: str = Field(description="Where and how to apply")
+
+
+class HealthFinancePlan(BaseModel):
+    """Financing options and the cheapest care pathway"""
+
+    options: List[FinancingOption] = Field(default_factory=list)
+    free_services: List[str] = Field(default_factory=list, description="Services available free of charge")
+    cheapest_pathway: str = Field(description="Most cost-effective care pathway for this patient")
+
+
+# Names usable as output_schema in tasks.yaml
+SCHEMAS: Dict[str, Type[BaseModel]] = {
+    schema.__name__: schema
+    for schema in (TriageAssessment, MaternalChildGuidance, MedicineAvailability, HealthFinancePlan)
+}
+
+
+def get_schema(name: str) -> Type[BaseModel]:
+    """Schema class for an output_schema declared in tasks.yaml"""
+    try:
+        return SCHEMAS[name]
+    except KeyError:
+        raise ValueError(f"Unknown output_schema '{name}'; expected one of {sorted(SCHEMAS)}")
+
+
+def parse_structured(raw: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+    """The schema instance in a model answer (possibly wrapped in prose or a code fence), or None"""
+    match = _JSON_OBJECT.search(raw or "")
+    if match is None:
+        return None
+    try:
+        return schema.model_validate_json(match.group(0))
+    except ValidationError:
+        return None
@@ -0,0 +1,65 @@
+"""
+Routes streamed LLM chunks from the crewai event bus to per-kickoff listeners
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from crewai.utilities.events import LLMStreamChunkEvent, crewai_event_bus
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+_listeners: Dict[str, Callable[[str], None]] = {}
+_lock = threading.Lock()
+_registered = False
+
+
+def _on_chunk(source: Any, event: LLMStreamChunkEvent) -> None:
+    listener = _listeners.get(str(event.task_id)) if event.task_id else None
+    if listener is not None:
+        listener(event.chunk)
+
+
+def _ensure_registered() -> None:
+    # One bus handler for the whole process; listeners are looked up per task
+    global _registered
+    with _lock:
+        if not _registered:
+            crewai_event_bus.register_handler(LLMStreamChunkEvent, _on_chunk)
+            _registered = True
+
+
+@contextmanager
+def stream_task(task: Any, callback: Optional[Callable[[str], None]]) -> Iterator[None]:
+    """Deliver the text chunks of a task's LLM calls to callback while active"""
+    if callback is None:
+        yield
+        return
+    _ensure_registered()
+    key = str(task.id)
+    _listeners[key] = callback
+    try:
+        yield
+    finally:
+        _listeners.pop(key, None)
+
+
+class FinalAnswerStream:
+    """Accumulates streamed ReAct text and exposes only the final answer part
+
+    Agents stream "Thought: ... Final Answer: <report>"; the reasoning prefix is
+    hidden until the marker arrives, then everything after it is shown.
+    """
+
+    def __init__(self):
+        self.text = ""
+
+    def feed(self, chunk: str) -> str:
+        self.text += chunk
+        return self.visible
+
+    @property
+    def visible(self) -> str:
+        _, marker, answer = self.text.rpartition(FINAL_ANSWER_MARKER)
+        return answer.lstrip() if marker else ""
@@ -0,0 +1,121 @@
+"""
+Per-task output cache for specialists whose output depends on a few intake fields
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from crewai.tasks.task_output import TaskOutput
+
+from .result_cache import DiskBackend, MemoryBackend, age_band
+from .tools.symptom_matcher import normalize_text
+
+# Backend: "memory" (default), "disk", or "off"
+TASK_CACHE_BACKEND = os.getenv("TRIAGE_TASK_CACHE", "memory").lower()
+TASK_CACHE_TTL = float(os.getenv("TRIAGE_TASK_CACHE_TTL", "21600"))
+TASK_CACHE_SIZE = int(os.getenv("TRIAGE_TASK_CACHE_SIZE", "512"))
+TASK_CACHE_PATH = os.getenv("TRIAGE_TASK_CACHE_PATH", ".triage_cache/tasks.sqlite3")
+
+# Condition classes in priority order; the first pattern found in the intake wins
+CONDITION_BUCKETS = (
+    ("maternal", re.compile(r"\b(?:pregnan\w*|antenatal|labou?r pains?|postpartum|breastfeed\w*|trimester)\b")),
+    ("cardiovascular", re.compile(r"\b(?:chest pain|hypertension|blood pressure|heart|palpitations?)\b")),
+    ("respiratory", re.compile(r"\b(?:cough\w*|breath\w*|wheez\w*|pneumonia|asthma|catarrh)\b")),
+    ("gastrointestinal", re.compile(r"\b(?:diarrh\w*|vomit\w*|stomach|abdominal|loose stools?|cholera)\b")),
+    ("febrile", re.compile(r"\b(?:fever\w*|malaria|typhoid|temperature|chills)\b")),
+    ("skin", re.compile(r"\b(?:rash\w*|itch\w*|skin)\b")),
+)
+
+
+def condition_bucket(inputs: Dict[str, Any]) -> str:
+    """Classify the intake into a coarse condition class"""
+    selected = inputs.get("selected_symptoms") or []
+    text = normalize_text(" ".join([str(inputs.get("symptoms", ""))] + [str(item) for item in selected]))
+    for bucket, pattern in CONDITION_BUCKETS:
+        if pattern.search(text):
+            return bucket
+    return "general"
+
+
+def derived_fields(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields computed from the intake that task cache keys may declare"""
+    return {
+        "condition_bucket": condition_bucket(inputs),
+        "age_band": age_band(inputs.get("age")),
+    }
+
+
+class TaskOutputCache:
+    """Caches TaskOutput per task name and declared key fields
+
+    Only tasks whose descriptions leave out the patient's name and other
+    personal details should declare key fields, as their output is returned
+    unchanged to every patient sharing those fields.
+    """
+
+    def __init__(self, backend: Any):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(task_name: str, fields: Sequence[str], inputs: Dict[str, Any]) -> str:
+        derived = derived_fields(inputs)
+        values = {}
+        for field in fields:
+            value = derived[field] if field in derived else inputs.get(field, "")
+            values[field] = normalize_text(str(value))
+        payload = json.dumps({"task": task_name, "fields": values}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, task_name: str, fields: Sequence[str], inputs: Dict[str, Any]) -> Optional[TaskOutput]:
+        stored = self.backend.get(self.key(task_name, fields, inputs))
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if stored is None:
+            return None
+        return TaskOutput.model_validate(json.loads(stored)["output"])
+
+    def put(self, task_name: str, fields: Sequence[str], inputs: Dict[str, Any], output: TaskOutput) -> None:
+        entry = {"output": output.model_dump(mode="json", exclude={"pydantic"})}
+        self.backend.set(self.key(task_name, fields, inputs), json.dumps(entry))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hits / total, 4) if total else 0.0}
+
+
+_cache: Optional[TaskOutputCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_task_cache() -> Optional[TaskOutputCache]:
+    """Return the process-wide task cache, or None when it is switched off"""
+    global _cache
+    if TASK_CACHE_BACKEND not in ("memory", "disk"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if TASK_CACHE_BACKEND == "disk":
+                    backend: Any = DiskBackend(TASK_CACHE_PATH, TASK_CACHE_SIZE, TASK_CACHE_TTL)
+                else:
+                    backend = MemoryBackend(TASK_CACHE_SIZE, TASK_CACHE_TTL)
+                _cache = TaskOutputCache(backend)
+    return _cache
+
+
+def declared_key_fields(task_config: Dict[str, Any]) -> List[str]:
+    """Cache key fields declared on a task in tasks.yaml"""
+    return list(task_config.get("cache_key_fields") or [])
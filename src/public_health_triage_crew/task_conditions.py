@@ -0,0 +1,89 @@
+"""
+Declarative run_when conditions that decide which specialist tasks a patient needs
+"""
+
+from typing import Any, Dict, Mapping
+
+from .task_cache import condition_bucket
+from .tools.symptom_matcher import get_default_matcher
+
+# Comparison operators usable as {operator: value} against a fact
+_OPERATORS = {
+    "eq": lambda fact, value: _normalize(fact) == _normalize(value),
+    "ne": lambda fact, value: _normalize(fact) != _normalize(value),
+    "lt": lambda fact, value: fact is not None and fact < value,
+    "lte": lambda fact, value: fact is not None and fact <= value,
+    "gt": lambda fact, value: fact is not None and fact > value,
+    "gte": lambda fact, value: fact is not None and fact >= value,
+    "in": lambda fact, value: _normalize(fact) in {_normalize(item) for item in value},
+    "not_in": lambda fact, value: _normalize(fact) not in {_normalize(item) for item in value},
+}
+
+
+def _normalize(value: Any) -> Any:
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+def _age(value: Any) -> Any:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def intake_facts(inputs: Mapping[str, Any]) -> Dict[str, Any]:
+    """Facts about the intake that run_when conditions can test"""
+    symptoms = str(inputs.get("symptoms") or "")
+    findings = get_default_matcher().detect(symptoms)
+    age = _age(inputs.get("age"))
+    bucket = condition_bucket(dict(inputs))
+    return {
+        "age": age,
+        "age_known": age is not None,
+        "gender": str(inputs.get("gender") or ""),
+        "severity": str(inputs.get("symptom_severity") or ""),
+        "pregnant": bucket == "maternal",
+        "condition_bucket": bucket,
+        "critical_findings": findings,
+        "emergency": bool(inputs.get("is_emergency")) or bool(findings),
+    }
+
+
+def evaluate(condition: Any, facts: Mapping[str, Any]) -> bool:
+    """Evaluate a run_when condition against intake facts
+
+    A condition is a mapping whose entries must all hold. "any", "all" and
+    "not" nest conditions; any other key names a fact and is compared with a
+    scalar (equality), a list (membership) or {operator: value} pairs.
+    """
+    if isinstance(condition, list):
+        return all(evaluate(item, facts) for item in condition)
+    if not isinstance(condition, Mapping):
+        raise ValueError(f"run_when entries must be mappings, got {condition!r}")
+    for key, expected in condition.items():
+        if key == "any":
+            holds = any(evaluate(item, facts) for item in expected)
+        elif key == "all":
+            holds = all(evaluate(item, facts) for item in expected)
+        elif key == "not":
+            holds = not evaluate(expected, facts)
+        elif key not in facts:
+            raise ValueError(f"Unknown run_when fact '{key}'; expected one of {sorted(facts)}")
+        elif isinstance(expected, Mapping):
+            unknown = set(expected) - set(_OPERATORS)
+            if unknown:
+                raise ValueError(f"Unknown run_when operator(s) {sorted(unknown)} for '{key}'")
+            holds = all(_OPERATORS[operator](facts[key], value) for operator, value in expected.items())
+        elif isinstance(expected, list):
+            holds = _OPERATORS["in"](facts[key], expected)
+        else:
+            holds = _OPERATORS["eq"](facts[key], expected)
+        if not holds:
+            return False
+    return True
+
+
+def should_run(task_config: Mapping[str, Any], facts: Mapping[str, Any]) -> bool:
+    """Whether a task's declared run_when (if any) holds for this intake"""
+    condition = task_config.get("run_when")
+    return True if condition is None else evaluate(condition, facts)
@@ -0,0 +1,124 @@
+"""
+Task types used by PublicHealthTriageCrew
+"""
+
+import os
+import re
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from crewai import Task
+from crewai.agents.agent_builder.base_agent import BaseAgent
+from crewai.tasks.task_output import TaskOutput
+from pydantic import BaseModel, PrivateAttr
+
+from .rate_limiter import estimate_tokens
+from .schemas import parse_structured
+
+# Upper bound on the characters of each specialist summary the aggregator reads
+HANDOFF_SUMMARY_CHARS = int(os.getenv("TRIAGE_HANDOFF_SUMMARY_CHARS", "1200"))
+
+HANDOFF_HEADING = "## Handoff Summary"
+
+# Appended to each specialist's expected output in handoff mode
+HANDOFF_INSTRUCTION = f"""
+
+End your answer with a section headed exactly "{HANDOFF_HEADING}" containing at most
+6 short bullet points (under 120 words in total) with the findings, recommendations,
+costs and urgent warnings the final patient report must include.
+"""
+
+_HANDOFF_SECTION = re.compile(r"^#+\s*handoff summary\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+def handoff_summary(raw: str, limit: int = HANDOFF_SUMMARY_CHARS) -> str:
+    """The bounded handoff section of a specialist output
+
+    Outputs without the section (e.g. cached before handoff mode was enabled)
+    fall back to their opening text.
+    """
+    match = _HANDOFF_SECTION.search(raw)
+    text = (raw[match.end():] if match else raw).strip()
+    if len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit)
+    return text[: cut if cut > limit // 2 else limit].rstrip() + " ..."
+
+
+class SpecialistTask(Task):
+    """Task whose async execution surfaces failures instead of hanging the crew
+
+    crewai only resolves the future of an async task on success, so an LLM
+    error in one parallel specialist would leave the aggregator waiting forever.
+    A structured answer that does not match its schema keeps its raw text.
+    """
+
+    def _execute_task_async(
+        self,
+        agent: Optional[BaseAgent],
+        context: Optional[str],
+        tools: Optional[List[Any]],
+        future: "Future[TaskOutput]",
+    ) -> None:
+        try:
+            future.set_result(self._execute_core(agent, context, tools))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _export_output(self, result: str) -> Tuple[Optional[BaseModel], Optional[Dict[str, Any]]]:
+        # Validate output_pydantic locally; crewai would otherwise spend another
+        # LLM call, outside the rate limiter and offline backends, converting a
+        # free-text answer and fail the task if that call fails
+        if self.output_pydantic is None:
+            return super()._export_output(result)
+        return parse_structured(result, self.output_pydantic), None
+
+
+class AggregatorTask(Task):
+    """Task that can read compact specialist handoff summaries instead of full outputs"""
+
+    handoff_summaries: bool = False
+    summary_chars: int = HANDOFF_SUMMARY_CHARS
+    _context_tokens: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    @property
+    def context_tokens(self) -> Dict[str, int]:
+        """Estimated tokens of the full and the handoff context of the last run"""
+        return dict(self._context_tokens)
+
+    def handoff_context(self) -> str:
+        sections = []
+        for task in self.context or []:
+            if task.output is None:
+                continue
+            title = (task.output.agent or task.name or "Specialist").strip()
+            sections.append(f"### {title}\n{handoff_summary(task.output.raw, self.summary_chars)}")
+        return "\n\n".join(sections)
+
+    def skipped_note(self) -> str:
+        """Tells the aggregator which specialists were not consulted for this patient"""
+        skipped = [(task.agent.role if task.agent else task.name).strip() for task in self.context or [] if task.output is None]
+        if not skipped:
+            return ""
+        return (
+            "Not consulted for this patient (not relevant to the intake): "
+            + ", ".join(skipped)
+            + ". Omit their report sections instead of inventing content for them."
+        )
+
+    def execute_sync(
+        self,
+        agent: Optional[BaseAgent] = None,
+        context: Optional[str] = None,
+        tools: Optional[List[Any]] = None,
+    ) -> TaskOutput:
+        if self.handoff_summaries and isinstance(self.context, list):
+            summaries = self.handoff_context()
+            self._context_tokens = {"full": estimate_tokens(context or ""), "handoff": estimate_tokens(summaries)}
+            context = summaries
+        else:
+            self._context_tokens = {"full": estimate_tokens(context or "")}
+        note = self.skipped_note() if isinstance(self.context, list) else ""
+        if note:
+            context = f"{context}\n\n{note}" if context else note
+        return super().execute_sync(agent=agent, context=context, tools=tools)
@@ -0,0 +1,183 @@
+"""
+Indexed CSV lookups: each file is loaded once and searched through a token inverted index
+"""
+
+import bisect
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .symptom_matcher import normalize_text
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+_APOSTROPHES = re.compile(r"['’`´]")
+_TOKEN = re.compile(r"[^\W_]+")
+
+# Candidate rows checked against the other terms at a time
+_PROBE_CHUNK = 4096
+
+
+def tokenize(value: Any) -> List[str]:
+    """Lowercase word tokens, with diacritics stripped as in normalize_text"""
+    text = str(value)
+    text = text.lower() if text.isascii() else normalize_text(text)
+    return _TOKEN.findall(_APOSTROPHES.sub("", text))
+
+
+def _segments(order: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenate order[start:start + count] for every segment without a Python loop"""
+    total = int(counts.sum())
+    if total == 0:
+        return _EMPTY
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return order[np.arange(total) + shift]
+
+
+class CsvIndex:
+    """Columnar copy of a CSV file with an inverted index over its tokens
+
+    Rows stay in pandas' column arrays. Postings are one CSR structure: rows
+    sorted by (column, token), so every token of a column, and every token
+    sharing a prefix, is a single contiguous slice. Cells are tokenized once
+    per distinct value, which keeps building cheap for long lists that repeat
+    states, facility types or drug names.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        stat = os.stat(path)
+        self.stamp = (stat.st_mtime_ns, stat.st_size)
+        self.frame = pd.read_csv(path, low_memory=False)
+        self.columns = [str(column) for column in self.frame.columns]
+        self._column_ids = {normalize_text(column): index for index, column in enumerate(self.columns)}
+        self._build()
+
+    def _build(self) -> None:
+        vocabulary: Dict[str, int] = {}
+        keys, rows = [], []
+        for column_id, column in enumerate(self.frame.columns):
+            codes, uniques = pd.factorize(self.frame[column], sort=False)
+            pair_values, pair_tokens = [], []
+            for value_id, value in enumerate(uniques):
+                for token in set(tokenize(value)):
+                    pair_values.append(value_id)
+                    pair_tokens.append(vocabulary.setdefault(token, len(vocabulary)))
+            if not pair_values:
+                continue
+            # Rows grouped by distinct value; code -1 (missing) sorts first and is never referenced
+            order = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            starts = np.searchsorted(codes[order], np.arange(len(uniques)))
+            values = np.asarray(pair_values)
+            rows.append(_segments(order, starts[values], counts[values]))
+            keys.append(np.repeat(np.asarray(pair_tokens, dtype=np.int64), counts[values]) + column_id * (1 << 32))
+
+        # Token ids follow sorted order so a prefix covers a range of ids
+        self.vocabulary = sorted(vocabulary)
+        rank = np.empty(len(vocabulary), dtype=np.int64)
+        rank[[vocabulary[token] for token in self.vocabulary]] = np.arange(len(vocabulary))
+        all_keys = np.concatenate(keys) if keys else _EMPTY
+        all_rows = np.concatenate(rows) if rows else _EMPTY
+        all_keys = (all_keys >> 32) * len(vocabulary) + rank[all_keys & 0xFFFFFFFF]
+        order = np.lexsort((all_rows, all_keys))
+        self._postings = all_rows[order].astype(np.uint32 if len(self.frame) < 2**32 else np.int64)
+        self._offsets = np.searchsorted(all_keys[order], np.arange(len(self.columns) * len(vocabulary) + 1))
+
+    def _token_range(self, token: str, prefix: bool) -> Tuple[int, int]:
+        low = bisect.bisect_left(self.vocabulary, token)
+        if prefix:
+            return low, bisect.bisect_left(self.vocabulary, token + "\uffff", low)
+        return low, low + 1 if low < len(self.vocabulary) and self.vocabulary[low] == token else low
+
+    def _rows(self, token: str, column_ids: List[int], prefix: bool) -> np.ndarray:
+        """Sorted rows matching one term"""
+        low, high = self._token_range(token, prefix)
+        if low == high:
+            return _EMPTY
+        size = len(self.vocabulary)
+        slices = [self._postings[self._offsets[c * size + low]:self._offsets[c * size + high]] for c in column_ids]
+        slices = [rows for rows in slices if len(rows)]
+        if not slices:
+            return _EMPTY
+        if len(slices) == 1 and high - low == 1:
+            return slices[0]  # Already sorted and unique: no copy
+        if sum(len(rows) for rows in slices) < len(self.frame) // 16:
+            return np.unique(np.concatenate(slices))
+        # Large unions are cheaper as a row bitmap than as a sort
+        mask = np.zeros(len(self.frame), dtype=bool)
+        for rows in slices:
+            mask[rows] = True
+        return np.flatnonzero(mask)
+
+    def search(
+        self,
+        query: str,
+        max_rows: int = 10,
+        columns: Optional[List[str]] = None,
+        prefix: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Rows containing every query token, in file order
+
+        A term written column:value only matches that column; columns limits
+        the remaining terms. With prefix, "amox" also matches "amoxicillin".
+        """
+        default_ids = list(range(len(self.columns)))
+        if columns:
+            default_ids = [self._column_id(column) for column in columns]
+        terms: List[Tuple[str, List[int]]] = []
+        for part in query.split():
+            column, separator, value = part.partition(":")
+            if separator and normalize_text(column) in self._column_ids:
+                ids = [self._column_ids[normalize_text(column)]]
+            else:
+                ids, value = default_ids, part
+            terms += [(token, ids) for token in tokenize(value)]
+        if not terms:
+            return []
+
+        postings = sorted((self._rows(token, ids, prefix) for token, ids in terms), key=len)
+        # Probe the rarest term's rows in file order against the others and
+        # stop once max_rows are found, instead of intersecting whole lists
+        found: List[np.ndarray] = []
+        remaining = max_rows
+        for start in range(0, len(postings[0]), _PROBE_CHUNK):
+            candidates = postings[0][start:start + _PROBE_CHUNK]
+            for rows in postings[1:]:
+                positions = np.minimum(np.searchsorted(rows, candidates), len(rows) - 1)
+                candidates = candidates[rows[positions] == candidates]
+                if not len(candidates):
+                    break
+            found.append(candidates[:remaining])
+            remaining -= len(found[-1])
+            if remaining <= 0:
+                break
+        rows = np.concatenate(found) if found else _EMPTY
+        return self.frame.iloc[rows].to_dict(orient="records")
+
+    def _column_id(self, column: str) -> int:
+        try:
+            return self._column_ids[normalize_text(column)]
+        except KeyError:
+            raise ValueError(f"Unknown column '{column}' in {self.path}; expected one of {self.columns}")
+
+
+_indexes: Dict[str, CsvIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_csv_index(path: str) -> CsvIndex:
+    """Return the index for path, rebuilding it when the file changed on disk"""
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    index = _indexes.get(key)
+    if index is None or index.stamp != (stat.st_mtime_ns, stat.st_size):
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None or index.stamp != (stat.st_mtime_ns, stat.st_size):
+                index = _indexes[key] = CsvIndex(key)
+    return index
@@ -2,60 +2,96 @@
 Custom tools for the CrewAI agent project
 """
 
-import pandas as pd
-import requests
 from typing import List, Dict, Any, Optional
-from crewai import Tool
+from crewai.tools import tool
+from .csv_index import get_csv_index
+from .fetcher import get_fetcher
+from .tool_cache import ToolMemo, get_tool_memo
 
 
-def csv_lookup(path: str, query: str, max_rows: int = 10) -> List[Dict[str, Any]]:
+def csv_lookup(
+    path: str,
+    query: str,
+    max_rows: int = 10,
+    columns: Optional[List[str]] = None,
+    prefix: bool = True,
+) -> List[Dict[str, Any]]:
     """
     Look up data in a CSV file based on a query.
     
+    The file is loaded and indexed once and reloaded when it changes on disk
+    (see csv_index.py). Rows must contain every word of the query.
+    
     Args:
         path: Path to the CSV file
-        query: Search query to match against any column
+        query: Search words matched against any column; "column:word" restricts a word to one column
         max_rows: Maximum number of rows to return
+        columns: Only match the plain words against these columns
+        prefix: Match words by prefix, so "amox" finds "Amoxicillin"
         
     Returns:
         List of matching records as dictionaries
     """
     try:
-        df = pd.read_csv(path)
-        matches = df[df.apply(lambda row: row.astype(str).str.contains(query, case=False).any(), axis=1)]
-        return matches.head(max_rows).to_dict(orient="records")
+        return get_csv_index(path).search(query, max_rows=max_rows, columns=columns, prefix=prefix)
     except Exception as e:
         return [{"error": f"Failed to read CSV file: {str(e)}"}]
 
 
-def web_fetch(url: str, timeout: int = 10) -> str:
+def web_fetch(url: str, timeout: int = 10, max_bytes: Optional[int] = None) -> str:
     """
     Fetch content from a web URL.
     
+    Requests share one pooled session and an HTTP cache that honors
+    ETag, Last-Modified and Cache-Control (see fetcher.py). HTML is reduced
+    to its visible text and the body is capped at max_bytes.
+    
     Args:
         url: URL to fetch content from
         timeout: Request timeout in seconds
+        max_bytes: Body bytes to read; defaults to TRIAGE_FETCH_MAX_BYTES
         
     Returns:
         Content from the URL as string
     """
-    try:
-        response = requests.get(url, timeout=timeout)
-        response.raise_for_status()
-        return response.text
-    except Exception as e:
-        return f"Error fetching URL: {str(e)}"
+    result = get_fetcher().fetch(url, timeout=timeout, max_bytes=max_bytes)
+    if result.error:
+        return f"Error fetching URL: {result.error}"
+    return result.text + ("\n\n[truncated]" if result.truncated else "")
+
+
+def web_fetch_many(urls: List[str], timeout: int = 10, max_bytes: Optional[int] = None) -> Dict[str, str]:
+    """
+    Fetch several web URLs concurrently.
+    
+    Args:
+        urls: URLs to fetch
+        timeout: Request timeout in seconds, per URL
+        max_bytes: Body bytes to read per URL
+        
+    Returns:
+        Content (or an error message) per URL
+    """
+    return {
+        result.url: f"Error fetching URL: {result.error}" if result.error
+        else result.text + ("\n\n[truncated]" if result.truncated else "")
+        for result in get_fetcher().fetch_many(urls, timeout=timeout, max_bytes=max_bytes)
+    }
+
+
+# Create CrewAI Tool objects; the functions stay callable on their own
+csv_lookup_tool = tool("csv_lookup")(csv_lookup)
+
+web_fetch_tool = tool("web_fetch")(web_fetch)
 
+web_fetch_many_tool = tool("web_fetch_many")(web_fetch_many)
 
-# Create CrewAI Tool objects
-csv_lookup_tool = Tool(
-    name="csv_lookup",
-    description="Look up data in a CSV file based on a search query",
-    func=csv_lookup
-)
 
-web_fetch_tool = Tool(
-    name="web_fetch", 
-    description="Fetch content from a web URL",
-    func=web_fetch
-)
+def create_custom_tools(memo: Optional[ToolMemo] = None):
+    """Create and return the generic data tools, memoized through memo (the process-wide one by default)"""
+    memo = memo or get_tool_memo()
+    return [
+        memo.tool(csv_lookup_tool),
+        memo.tool(web_fetch_tool),
+        memo.tool(web_fetch_many_tool),
+    ]
@@ -2,25 +2,69 @@
 Emergency response tools for critical health situations
 """
 
-import json
-from typing import Dict, List
+from typing import List, Optional
 from crewai.tools import tool
+from .facility_index import describe_distance, get_facility_index
+from .location_resolver import resolve_location
+from .symptom_matcher import get_default_matcher
+from .tool_cache import ToolMemo, get_tool_memo
+
+# Emergency types the hospital finder understands, as facility specialties
+EMERGENCY_SPECIALTIES = {
+    "general": "emergency",
+    "cardiac": "cardiac",
+    "pediatric": "pediatric",
+    "maternity": "maternity",
+    "trauma": "trauma",
+}
+
+# Emergency numbers by state code; other locations get the national numbers
+EMERGENCY_CONTACTS = {
+    "NG-LA": {
+        "Emergency": "112",
+        "Police": "100",
+        "Ambulance": "112",
+        "Fire": "112",
+        "Lagos Emergency": "0800-123-4567",
+    },
+    "NG-KN": {
+        "Emergency": "112",
+        "Police": "100",
+        "Ambulance": "112",
+        "Kano Emergency": "0800-987-6543",
+    },
+    "NG-RI": {
+        "Emergency": "112",
+        "Police": "100",
+        "Ambulance": "112",
+        "Port Harcourt Emergency": "0800-555-1234",
+    },
+}
+
+FIRST_AID_GUIDE = {
+    "bleeding": "Apply direct pressure with clean cloth, elevate if possible, call emergency services",
+    "burn": "Cool with running water for 10-20 minutes, cover with sterile bandage, seek medical help",
+    "choking": "Perform Heimlich maneuver, call emergency services immediately",
+    "not breathing": "Call 112 now, then give CPR: 30 firm chest compressions followed by 2 rescue breaths, repeated until help arrives",
+    "head injury": "Keep person still, monitor consciousness, call emergency services",
+    "fracture": "Immobilize the area, apply ice, seek medical attention",
+    "heart attack": "Call emergency services immediately, have person sit down, give aspirin if available",
+    "stroke": "Remember FAST: Face drooping, Arm weakness, Speech difficulty, Time to call emergency",
+}
 
 class EmergencyTools:
     """Emergency response and critical care tools"""
     
+    @staticmethod
+    def detect_critical_symptoms(symptoms: str) -> List[str]:
+        """Return the critical emergency findings affirmed in a symptom description"""
+        return get_default_matcher().detect(symptoms)
+    
     @staticmethod
     def emergency_triage_assessment(symptoms: str, vital_signs: str = "") -> str:
         """Perform emergency triage assessment"""
         try:
-            critical_keywords = [
-                "chest pain", "heart attack", "stroke", "unconscious", 
-                "severe bleeding", "difficulty breathing", "seizure",
-                "head injury", "poisoning", "anaphylaxis"
-            ]
-            
-            symptoms_lower = symptoms.lower()
-            critical_found = [kw for kw in critical_keywords if kw in symptoms_lower]
+            critical_found = EmergencyTools.detect_critical_symptoms(symptoms)
             
             if critical_found:
                 return f"🚨 CRITICAL EMERGENCY DETECTED! Symptoms: {', '.join(critical_found)}. IMMEDIATE ACTION REQUIRED: Call 112 or go to nearest hospital immediately!"
@@ -34,31 +78,10 @@ class EmergencyTools:
     def get_emergency_contacts(location: str) -> str:
         """Get emergency contact numbers for a location"""
         try:
-            contacts = {
-                "Lagos": {
-                    "Emergency": "112",
-                    "Police": "100",
-                    "Ambulance": "112",
-                    "Fire": "112",
-                    "Lagos Emergency": "0800-123-4567"
-                },
-                "Kano": {
-                    "Emergency": "112",
-                    "Police": "100",
-                    "Ambulance": "112",
-                    "Kano Emergency": "0800-987-6543"
-                },
-                "Port Harcourt": {
-                    "Emergency": "112",
-                    "Police": "100",
-                    "Ambulance": "112",
-                    "Port Harcourt Emergency": "0800-555-1234"
-                }
-            }
-            
-            if location in contacts:
-                result = f"Emergency contacts for {location}:\n"
-                for service, number in contacts[location].items():
+            place = resolve_location(location)
+            if place is not None and place.state_code in EMERGENCY_CONTACTS:
+                result = f"Emergency contacts for {place.label}:\n"
+                for service, number in EMERGENCY_CONTACTS[place.state_code].items():
                     result += f"- {service}: {number}\n"
                 return result
             else:
@@ -71,18 +94,8 @@ class EmergencyTools:
     def first_aid_instructions(injury_type: str) -> str:
         """Provide first aid instructions for common injuries"""
         try:
-            first_aid_guide = {
-                "bleeding": "Apply direct pressure with clean cloth, elevate if possible, call emergency services",
-                "burn": "Cool with running water for 10-20 minutes, cover with sterile bandage, seek medical help",
-                "choking": "Perform Heimlich maneuver, call emergency services immediately",
-                "head injury": "Keep person still, monitor consciousness, call emergency services",
-                "fracture": "Immobilize the area, apply ice, seek medical attention",
-                "heart attack": "Call emergency services immediately, have person sit down, give aspirin if available",
-                "stroke": "Remember FAST: Face drooping, Arm weakness, Speech difficulty, Time to call emergency"
-            }
-            
-            if injury_type.lower() in first_aid_guide:
-                return f"First aid for {injury_type}: {first_aid_guide[injury_type.lower()]}"
+            if injury_type.lower() in FIRST_AID_GUIDE:
+                return f"First aid for {injury_type}: {FIRST_AID_GUIDE[injury_type.lower()]}"
             else:
                 return f"First aid instructions for {injury_type} not available. Call emergency services."
                 
@@ -93,32 +106,23 @@ class EmergencyTools:
     def nearest_hospital_finder(location: str, emergency_type: str = "general") -> str:
         """Find nearest hospitals based on emergency type"""
         try:
-            hospitals = {
-                "Lagos": {
-                    "general": ["Lagos University Teaching Hospital", "General Hospital Lagos"],
-                    "cardiac": ["Cardiac Centre Lagos", "Heart Foundation Hospital"],
-                    "pediatric": ["Lagos Children Hospital", "Mother and Child Centre"]
-                },
-                "Kano": {
-                    "general": ["Aminu Kano Teaching Hospital", "Murtala Mohammed Specialist Hospital"],
-                    "cardiac": ["Kano Cardiac Centre"],
-                    "pediatric": ["Kano Children Hospital"]
-                }
-            }
+            place = resolve_location(location)
+            if place is None:
+                return f"Contact local emergency services for hospital locations in {location}"
             
-            if location in hospitals:
-                if emergency_type in hospitals[location]:
-                    result = f"Nearest {emergency_type} hospitals in {location}:\n"
-                    for hospital in hospitals[location][emergency_type]:
-                        result += f"- {hospital}\n"
-                    return result
-                else:
-                    result = f"General hospitals in {location}:\n"
-                    for hospital in hospitals[location]["general"]:
-                        result += f"- {hospital}\n"
-                    return result
-            else:
+            emergency_type = (emergency_type or "general").strip().lower()
+            if emergency_type not in EMERGENCY_SPECIALTIES:
+                emergency_type = "general"
+            hospitals = get_facility_index().nearest(
+                place.latitude, place.longitude, k=3, specialty=EMERGENCY_SPECIALTIES[emergency_type]
+            )
+            if not hospitals:
                 return f"Contact local emergency services for hospital locations in {location}"
+            
+            result = f"Nearest {emergency_type} hospitals to {place.label}:\n"
+            for facility, distance in hospitals:
+                result += f"- {facility.name} ({describe_distance(facility, distance)})\n"
+            return result
                 
         except Exception as e:
             return f"Error finding hospitals: {str(e)}"
@@ -147,12 +151,13 @@ def nearest_hospital_finder(location: str, emergency_type: str = "general") -> s
     return EmergencyTools.nearest_hospital_finder(location, emergency_type)
 
 
-def create_emergency_tools():
-    """Create and return emergency response tools"""
+def create_emergency_tools(memo: Optional[ToolMemo] = None):
+    """Create and return emergency response tools, memoized through memo (the process-wide one by default)"""
+    memo = memo or get_tool_memo()
     return [
-        emergency_triage_assessment,
-        get_emergency_contacts,
-        first_aid_instructions,
-        nearest_hospital_finder,
+        memo.tool(emergency_triage_assessment),
+        memo.tool(get_emergency_contacts),
+        memo.tool(first_aid_instructions),
+        memo.tool(nearest_hospital_finder),
     ]
 
@@ -0,0 +1,234 @@
+"""
+Spatial index of hospitals and PHCs for nearest-facility and within-radius queries
+"""
+
+import csv
+import math
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .symptom_matcher import normalize_text
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# A national registry export with the same columns replaces the bundled seed list
+FACILITIES_FILE = os.getenv("TRIAGE_FACILITIES_FILE", str(DATA_DIR / "facilities.csv"))
+
+# Grid cell size in degrees (about 28 km)
+GRID_CELL_DEG = float(os.getenv("TRIAGE_FACILITY_GRID_DEG", "0.25"))
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+
+LEVELS = ("primary", "secondary", "tertiary")
+
+# coordinate_precision of rows geocoded to the facility itself; anything else
+# ("city", "lga", "state") places the facility at an area centroid
+EXACT_PRECISION = "exact"
+
+# Within this many km of an area centroid the patient is taken to be in that area
+AREA_RADIUS_KM = float(os.getenv("TRIAGE_FACILITY_AREA_RADIUS_KM", "10"))
+
+
+@dataclass(frozen=True)
+class Facility:
+    name: str
+    facility_type: str
+    level: str
+    specialties: Tuple[str, ...]
+    state: str
+    lga: str
+    city: str
+    latitude: float
+    longitude: float
+    coordinate_precision: str = EXACT_PRECISION
+
+    @property
+    def approximate(self) -> bool:
+        """Whether the coordinates are an area centroid rather than the facility's own"""
+        return self.coordinate_precision != EXACT_PRECISION
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distances from one point to arrays of points (degrees in, km out)"""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def load_facilities(path: str = FACILITIES_FILE) -> List[Facility]:
+    """Facilities from a CSV with name, facility_type, level, specialties, state, lga, city, latitude, longitude
+    and an optional coordinate_precision (blank means exact)"""
+    with open(path, newline="", encoding="utf-8") as handle:
+        return [
+            Facility(
+                name=row["name"].strip(),
+                facility_type=row["facility_type"].strip(),
+                level=row["level"].strip().lower(),
+                specialties=tuple(s.strip().lower() for s in (row.get("specialties") or "").split(";") if s.strip()),
+                state=row["state"].strip(),
+                lga=(row.get("lga") or "").strip(),
+                city=(row.get("city") or "").strip(),
+                latitude=float(row["latitude"]),
+                longitude=float(row["longitude"]),
+                coordinate_precision=(row.get("coordinate_precision") or "").strip().lower() or EXACT_PRECISION,
+            )
+            for row in csv.DictReader(handle)
+            if row.get("latitude") and row.get("longitude")
+        ]
+
+
+class FacilityIndex:
+    """Uniform lat/lon grid over facilities, searched in rings around the query cell
+
+    After rings 0..r have been scanned every unseen facility is at least r
+    cells away, so a k-nearest search stops as soon as its k-th distance is
+    within that bound; results are exact, not approximate. Facilities whose
+    coordinates are only an area centroid are ranked by that distance too, and
+    describe_distance() words it no more precisely than the coordinates allow.
+    """
+
+    def __init__(self, facilities: Sequence[Facility], cell_deg: float = GRID_CELL_DEG):
+        self.facilities = list(facilities)
+        self.cell_deg = cell_deg
+        self._lats = np.array([f.latitude for f in self.facilities], dtype=float)
+        self._lons = np.array([f.longitude for f in self.facilities], dtype=float)
+        self._levels = np.array([f.level for f in self.facilities], dtype=object)
+        self._types = np.array([normalize_text(f.facility_type) for f in self.facilities], dtype=object)
+        self._specialties = [frozenset(f.specialties) for f in self.facilities]
+
+        cells: Dict[Tuple[int, int], List[int]] = {}
+        for index, facility in enumerate(self.facilities):
+            cells.setdefault(self._cell(facility.latitude, facility.longitude), []).append(index)
+        self._cells = {cell: np.array(indices) for cell, indices in cells.items()}
+        rows = [cell[0] for cell in cells] or [0]
+        columns = [cell[1] for cell in cells] or [0]
+        self._bounds = (min(rows), max(rows), min(columns), max(columns))
+        # Shortest extent of one cell anywhere in the data, for the stopping bound;
+        # 1% slack covers great circles running slightly shorter than parallels
+        widest_lat = max((abs(lat) for lat in self._lats), default=0.0) + cell_deg
+        self._cell_km = 0.99 * cell_deg * KM_PER_DEG_LAT * math.cos(math.radians(min(widest_lat, 89.0)))
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def _ring(self, center: Tuple[int, int], radius: int) -> Iterator[np.ndarray]:
+        row, column = center
+        if radius == 0:
+            cells = [center]
+        else:
+            cells = [(row + dr, column + dc) for dr in (-radius, radius) for dc in range(-radius, radius + 1)]
+            cells += [(row + dr, column + dc) for dc in (-radius, radius) for dr in range(-radius + 1, radius)]
+        for cell in cells:
+            indices = self._cells.get(cell)
+            if indices is not None:
+                yield indices
+
+    def _max_ring(self, center: Tuple[int, int]) -> int:
+        low_row, high_row, low_column, high_column = self._bounds
+        row, column = center
+        return max(row - low_row, high_row - row, column - low_column, high_column - column, 0)
+
+    def _filter(
+        self,
+        indices: np.ndarray,
+        level: Optional[str],
+        facility_type: Optional[str],
+        specialty: Optional[str],
+    ) -> np.ndarray:
+        if level:
+            indices = indices[self._levels[indices] == level.lower()]
+        if facility_type:
+            wanted = normalize_text(facility_type)
+            indices = indices[np.array([wanted in self._types[i] for i in indices], dtype=bool)]
+        if specialty:
+            wanted = specialty.lower()
+            indices = indices[np.array([wanted in self._specialties[i] for i in indices], dtype=bool)]
+        return indices
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 3,
+        level: Optional[str] = None,
+        facility_type: Optional[str] = None,
+        specialty: Optional[str] = None,
+    ) -> List[Tuple[Facility, float]]:
+        """The k closest facilities matching the filters, with distances in km"""
+        center = self._cell(lat, lon)
+        found_indices: List[np.ndarray] = []
+        found_distances: List[np.ndarray] = []
+        count = 0
+        for radius in range(self._max_ring(center) + 1):
+            for indices in self._ring(center, radius):
+                indices = self._filter(indices, level, facility_type, specialty)
+                if len(indices):
+                    found_indices.append(indices)
+                    found_distances.append(haversine_km(lat, lon, self._lats[indices], self._lons[indices]))
+                    count += len(indices)
+            if count >= k:
+                distances = np.concatenate(found_distances)
+                if np.partition(distances, k - 1)[k - 1] <= radius * self._cell_km:
+                    break
+        return self._ranked(found_indices, found_distances, k)
+
+    def within(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        level: Optional[str] = None,
+        facility_type: Optional[str] = None,
+        specialty: Optional[str] = None,
+    ) -> List[Tuple[Facility, float]]:
+        """Every matching facility within radius_km, closest first"""
+        center = self._cell(lat, lon)
+        rings = min(int(math.ceil(radius_km / self._cell_km)), self._max_ring(center))
+        found_indices: List[np.ndarray] = []
+        found_distances: List[np.ndarray] = []
+        for radius in range(rings + 1):
+            for indices in self._ring(center, radius):
+                indices = self._filter(indices, level, facility_type, specialty)
+                if len(indices):
+                    distances = haversine_km(lat, lon, self._lats[indices], self._lons[indices])
+                    keep = distances <= radius_km
+                    found_indices.append(indices[keep])
+                    found_distances.append(distances[keep])
+        return self._ranked(found_indices, found_distances, None)
+
+    def _ranked(
+        self, found_indices: List[np.ndarray], found_distances: List[np.ndarray], k: Optional[int]
+    ) -> List[Tuple[Facility, float]]:
+        if not found_indices:
+            return []
+        indices = np.concatenate(found_indices)
+        distances = np.concatenate(found_distances)
+        order = np.argsort(distances, kind="stable")[:k]
+        return [(self.facilities[indices[i]], float(distances[i])) for i in order]
+
+
+def format_distance(km: float) -> str:
+    return f"{km * 1000:.0f}m" if km < 1 else f"{km:.1f}km"
+
+
+def describe_distance(facility: Facility, km: float) -> str:
+    """Distance and place of a facility, no more precise than its coordinates"""
+    area = facility.city or facility.lga or facility.state
+    if not facility.approximate:
+        return f"{format_distance(km)}, {area}"
+    if km < AREA_RADIUS_KM:
+        return f"in {area}"
+    return f"about {km:.0f}km, {area}"
+
+
+@lru_cache(maxsize=1)
+def get_facility_index() -> FacilityIndex:
+    """Return the process-wide facility index, built on first use"""
+    return FacilityIndex(load_facilities())
@@ -0,0 +1,299 @@
+"""
+Pooled, HTTP-cached and size-capped page fetching for the web_fetch tool
+"""
+
+import html
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+FETCH_CACHE_PATH = os.getenv("TRIAGE_FETCH_CACHE_PATH", ".triage_cache/http.sqlite3")
+FETCH_CACHE_SIZE = int(os.getenv("TRIAGE_FETCH_CACHE_SIZE", "512"))
+
+# Bytes read from a response body; the rest is never downloaded
+FETCH_MAX_BYTES = int(os.getenv("TRIAGE_FETCH_MAX_BYTES", "500000"))
+
+# Concurrent requests of fetch_many(), and connections kept per host
+FETCH_CONCURRENCY = int(os.getenv("TRIAGE_FETCH_CONCURRENCY", "8"))
+
+# Freshness for responses with Last-Modified but no explicit lifetime: a fraction of their age, capped
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX_AGE = 86400.0
+
+USER_AGENT = "public-health-triage-crew/0.1 (+requests)"
+
+_SKIPPED_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "head"})
+_BLOCK_TAGS = frozenset({"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "table"})
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)", re.IGNORECASE)
+
+
+@dataclass
+class FetchResult:
+    """A fetched page as the agent sees it"""
+
+    url: str
+    status: int
+    text: str
+    content_type: str = ""
+    truncated: bool = False
+    cache: str = "miss"  # "miss", "hit" (fresh, no request) or "revalidated" (304)
+    error: Optional[str] = None
+
+
+class _TextExtractor(HTMLParser):
+    """Visible text of an HTML page, with block elements on their own lines"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.title = ""
+        self._skipping = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "title":
+            self._in_title = True
+        elif tag in _SKIPPED_TAGS:
+            self._skipping += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag in _SKIPPED_TAGS and self._skipping:
+            self._skipping -= 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif not self._skipping:
+            self.parts.append(data)
+
+
+def extract_text(body: str, content_type: str) -> str:
+    """Readable text of a response body: HTML is reduced to its visible text"""
+    if "html" not in content_type.lower():
+        return body.strip()
+    parser = _TextExtractor()
+    parser.feed(body)
+    parser.close()
+    text = _SPACES.sub(" ", html.unescape("".join(parser.parts)))
+    text = _BLANK_LINES.sub("\n\n", "\n".join(line.strip() for line in text.split("\n"))).strip()
+    title = parser.title.strip()
+    return f"# {title}\n\n{text}" if title else text
+
+
+def freshness(headers: Mapping[str, str], now: float) -> Tuple[bool, float]:
+    """Whether a response may be stored, and until when it is fresh"""
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control:
+        return False, now
+    if "no-cache" in cache_control:
+        return True, now  # Stored, but revalidated before every use
+    max_age = _MAX_AGE.search(cache_control)
+    if max_age:
+        return True, now + int(max_age.group(1))
+    try:
+        if headers.get("Expires"):
+            return True, parsedate_to_datetime(headers["Expires"]).timestamp()
+        if headers.get("Last-Modified"):
+            age = now - parsedate_to_datetime(headers["Last-Modified"]).timestamp()
+            return True, now + min(max(age, 0.0) * HEURISTIC_FRACTION, HEURISTIC_MAX_AGE)
+    except (TypeError, ValueError):
+        pass
+    # No lifetime: only worth keeping if it can be revalidated cheaply
+    return bool(headers.get("ETag")), now
+
+
+class HttpCache:
+    """SQLite store of fetched pages with their validators and expiry
+
+    Pages are keyed by URL and the byte limit they were read with, so a
+    page cut short for one caller is never served to one asking for more.
+    """
+
+    def __init__(self, path: str = FETCH_CACHE_PATH, max_entries: int = FETCH_CACHE_SIZE):
+        self.max_entries = max_entries
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(pages)")}
+        if columns and "max_bytes" not in columns:
+            self._db.execute("DROP TABLE pages")  # Written before pages were keyed by byte limit
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages "
+            "(url TEXT NOT NULL, max_bytes INTEGER NOT NULL, status INTEGER NOT NULL, content_type TEXT NOT NULL, "
+            "text TEXT NOT NULL, truncated INTEGER NOT NULL, etag TEXT, last_modified TEXT, expires REAL NOT NULL, "
+            "accessed REAL NOT NULL, PRIMARY KEY (url, max_bytes))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed)")
+
+    def get(self, url: str, max_bytes: int) -> Optional[Dict[str, object]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, content_type, text, truncated, etag, last_modified, expires FROM pages "
+                "WHERE url = ? AND max_bytes = ?",
+                (url, max_bytes),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE pages SET accessed = ? WHERE url = ? AND max_bytes = ?", (time.time(), url, max_bytes)
+            )
+        keys = ("status", "content_type", "text", "truncated", "etag", "last_modified", "expires")
+        return dict(zip(keys, row))
+
+    def put(
+        self, result: FetchResult, max_bytes: int, etag: Optional[str], last_modified: Optional[str], expires: float
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (result.url, max_bytes, result.status, result.content_type, result.text, int(result.truncated),
+                 etag, last_modified, expires, time.time()),
+            )
+            self._db.execute(
+                "DELETE FROM pages WHERE rowid IN (SELECT rowid FROM pages ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def refresh(self, url: str, max_bytes: int, expires: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE pages SET expires = ? WHERE url = ? AND max_bytes = ?", (expires, url, max_bytes)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM pages")
+
+
+def create_session(pool_size: int = FETCH_CONCURRENCY) -> requests.Session:
+    """Session with keep-alive connection pools and retries on transient failures"""
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+class Fetcher:
+    """Fetches pages over one pooled session, through the HTTP cache"""
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        cache: Optional[HttpCache] = None,
+        max_bytes: int = FETCH_MAX_BYTES,
+        concurrency: int = FETCH_CONCURRENCY,
+    ):
+        self.session = session or create_session(concurrency)
+        self.cache = cache
+        self.max_bytes = max_bytes
+        self.concurrency = concurrency
+
+    def fetch(self, url: str, timeout: float = 10, max_bytes: Optional[int] = None) -> FetchResult:
+        """Fetch one URL; errors are reported on the result rather than raised"""
+        try:
+            return self._fetch(url, timeout, self.max_bytes if max_bytes is None else max_bytes)
+        except Exception as e:
+            return FetchResult(url=url, status=0, text="", error=str(e))
+
+    def _fetch(self, url: str, timeout: float, max_bytes: int) -> FetchResult:
+        entry = self.cache.get(url, max_bytes) if self.cache else None
+        if entry is not None and entry["expires"] > time.time():
+            return self._cached(url, entry, "hit")
+
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        with self.session.get(url, timeout=timeout, headers=headers, stream=True) as response:
+            now = time.time()
+            if response.status_code == 304 and entry is not None:
+                _, expires = freshness(response.headers, now)
+                self.cache.refresh(url, max_bytes, expires)
+                return self._cached(url, entry, "revalidated")
+            response.raise_for_status()
+            body, truncated = self._read(response, max_bytes)
+
+        content_type = response.headers.get("Content-Type", "")
+        result = FetchResult(
+            url=url,
+            status=response.status_code,
+            text=extract_text(body.decode(response.encoding or "utf-8", errors="replace"), content_type),
+            content_type=content_type,
+            truncated=truncated,
+        )
+        storable, expires = freshness(response.headers, now)
+        if self.cache and storable:
+            self.cache.put(result, max_bytes, response.headers.get("ETag"), response.headers.get("Last-Modified"), expires)
+        return result
+
+    @staticmethod
+    def _read(response: requests.Response, max_bytes: int) -> Tuple[bytes, bool]:
+        chunks, size = [], 0
+        for chunk in response.iter_content(chunk_size=16384):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                return b"".join(chunks)[:max_bytes], True
+        return b"".join(chunks), False
+
+    @staticmethod
+    def _cached(url: str, entry: Dict[str, object], cache: str) -> FetchResult:
+        return FetchResult(
+            url=url,
+            status=int(entry["status"]),
+            text=str(entry["text"]),
+            content_type=str(entry["content_type"]),
+            truncated=bool(entry["truncated"]),
+            cache=cache,
+        )
+
+    def fetch_many(
+        self, urls: Sequence[str], timeout: float = 10, max_bytes: Optional[int] = None
+    ) -> List[FetchResult]:
+        """Fetch several URLs, at most `concurrency` at a time, in input order"""
+        if len(urls) <= 1:
+            return [self.fetch(url, timeout, max_bytes) for url in urls]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(urls))) as executor:
+            return list(executor.map(lambda url: self.fetch(url, timeout, max_bytes), urls))
+
+
+_fetcher: Optional[Fetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> Fetcher:
+    """Return the process-wide fetcher with its shared session and disk cache"""
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = Fetcher(cache=HttpCache())
+    return _fetcher
@@ -2,10 +2,15 @@
 Custom tools for the Public Health Triage Advisor
 """
 
-import requests
-import json
-from typing import Dict, List, Optional
+import re
+from typing import Dict, Optional
 from crewai.tools import tool
+from .facility_index import describe_distance, get_facility_index
+from .location_resolver import resolve_location
+from .outbreak_monitor import get_outbreak_monitor
+from .price_store import format_naira, get_price_store
+from .tool_cache import ToolMemo, get_tool_memo
+from .weather_risk import get_weather_risks
 
 class HealthTools:
     """Collection of health-related tools"""
@@ -14,22 +19,13 @@ class HealthTools:
     def get_weather_health_risk(location: str) -> str:
         """Get weather-based health risks for a location"""
         try:
-            # Mock weather API call (replace with real API)
-            weather_data = {
-                "temperature": 28,
-                "humidity": 75,
-                "air_quality": "moderate"
-            }
+            place = resolve_location(location)
+            if place is None:
+                return f"Weather data for {location} not available"
             
-            risks = []
-            if weather_data["temperature"] > 30:
-                risks.append("Heat stress risk - stay hydrated")
-            if weather_data["humidity"] > 80:
-                risks.append("High humidity - increased infection risk")
-            if weather_data["air_quality"] == "poor":
-                risks.append("Poor air quality - respiratory issues")
-            
-            return f"Weather health risks for {location}: {'; '.join(risks) if risks else 'No significant risks'}"
+            risk = get_weather_risks().grid().lookup(place)
+            conditions = f"{risk.temperature_c:.0f}°C, {risk.relative_humidity:.0f}% humidity, air quality {risk.air_quality}"
+            return f"Weather health risks for {place.label} ({conditions}): {'; '.join(risk.risks) if risk.risks else 'No significant risks'}"
         except Exception as e:
             return f"Unable to get weather data: {str(e)}"
     
@@ -37,17 +33,18 @@ class HealthTools:
     def get_disease_outbreak_info(location: str) -> str:
         """Get current disease outbreak information"""
         try:
-            # Mock outbreak data (replace with real API)
-            outbreaks = {
-                "Lagos": ["Malaria", "Dengue"],
-                "Kano": ["Measles"],
-                "Port Harcourt": ["Cholera"]
-            }
+            place = resolve_location(location)
+            if place is None:
+                return f"No major outbreaks reported in {location}"
             
-            if location in outbreaks:
-                return f"Current outbreaks in {location}: {', '.join(outbreaks[location])}"
+            snapshot = get_outbreak_monitor().current()
+            if not snapshot.version:
+                return f"Outbreak surveillance data for {place.label} is still loading"
+            records = snapshot.for_place(place)
+            if records:
+                return f"Current outbreaks in {place.label}: {', '.join(record.summary() for record in records)}"
             else:
-                return f"No major outbreaks reported in {location}"
+                return f"No major outbreaks reported in {place.label}"
         except Exception as e:
             return f"Unable to get outbreak data: {str(e)}"
     
@@ -55,25 +52,17 @@ class HealthTools:
     def get_phc_locations(location: str) -> str:
         """Get nearby Primary Health Centre locations"""
         try:
-            # Mock PHC data (replace with real geolocation API)
-            phc_data = {
-                "Lagos": [
-                    {"name": "Lagos Island PHC", "distance": "2.3km", "rating": "4.5"},
-                    {"name": "Victoria Island PHC", "distance": "3.1km", "rating": "4.2"}
-                ],
-                "Kano": [
-                    {"name": "Kano Central PHC", "distance": "1.8km", "rating": "4.0"}
-                ]
-            }
+            place = resolve_location(location)
+            if place is None:
+                return f"PHC locations for {location} not available"
             
-            if location in phc_data:
-                phcs = phc_data[location]
-                result = f"Nearby PHCs in {location}:\n"
-                for phc in phcs:
-                    result += f"- {phc['name']} ({phc['distance']}, Rating: {phc['rating']}/5)\n"
-                return result
-            else:
+            phcs = get_facility_index().nearest(place.latitude, place.longitude, k=5, level="primary")
+            if not phcs:
                 return f"PHC locations for {location} not available"
+            result = f"Nearby PHCs to {place.label}:\n"
+            for facility, distance in phcs:
+                result += f"- {facility.name} ({describe_distance(facility, distance)})\n"
+            return result
         except Exception as e:
             return f"Unable to get PHC locations: {str(e)}"
     
@@ -81,17 +70,54 @@ class HealthTools:
     def get_medicine_prices(medicine_name: str, location: str) -> str:
         """Get current medicine prices"""
         try:
-            # Mock medicine price data (replace with real API)
-            prices = {
-                "paracetamol": {"Lagos": "₦150-₦300", "Kano": "₦120-₦250"},
-                "amoxicillin": {"Lagos": "₦500-₦1200", "Kano": "₦400-₦1000"},
-                "malaria_meds": {"Lagos": "₦800-₦2000", "Kano": "₦700-₦1800"}
-            }
-            
-            if medicine_name.lower() in prices and location in prices[medicine_name.lower()]:
-                return f"{medicine_name} price in {location}: {prices[medicine_name.lower()][location]}"
-            else:
+            unknown, unknown_locations, quotes = get_price_store().quote([medicine_name], [location])
+            if unknown or not quotes[0]:
                 return f"Price data for {medicine_name} in {location} not available"
+            quote = quotes[0][0]
+            scope = "" if quote.state_level else " (national range)"
+            if unknown_locations:
+                scope = f" (national range; location '{location}' not recognised)"
+            return (
+                f"{medicine_name} price in {quote.location}: {format_naira(quote.minimum)}-{format_naira(quote.maximum)}, "
+                f"typically {format_naira(quote.median)} per {quote.medicine.pack}{scope}"
+            )
+        except Exception as e:
+            return f"Unable to get medicine prices: {str(e)}"
+    
+    @staticmethod
+    def get_medicine_prices_bulk(medicines: str, locations: str = "") -> str:
+        """Price a list of medicines across candidate locations in one call"""
+        try:
+            names = [name.strip() for name in re.split(r"[,;\n]", medicines) if name.strip()]
+            places = [place.strip() for place in re.split(r"[;|\n]", locations or "") if place.strip()]
+            unknown, unknown_locations, quotes = get_price_store().quote(names, places)
+            
+            result = "Medicine prices in ₦ per pack (min / median / max):\n"
+            totals: Dict[str, float] = {}
+            for row in quotes:
+                if not row:
+                    continue
+                medicine = row[0].medicine
+                details = ", ".join(part for part in (medicine.form, medicine.strength, medicine.pack) if part)
+                brands = f" ({', '.join(medicine.brands)})" if medicine.brands else ""
+                prescription = "prescription" if medicine.prescription_required else "no prescription"
+                result += f"- {medicine.generic}{brands}: {details}; {prescription}\n"
+                for quote in row:
+                    scope = "" if quote.state_level else " (national range)"
+                    result += (
+                        f"  - {quote.location}: {format_naira(quote.minimum)} / {format_naira(quote.median)} / "
+                        f"{format_naira(quote.maximum)}{scope}\n"
+                    )
+                    totals[quote.location] = totals.get(quote.location, 0.0) + quote.median
+            if totals:
+                result += "Total at median prices: " + "; ".join(
+                    f"{location} {format_naira(total)}" for location, total in totals.items()
+                ) + "\n"
+            if unknown:
+                result += f"Not in the price list: {', '.join(unknown)}\n"
+            if unknown_locations:
+                result += f"Locations not recognised: {', '.join(unknown_locations)}\n"
+            return result
         except Exception as e:
             return f"Unable to get medicine prices: {str(e)}"
 
@@ -119,12 +145,22 @@ def medicine_prices(medicine_name: str, location: str) -> str:
     return HealthTools.get_medicine_prices(medicine_name, location)
 
 
-def create_health_tools():
-    """Create and return health-related tools"""
+@tool("medicine_prices_bulk")
+def medicine_prices_bulk(medicines: str, locations: str = "") -> str:
+    """Price several medicines (comma-separated generic or brand names) across one or more
+    locations (separated by semicolons, e.g. "Ibadan, Oyo; Lagos") in one call. Returns
+    min/median/max Naira per pack for each medicine and location, and the plan total."""
+    return HealthTools.get_medicine_prices_bulk(medicines, locations)
+
+
+def create_health_tools(memo: Optional[ToolMemo] = None):
+    """Create and return health-related tools, memoized through memo (the process-wide one by default)"""
+    memo = memo or get_tool_memo()
     return [
-        weather_health_risk,
-        disease_outbreak_info,
-        phc_locations,
-        medicine_prices,
+        memo.tool(weather_health_risk),
+        memo.tool(disease_outbreak_info),
+        memo.tool(phc_locations),
+        memo.tool(medicine_prices),
+        memo.tool(medicine_prices_bulk),
     ]
 
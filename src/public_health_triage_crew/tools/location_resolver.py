@@ -0,0 +1,230 @@
+"""
+Canonical Nigerian locations for free-text input such as "Ibadan, Oyo, Nigeria"
+"""
+
+import csv
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .facility_index import DATA_DIR, FACILITIES_FILE, load_facilities
+from .symptom_matcher import normalize_text
+
+STATES_FILE = DATA_DIR / "states.csv"
+
+# Distinct location strings whose resolution is kept
+LOCATION_CACHE_SIZE = int(os.getenv("TRIAGE_LOCATION_CACHE_SIZE", "4096"))
+
+# Common alternative names, as normalized text -> state code or place id
+ALIASES = {
+    "federal capital territory": "NG-FC",
+    "ph": "NG-RI/port-harcourt",
+    "benin": "NG-ED/benin-city",
+    "vi": "NG-LA/victoria-island",
+}
+
+# Words that carry no place information on their own
+STOPWORDS = frozenset({"nigeria", "ng", "state", "lga", "local", "government", "area", "city", "town", "the", "of"})
+
+# Shortest word that is matched approximately; shorter words must match exactly
+MIN_FUZZY_CHARS = 4
+
+_COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+_WORD = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True)
+class Place:
+    """A resolved location: a state, a city or LGA within a state, or raw coordinates"""
+
+    id: str  # "NG-OY" for a state, "NG-OY/ibadan" within it, "lat,lon" for a point
+    kind: str  # "state", "city", "lga" or "point"
+    name: str
+    state: str
+    state_code: str
+    latitude: float
+    longitude: float
+
+    @property
+    def label(self) -> str:
+        if self.kind == "state":
+            return self.name if self.name == "FCT" else f"{self.name} State"
+        if self.kind == "point":
+            return self.name
+        return f"{self.name}, {self.state}"
+
+
+def _slug(name: str) -> str:
+    return "-".join(_WORD.findall(normalize_text(name)))
+
+
+def _words(text: str) -> Tuple[str, ...]:
+    return tuple(_WORD.findall(normalize_text(text)))
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Whether a and b differ by at most one insertion, deletion, substitution or adjacent swap"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    prefix = 0
+    while prefix < min(len(a), len(b)) and a[prefix] == b[prefix]:
+        prefix += 1
+    if len(a) == len(b):
+        if a[prefix + 1:] == b[prefix + 1:]:
+            return True
+        return a[prefix:prefix + 2] == b[prefix:prefix + 2][::-1] and a[prefix + 2:] == b[prefix + 2:]
+    longer, shorter = (a, b) if len(a) > len(b) else (b, a)
+    return longer[prefix + 1:] == shorter[prefix:]
+
+
+class LocationResolver:
+    """Word trie over state, capital, city and LGA names, with one-edit fuzzy fallback
+
+    Resolution scans the text once, taking the longest known name at each
+    word; words that match nothing are looked up in a deletion index
+    (every name with one character removed), so "Kanno" or "Ibadna" still
+    resolve without comparing against the whole gazetteer. Among the names
+    found, the most specific place consistent with any state named is chosen.
+    """
+
+    def __init__(self, places: Iterable[Place], aliases: Optional[Dict[str, str]] = None):
+        self.places: Dict[str, Place] = {place.id: place for place in places}
+        self._trie: Dict = {}
+        self._deletions: Dict[str, Set[str]] = {}
+        self._fuzzy_ids: Dict[str, List[str]] = {}
+        for place in self.places.values():
+            self._add(_words(place.name), place.id)
+        for alias, place_id in (aliases or {}).items():
+            if place_id in self.places:
+                self._add(_words(alias), place_id)
+
+    @classmethod
+    def from_files(cls, states_file: str = str(STATES_FILE), facilities_file: str = FACILITIES_FILE) -> "LocationResolver":
+        """States and capitals from states.csv, plus every city and LGA in the facility list"""
+        places: List[Place] = []
+        states: Dict[str, Tuple[str, str]] = {}
+        with open(states_file, newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                code, state = row["code"], row["state"]
+                point = (float(row["latitude"]), float(row["longitude"]))
+                states[normalize_text(state)] = (code, state)
+                places.append(Place(code, "state", state, state, code, *point))
+                if normalize_text(row["capital"]) != normalize_text(state):
+                    places.append(Place(f"{code}/{_slug(row['capital'])}", "city", row["capital"], state, code, *point))
+
+        points: Dict[Tuple[str, str], List[Tuple[float, float]]] = {}
+        names: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        for facility in load_facilities(facilities_file):
+            code, state = states.get(normalize_text(facility.state), (None, None))
+            if code is None:
+                continue
+            for kind, name in (("city", facility.city), ("lga", facility.lga)):
+                if name and normalize_text(name) != normalize_text(state):
+                    key = (code, _slug(name))
+                    points.setdefault(key, []).append((facility.latitude, facility.longitude))
+                    names.setdefault(key, (kind, name))
+        known = {place.id for place in places}
+        state_names = {code: state for code, state in states.values()}
+        for (code, slug), coordinates in points.items():
+            place_id = f"{code}/{slug}"
+            if place_id not in known:
+                kind, name = names[(code, slug)]
+                lat, lon = np.mean(coordinates, axis=0)
+                places.append(Place(place_id, kind, name, state_names[code], code, float(lat), float(lon)))
+        return cls(places, ALIASES)
+
+    def _add(self, words: Tuple[str, ...], place_id: str) -> None:
+        if not words:
+            return
+        node = self._trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node.setdefault(None, []).append(place_id)
+        key = "".join(words)
+        if len(key) >= MIN_FUZZY_CHARS:
+            for variant in {key} | {key[:i] + key[i + 1:] for i in range(len(key))}:
+                self._deletions.setdefault(variant, set()).add(key)
+            self._fuzzy_ids[key] = node[None]
+
+    def _fuzzy(self, word: str) -> List[str]:
+        """Place ids whose name is one edit away from word (names with spaces are compared joined)"""
+        candidates: Set[str] = set()
+        for variant in {word} | {word[:i] + word[i + 1:] for i in range(len(word))}:
+            candidates |= self._deletions.get(variant, set())
+        return sorted(place_id for key in candidates if _within_one_edit(word, key) for place_id in self._fuzzy_ids[key])
+
+    def _matches(self, words: Tuple[str, ...]) -> List[List[str]]:
+        """Candidate place ids for each name found in the text, in order of appearance"""
+        found: List[List[str]] = []
+        position = 0
+        while position < len(words):
+            node, end, ids = self._trie, position, None
+            for index in range(position, len(words)):
+                node = node.get(words[index])
+                if node is None:
+                    break
+                if None in node:
+                    end, ids = index + 1, node[None]
+            if ids is not None:
+                found.append(ids)
+                position = end
+                continue
+            word = words[position]
+            if word not in STOPWORDS and len(word) >= MIN_FUZZY_CHARS:
+                # A misspelt two-word name ("port harcort") is tried joined first
+                if position + 1 < len(words):
+                    ids = self._fuzzy(word + words[position + 1])
+                    if ids:
+                        found.append(ids)
+                        position += 2
+                        continue
+                ids = self._fuzzy(word)
+                if ids:
+                    found.append(ids)
+            position += 1
+        return found
+
+    def resolve(self, location: str) -> Optional[Place]:
+        """The place a location string refers to, or None when nothing in it is recognised"""
+        location = (location or "").strip()
+        if location in self.places:
+            return self.places[location]
+        match = _COORDINATES.match(location)
+        if match:
+            lat, lon = float(match.group(1)), float(match.group(2))
+            return Place(f"{lat:.4f},{lon:.4f}", "point", f"{lat:.4f}, {lon:.4f}", "", "", lat, lon)
+
+        found = self._matches(_words(location))
+        if not found:
+            return None
+        states = {self.places[place_id].state_code for ids in found for place_id in ids
+                  if self.places[place_id].kind == "state"}
+        # "City, State": the first specific name that lies in a named state wins
+        for ids in found:
+            for place_id in ids:
+                place = self.places[place_id]
+                if place.kind != "state" and (not states or place.state_code in states):
+                    return place
+        for ids in found:
+            for place_id in ids:
+                if self.places[place_id].kind == "state":
+                    return self.places[place_id]
+        return self.places[found[0][0]]
+
+
+@lru_cache(maxsize=1)
+def get_location_resolver() -> LocationResolver:
+    """Return the process-wide resolver, built on first use"""
+    return LocationResolver.from_files()
+
+
+@lru_cache(maxsize=LOCATION_CACHE_SIZE)
+def resolve_location(location: str) -> Optional[Place]:
+    """Resolve a location string through the shared resolver, caching the answer"""
+    return get_location_resolver().resolve(location)
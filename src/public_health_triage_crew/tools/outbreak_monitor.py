@@ -0,0 +1,342 @@
+"""
+Outbreak surveillance snapshot, refreshed from situation reports in the background
+"""
+
+import csv
+import functools
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .facility_index import DATA_DIR
+from .fetcher import get_fetcher
+from .location_resolver import Place, resolve_location
+from .symptom_matcher import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Directories, report files or http(s) URLs, comma-separated; later sources win ties
+OUTBREAK_SOURCES = [
+    source.strip()
+    for source in os.getenv("TRIAGE_OUTBREAK_SOURCES", str(DATA_DIR / "outbreaks")).split(",")
+    if source.strip()
+]
+
+# Seconds between background refreshes
+OUTBREAK_REFRESH_SECONDS = float(os.getenv("TRIAGE_OUTBREAK_REFRESH_SECONDS", "900"))
+
+# Longest a tool waits for the very first load; afterwards reads never wait
+FIRST_LOAD_TIMEOUT = 2.0
+
+REPORT_SUFFIXES = (".csv", ".json")
+
+_EMPTY: Mapping = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class OutbreakRecord:
+    """Latest situation report line for one disease in one state or LGA"""
+
+    disease: str
+    state: str
+    state_code: str
+    lga: str = ""
+    status: str = "active"  # "active", "declining" or "over"
+    report_date: str = ""  # ISO date; undated lines rank before dated ones
+    suspected_cases: Optional[int] = None
+    confirmed_cases: Optional[int] = None
+    deaths: Optional[int] = None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return normalize_text(self.lga), normalize_text(self.disease)
+
+    @property
+    def active(self) -> bool:
+        return self.status != "over"
+
+    def summary(self) -> str:
+        counts = [
+            f"{value:,} {label}"
+            for value, label in (
+                (self.confirmed_cases, "confirmed"),
+                (self.suspected_cases, "suspected"),
+                (self.deaths, "deaths"),
+            )
+            if value is not None
+        ]
+        details = ([self.lga + " LGA"] if self.lga else []) + counts
+        if self.status != "active":
+            details.append(self.status)
+        if self.report_date:
+            details.append(f"as of {self.report_date}")
+        return f"{self.disease} ({', '.join(details)})" if details else self.disease
+
+
+@dataclass(frozen=True)
+class OutbreakSnapshot:
+    """Immutable view of the surveillance data; replaced whole, never modified"""
+
+    version: int = 0
+    refreshed_at: float = 0.0
+    # state code -> {(lga, disease): record}
+    by_state: Mapping[str, Mapping[Tuple[str, str], OutbreakRecord]] = field(default_factory=lambda: _EMPTY)
+    # normalized disease -> state codes reporting it
+    by_disease: Mapping[str, Tuple[str, ...]] = field(default_factory=lambda: _EMPTY)
+
+    def for_place(self, place: Place, include_over: bool = False) -> List[OutbreakRecord]:
+        """Records for a place's state; for an LGA or city, its own lines come first"""
+        records = [
+            record for record in self.by_state.get(place.state_code, _EMPTY).values()
+            if include_over or record.active
+        ]
+        local = normalize_text(place.name) if place.kind in ("lga", "city") else ""
+        return sorted(records, key=lambda record: (normalize_text(record.lga) != local, record.disease))
+
+    def states_reporting(self, disease: str) -> Tuple[str, ...]:
+        return self.by_disease.get(normalize_text(disease), ())
+
+
+def _count(value: Any) -> Optional[int]:
+    try:
+        return int(float(str(value).replace(",", ""))) if str(value).strip() else None
+    except ValueError:
+        return None
+
+
+def parse_report(text: str, name: str = "") -> List[OutbreakRecord]:
+    """Records from a situation report: CSV with a header row, or a JSON list of objects
+
+    Expected columns: disease, state, and optionally lga, status,
+    report_date, suspected_cases, confirmed_cases and deaths. Lines whose
+    state cannot be resolved are skipped.
+    """
+    if name.endswith(".json") or text.lstrip().startswith(("[", "{")):
+        data = json.loads(text)
+        rows: Iterable[Mapping[str, Any]] = data.get("records", []) if isinstance(data, dict) else data
+    else:
+        rows = csv.DictReader(io.StringIO(text))
+    records = []
+    for row in rows:
+        disease = str(row.get("disease") or "").strip()
+        place = resolve_location(str(row.get("state") or ""))
+        if not disease or place is None or not place.state_code:
+            continue
+        records.append(OutbreakRecord(
+            disease=disease,
+            state=place.state,
+            state_code=place.state_code,
+            lga=str(row.get("lga") or "").strip(),
+            status=str(row.get("status") or "active").strip().lower(),
+            report_date=str(row.get("report_date") or "").strip(),
+            suspected_cases=_count(row.get("suspected_cases", "")),
+            confirmed_cases=_count(row.get("confirmed_cases", "")),
+            deaths=_count(row.get("deaths", "")),
+        ))
+    return records
+
+
+def apply_updates(snapshot: OutbreakSnapshot, records: Sequence[OutbreakRecord]) -> OutbreakSnapshot:
+    """A new snapshot with records merged in; only the states they touch are copied
+
+    A record replaces the one for the same state, LGA and disease unless
+    that one has a later report date.
+    """
+    touched: Dict[str, Dict[Tuple[str, str], OutbreakRecord]] = {}
+    for record in records:
+        state = touched.get(record.state_code)
+        if state is None:
+            state = touched[record.state_code] = dict(snapshot.by_state.get(record.state_code, _EMPTY))
+        current = state.get(record.key)
+        if current is None or record.report_date >= current.report_date:
+            state[record.key] = record
+
+    by_state = dict(snapshot.by_state)
+    by_state.update({code: MappingProxyType(state) for code, state in touched.items()})
+    by_disease = {disease: set(codes) for disease, codes in snapshot.by_disease.items()}
+    for code, state in touched.items():
+        for codes in by_disease.values():
+            codes.discard(code)
+        for record in state.values():
+            if record.active:
+                by_disease.setdefault(normalize_text(record.disease), set()).add(code)
+    return OutbreakSnapshot(
+        version=snapshot.version + 1,
+        refreshed_at=time.time(),
+        by_state=MappingProxyType(by_state),
+        by_disease=MappingProxyType({disease: tuple(sorted(codes)) for disease, codes in by_disease.items() if codes}),
+    )
+
+
+def without_states(snapshot: OutbreakSnapshot, codes: Set[str]) -> OutbreakSnapshot:
+    """The snapshot with every record for the given state codes removed"""
+    if not codes:
+        return snapshot
+    by_disease = {
+        disease: tuple(code for code in states if code not in codes)
+        for disease, states in snapshot.by_disease.items()
+    }
+    return replace(
+        snapshot,
+        by_state=MappingProxyType({code: state for code, state in snapshot.by_state.items() if code not in codes}),
+        by_disease=MappingProxyType({disease: states for disease, states in by_disease.items() if states}),
+    )
+
+
+class OutbreakMonitor:
+    """Keeps an outbreak snapshot current from situation report sources
+
+    Each refresh reads only reports that changed since the last one (file
+    mtime and size, or the page's HTTP cache validators and content hash),
+    rebuilds the states their old and new lines touch in a copy of the
+    current snapshot and swaps the reference. A report that is deleted or
+    emptied takes its lines with it; one that fails to parse keeps its
+    previous lines and is retried. Readers take the snapshot once and never
+    see a partial update, and a slow or failing feed only delays the next
+    snapshot. An unexpected error is recorded in last_error and the
+    background thread carries on; alive tells whether it is still running.
+    """
+
+    def __init__(self, sources: Sequence[str] = OUTBREAK_SOURCES, interval: float = OUTBREAK_REFRESH_SECONDS):
+        self.sources = list(sources)
+        self.interval = interval
+        self.snapshot = OutbreakSnapshot()
+        self.last_error: Optional[str] = None
+        self.loaded = threading.Event()
+        self._stamps: Dict[str, object] = {}
+        # Report id (file path or URL) -> its parsed records, and source -> its report ids
+        self._records: Dict[str, List[OutbreakRecord]] = {}
+        self._reports_by_source: Dict[str, List[str]] = {}
+        # States whose reports changed but are not in a published snapshot yet
+        self._unpublished: Set[str] = set()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _reports(self, source: str) -> Iterator[Tuple[str, str, object, Callable[[], str]]]:
+        """(id, name, stamp, read) of every report a source currently holds"""
+        if source.startswith(("http://", "https://")):
+            result = get_fetcher().fetch(source)
+            if result.error:
+                raise IOError(result.error)
+            yield source, source, hashlib.sha256(result.text.encode("utf-8")).hexdigest(), lambda: result.text
+            return
+        path = Path(source)
+        if path.is_dir():
+            reports = sorted(p for p in path.iterdir() if p.suffix in REPORT_SUFFIXES)
+        else:
+            reports = [path] if path.exists() else []
+        for report in reports:
+            stat = report.stat()
+            yield str(report), report.name, (stat.st_mtime_ns, stat.st_size), functools.partial(
+                report.read_text, encoding="utf-8"
+            )
+
+    def refresh(self) -> bool:
+        """Ingest changed reports and drop deleted ones; True when a new snapshot was published"""
+        with self._refresh_lock:
+            touched: Set[str] = set()
+            errors = []
+            for source in self.sources:
+                try:
+                    present = []
+                    for report_id, name, stamp, read in self._reports(source):
+                        present.append(report_id)
+                        if self._stamps.get(report_id) == stamp:
+                            continue
+                        try:
+                            text = read()
+                            records = parse_report(text, name) if text.strip() else []
+                        except Exception as e:
+                            # Stamp left unrecorded so the report is retried next time
+                            errors.append(f"{name}: {e}")
+                            logger.warning("Outbreak report %s failed: %s", name, e)
+                            continue
+                        touched.update(record.state_code for record in self._records.get(report_id, ()))
+                        touched.update(record.state_code for record in records)
+                        self._stamps[report_id] = stamp
+                        self._records[report_id] = records
+                    for report_id in set(self._reports_by_source.get(source, ())) - set(present):
+                        touched.update(record.state_code for record in self._records.pop(report_id, ()))
+                        self._stamps.pop(report_id, None)
+                    self._reports_by_source[source] = present
+                except Exception as e:
+                    # The other sources still apply; this one keeps its records and is retried next time
+                    errors.append(f"{source}: {e}")
+                    logger.warning("Outbreak source %s failed: %s", source, e)
+            self.last_error = "; ".join(errors) or None
+            # Kept until published, so a failed rebuild is retried on the next refresh
+            self._unpublished |= touched
+            touched = set(self._unpublished)
+            try:
+                if not touched and self.snapshot.version:
+                    return False
+                # Touched states are rebuilt from every report, in source order so later sources win ties
+                records = [
+                    record
+                    for source in self.sources
+                    for report_id in self._reports_by_source.get(source, ())
+                    for record in self._records.get(report_id, ())
+                    if record.state_code in touched
+                ]
+                self.snapshot = apply_updates(without_states(self.snapshot, touched), records)
+                self._unpublished -= touched
+                return True
+            finally:
+                self.loaded.set()
+
+    def start(self) -> None:
+        """Refresh now and then every interval seconds on a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="outbreak-monitor", daemon=True)
+        self._thread.start()
+
+    def current(self, timeout: float = FIRST_LOAD_TIMEOUT) -> OutbreakSnapshot:
+        """The latest snapshot, waiting up to timeout only if nothing has loaded yet"""
+        if not self.loaded.is_set():
+            self.loaded.wait(timeout)
+        return self.snapshot
+
+    @property
+    def alive(self) -> bool:
+        """Whether the background refresh thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the current snapshot and try again next interval
+                self.last_error = f"refresh failed: {e}"
+                logger.exception("Outbreak refresh failed")
+            if self._stop.wait(self.interval):
+                return
+
+
+_monitor: Optional[OutbreakMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_outbreak_monitor() -> OutbreakMonitor:
+    """Return the process-wide monitor, starting its background refresh on first use"""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = OutbreakMonitor()
+                _monitor.start()
+    return _monitor
@@ -0,0 +1,194 @@
+"""
+Medicine catalogue and Naira price ranges per state, priced in bulk
+"""
+
+import bisect
+import csv
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .facility_index import DATA_DIR
+from .location_resolver import resolve_location
+from .symptom_matcher import normalize_text
+
+# A price survey export with the same columns replaces the bundled national ranges
+MEDICINES_FILE = os.getenv("TRIAGE_MEDICINES_FILE", str(DATA_DIR / "medicines.csv"))
+MEDICINE_PRICES_FILE = os.getenv("TRIAGE_MEDICINE_PRICES_FILE", str(DATA_DIR / "medicine_prices.csv"))
+
+NATIONAL = ""  # State column value of a national price range
+
+# Shortest partial name matched by prefix; shorter ones could name any medicine
+MIN_PREFIX_CHARS = 4
+
+
+@dataclass(frozen=True)
+class Medicine:
+    generic: str
+    brands: Tuple[str, ...]
+    form: str
+    strength: str
+    pack: str
+    category: str
+    prescription_required: bool
+
+
+@dataclass(frozen=True)
+class PriceQuote:
+    """Price range of one medicine in one location, in Naira per pack"""
+
+    medicine: Medicine
+    location: str
+    minimum: float
+    median: float
+    maximum: float
+    state_level: bool  # False when only the national range is known
+
+
+def _split(value: Optional[str]) -> Tuple[str, ...]:
+    return tuple(part.strip() for part in (value or "").split(";") if part.strip())
+
+
+class PriceStore:
+    """Price ranges as parallel arrays sorted by (medicine, state)
+
+    Each row is one medicine in one state (or nationally), keyed
+    medicine_id * S + state_id so a whole medicines x locations request is
+    a single searchsorted; a missing state row falls back to the national
+    one. Generic names, brands and aliases all map to the same medicine id.
+    """
+
+    def __init__(self, medicines: Sequence[Medicine], aliases: Dict[str, int], rows: Sequence[Tuple[int, str, float, float, float]]):
+        self.medicines = list(medicines)
+        self._aliases = aliases
+        self._alias_names = sorted(aliases)
+        self._states = [NATIONAL] + sorted({state for _, state, *_ in rows if state != NATIONAL})
+        state_ids = {state: index for index, state in enumerate(self._states)}
+
+        keys = np.array([medicine * len(self._states) + state_ids[state] for medicine, state, *_ in rows], dtype=np.int64)
+        prices = np.array([row[2:] for row in rows], dtype=np.float64).reshape(-1, 3)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._prices = prices[order]
+
+    @classmethod
+    def from_files(cls, medicines_file: str = MEDICINES_FILE, prices_file: str = MEDICINE_PRICES_FILE) -> "PriceStore":
+        medicines: List[Medicine] = []
+        aliases: Dict[str, int] = {}
+        with open(medicines_file, newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                medicine = Medicine(
+                    generic=row["generic"].strip(),
+                    brands=_split(row.get("brands")),
+                    form=(row.get("form") or "").strip(),
+                    strength=(row.get("strength") or "").strip(),
+                    pack=(row.get("pack") or "").strip(),
+                    category=(row.get("category") or "").strip(),
+                    prescription_required=(row.get("prescription_required") or "").strip().lower() in ("yes", "true", "1"),
+                )
+                for name in (medicine.generic, *medicine.brands, *_split(row.get("aliases"))):
+                    aliases.setdefault(normalize_text(name), len(medicines))
+                medicines.append(medicine)
+
+        rows = []
+        with open(prices_file, newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                medicine = aliases.get(normalize_text(row["generic"]))
+                if medicine is None:
+                    continue
+                place = resolve_location(row["state"]) if row.get("state") else None
+                rows.append((
+                    medicine,
+                    place.state_code if place is not None else NATIONAL,
+                    float(row["min_naira"]), float(row["median_naira"]), float(row["max_naira"]),
+                ))
+        return cls(medicines, aliases, rows)
+
+    def find(self, name: str) -> Optional[int]:
+        """Medicine id for a generic, brand or alias name
+
+        Trailing words such as a strength are dropped until a name matches
+        ("Amoxil 500mg capsules" -> Amoxil); otherwise a prefix of at least
+        MIN_PREFIX_CHARS characters matches when every name it starts belongs
+        to one medicine ("artem" -> artemether-lumefantrine, while "amox"
+        starts several). Anything else is unknown rather than priced as a
+        different drug.
+        """
+        words = normalize_text(name).replace("_", " ").split()
+        for end in range(len(words), 0, -1):
+            medicine = self._aliases.get(" ".join(words[:end]))
+            if medicine is not None:
+                return medicine
+        text = " ".join(words)
+        if len(text) < MIN_PREFIX_CHARS:
+            return None
+        low = bisect.bisect_left(self._alias_names, text)
+        high = bisect.bisect_left(self._alias_names, text + "\uffff", low)
+        candidates = {self._aliases[alias] for alias in self._alias_names[low:high]}
+        return candidates.pop() if len(candidates) == 1 else None
+
+    def quote(
+        self, medicines: Sequence[str], locations: Sequence[str]
+    ) -> Tuple[List[str], List[str], List[List[PriceQuote]]]:
+        """Price every medicine in every location in one pass
+
+        Returns the medicine names that matched nothing, the locations that
+        could not be resolved and, per matched medicine, one quote per
+        resolved location (with none resolved the national range is quoted).
+        Medicines without any price row get an empty list.
+        """
+        unknown, ids = [], []
+        for name in medicines:
+            medicine = self.find(name)
+            if medicine is None:
+                unknown.append(name)
+            elif medicine not in ids:
+                ids.append(medicine)
+        places, unknown_locations = [], []
+        for location in locations:
+            place = resolve_location(location)
+            if place is None:
+                unknown_locations.append(location)
+            else:
+                places.append(place)
+        state_ids = {state: index for index, state in enumerate(self._states)}
+        columns = [state_ids.get(place.state_code, 0) for place in places] or [0]
+
+        stride = len(self._states)
+        wanted = np.array(ids, dtype=np.int64)[:, None] * stride + np.array(columns, dtype=np.int64)[None, :]
+        national = np.broadcast_to(np.array(ids, dtype=np.int64)[:, None] * stride, wanted.shape)
+        exact = self._lookup(wanted)
+        fallback = self._lookup(national)
+        rows = np.where(exact >= 0, exact, fallback)
+
+        labels = [place.label for place in places] or ["Nigeria"]
+        quotes = [
+            [
+                PriceQuote(self.medicines[medicine], labels[j], *self._prices[rows[i, j]],
+                           state_level=bool(exact[i, j] >= 0 and columns[j]))
+                for j in range(len(labels))
+                if rows[i, j] >= 0
+            ]
+            for i, medicine in enumerate(ids)
+        ]
+        return unknown, unknown_locations, quotes
+
+    def _lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Row of each key, or -1 where it is absent"""
+        if not len(self._keys):
+            return np.full(keys.shape, -1)
+        positions = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        return np.where(self._keys[positions] == keys, positions, -1)
+
+
+def format_naira(amount: float) -> str:
+    return f"₦{amount:,.0f}"
+
+
+@lru_cache(maxsize=1)
+def get_price_store() -> PriceStore:
+    """Return the process-wide price store, loaded on first use"""
+    return PriceStore.from_files()
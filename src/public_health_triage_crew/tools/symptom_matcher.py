@@ -0,0 +1,190 @@
+"""
+Compiled critical-symptom matcher with synonyms, local-language terms and negation
+"""
+
+import os
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import yaml
+
+DEFAULT_LEXICON = Path(__file__).resolve().parent.parent / "config" / "critical_symptoms.yaml"
+
+_APOSTROPHES = re.compile(r"['’`´]")
+_HYPHENS = re.compile(r"[-‐‑–—_/]")
+_SPACES = re.compile(r"\s+")
+_CLAUSE_PUNCTUATION = re.compile(r"[.;:!?,()\n]")
+_WORD = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip diacritics and apostrophes, and collapse whitespace"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _APOSTROPHES.sub("", text.lower())
+    text = _HYPHENS.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def _phrases(entry: Any) -> List[str]:
+    """Flatten a phrase list or a {language: [phrases]} mapping"""
+    if isinstance(entry, dict):
+        return [phrase for phrases in entry.values() for phrase in (phrases or [])]
+    return list(entry or [])
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """Build a regex that matches any phrase by walking a shared-prefix trie
+
+    Python's regex engine tries alternatives one by one, so a flat alternation
+    of hundreds of phrases costs O(phrases) at every position. Factoring common
+    prefixes turns it into a single pass over the trie, the same shape as an
+    Aho-Corasick goto function, and keeps longest-match semantics.
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if terminal else body
+
+    return build(trie)
+
+
+@dataclass(frozen=True)
+class SymptomMatch:
+    """One lexicon hit inside a symptom description"""
+
+    concept: str
+    phrase: str
+    start: int
+    end: int
+    negated: bool
+
+
+class CriticalSymptomMatcher:
+    """Multi-pattern matcher over the critical symptom lexicon
+
+    The lexicon is compiled once into a single trie-shaped regular expression,
+    so each description is scanned in one pass regardless of lexicon size.
+    """
+
+    def __init__(self, lexicon: Dict[str, Any]):
+        concepts = lexicon.get("concepts") or {}
+        negation = lexicon.get("negation") or {}
+
+        self.weights: Dict[str, int] = {}
+        self._concept_for_phrase: Dict[str, str] = {}
+        for concept, spec in concepts.items():
+            self.weights[concept] = int(spec.get("weight", 1))
+            for phrase in _phrases(spec.get("phrases")):
+                self._concept_for_phrase.setdefault(normalize_text(phrase), concept)
+
+        self.window = int(negation.get("window", 4))
+        cues = {normalize_text(cue) for cue in _phrases(negation.get("cues"))}
+        breaks = {normalize_text(word) for word in negation.get("clause_breaks") or []}
+
+        self._pattern = re.compile(r"(?<!\w)" + _trie_pattern(self._concept_for_phrase) + r"(?!\w)")
+        self._negation = re.compile(r"(?<!\w)" + _trie_pattern(cues) + r"(?!\w)") if cues else None
+        self._clause_breaks = breaks
+        exclusions = {normalize_text(phrase) for phrase in _phrases(lexicon.get("exclusions"))}
+        self._exclusions = re.compile(r"(?<!\w)" + _trie_pattern(exclusions) + r"(?!\w)") if exclusions else None
+
+    @classmethod
+    def from_files(cls, paths: Sequence[Path]) -> "CriticalSymptomMatcher":
+        """Merge lexicon files in order; later files extend earlier ones"""
+        merged: Dict[str, Any] = {"concepts": {}, "negation": {"cues": [], "clause_breaks": []}, "exclusions": []}
+        for path in paths:
+            with open(path, encoding="utf-8") as handle:
+                lexicon = yaml.safe_load(handle) or {}
+            negation = lexicon.get("negation") or {}
+            merged["negation"]["cues"] += _phrases(negation.get("cues"))
+            merged["negation"]["clause_breaks"] += negation.get("clause_breaks") or []
+            merged["exclusions"] += _phrases(lexicon.get("exclusions"))
+            if "window" in negation:
+                merged["negation"]["window"] = negation["window"]
+            for concept, spec in (lexicon.get("concepts") or {}).items():
+                target = merged["concepts"].setdefault(concept, {"weight": spec.get("weight", 1), "phrases": []})
+                target["weight"] = spec.get("weight", target["weight"])
+                target["phrases"] += _phrases(spec.get("phrases"))
+        return cls(merged)
+
+    def _is_negated(self, text: str, start: int) -> bool:
+        if self._negation is None:
+            return False
+        prefix = text[:start]
+        clause_start = 0
+        for punctuation in _CLAUSE_PUNCTUATION.finditer(prefix):
+            clause_start = punctuation.end()
+        words = _WORD.findall(prefix[clause_start:])
+        for index in range(len(words) - 1, -1, -1):
+            if words[index] in self._clause_breaks:
+                words = words[index + 1:]
+                break
+        window = " ".join(words[-self.window:])
+        return bool(window) and self._negation.search(window) is not None
+
+    def find(self, symptoms: str) -> List[SymptomMatch]:
+        """Return every lexicon hit, including negated ones, in text order"""
+        text = normalize_text(symptoms or "")
+        excluded = [match.span() for match in self._exclusions.finditer(text)] if self._exclusions else []
+        return [
+            SymptomMatch(
+                concept=self._concept_for_phrase[match.group()],
+                phrase=match.group(),
+                start=match.start(),
+                end=match.end(),
+                negated=self._is_negated(text, match.start()),
+            )
+            for match in self._pattern.finditer(text)
+            if not any(start < match.end() and match.start() < end for start, end in excluded)
+        ]
+
+    def detect(self, symptoms: str) -> List[str]:
+        """Return the distinct affirmed critical concepts in text order"""
+        found: List[str] = []
+        for match in self.find(symptoms):
+            if not match.negated and match.concept not in found:
+                found.append(match.concept)
+        return found
+
+    def score(self, symptoms: str) -> int:
+        """Highest weight among affirmed findings, 0 when none"""
+        return max((self.weights[concept] for concept in self.detect(symptoms)), default=0)
+
+    def detect_many(self, texts: Iterable[str]) -> List[List[str]]:
+        """Batch form of detect() for bulk imports"""
+        return [self.detect(text) for text in texts]
+
+    def score_many(self, texts: Iterable[str]) -> List[int]:
+        """Batch form of score() for bulk imports"""
+        return [self.score(text) for text in texts]
+
+
+def lexicon_paths() -> List[Path]:
+    """Default lexicon plus any extensions named in TRIAGE_SYMPTOM_LEXICON"""
+    extra = os.getenv("TRIAGE_SYMPTOM_LEXICON", "")
+    return [DEFAULT_LEXICON] + [Path(path) for path in extra.split(os.pathsep) if path]
+
+
+@lru_cache(maxsize=1)
+def get_default_matcher() -> CriticalSymptomMatcher:
+    """Return the process-wide matcher, compiled on first use"""
+    return CriticalSymptomMatcher.from_files(lexicon_paths())
+
+
+def detect_critical_symptoms(symptoms: str, matcher: Optional[CriticalSymptomMatcher] = None) -> List[str]:
+    """Convenience wrapper around the default matcher"""
+    return (matcher or get_default_matcher()).detect(symptoms)
@@ -0,0 +1,249 @@
+"""
+Memoized tool calls: deduplicated within a kickoff and shared across kickoffs with per-tool TTLs
+"""
+
+import copy
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..tracing import get_tracer
+from .outbreak_monitor import OUTBREAK_REFRESH_SECONDS
+from .weather_risk import WEATHER_TTL_SECONDS
+
+# "on" (default) shares results across kickoffs; "run" only deduplicates within one; "off" disables both
+TOOL_CACHE_MODE = os.getenv("TRIAGE_TOOL_CACHE", "on").lower()
+
+# Results kept across kickoffs; least recently used are evicted first
+TOOL_CACHE_SIZE = int(os.getenv("TRIAGE_TOOL_CACHE_SIZE", "2048"))
+
+# Seconds a result stays valid across kickoffs for tools without an entry in TOOL_TTLS
+TOOL_CACHE_TTL = float(os.getenv("TRIAGE_TOOL_CACHE_TTL", "3600"))
+
+# Per-tool cross-run TTLs in seconds, following how often the data behind each tool changes;
+# 0 keeps a tool's results for the current kickoff only
+TOOL_TTLS: Dict[str, float] = {
+    "emergency_triage_assessment": 86400,
+    "get_emergency_contacts": 86400,
+    "first_aid_instructions": 86400,
+    "nearest_hospital_finder": 86400,
+    "phc_locations": 86400,
+    "medicine_prices": 21600,
+    "medicine_prices_bulk": 21600,
+    "weather_health_risk": WEATHER_TTL_SECONDS,
+    "disease_outbreak_info": OUTBREAK_REFRESH_SECONDS,
+    "csv_lookup": 60,
+    "web_fetch": 300,
+    "web_fetch_many": 300,
+}
+
+# Tool answers reporting a failure or missing data are never cached
+_FAILURE_PREFIXES = ("Error", "Unable to")
+_FAILURE_MARKERS = ("still loading",)
+
+
+def is_failure(result: Any) -> bool:
+    """Whether a tool result reports an error or data that is not available yet"""
+    if isinstance(result, str):
+        return result.startswith(_FAILURE_PREFIXES) or any(marker in result for marker in _FAILURE_MARKERS)
+    if isinstance(result, list):
+        return any(isinstance(item, dict) and "error" in item for item in result)
+    if isinstance(result, dict):
+        return any(isinstance(value, str) and value.startswith(_FAILURE_PREFIXES) for value in result.values())
+    return False
+
+
+@functools.lru_cache(maxsize=256)
+def _signature(func: Callable[..., Any]) -> inspect.Signature:
+    return inspect.signature(func)
+
+
+def call_key(name: str, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    """Cache key of a call, with arguments bound to parameter names and defaults filled in"""
+    try:
+        bound = _signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments: Any = bound.arguments
+    except TypeError:
+        arguments = {"args": args, "kwargs": kwargs}
+    return name + ":" + json.dumps(arguments, sort_keys=True, default=str)
+
+
+class SharedToolCache:
+    """Thread-safe LRU of tool results shared by every crew in the process, with per-entry expiry"""
+
+    def __init__(self, max_entries: int = TOOL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if time.time() >= expires:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_shared: Optional[SharedToolCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_tool_cache() -> SharedToolCache:
+    """Return the process-wide cross-run tool cache"""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = SharedToolCache()
+    return _shared
+
+
+class ToolMemo:
+    """Memoizes the tools of one crew
+
+    A call is answered from the current run's results first, then from the
+    shared cross-run cache if its tool's TTL allows, and only then executed;
+    the result is recorded in both. A call made while the same one is being
+    looked up or run for a parallel agent waits for that result. Runs are
+    delimited by new_run(), which a crew calls before each kickoff, so within
+    one assessment every agent and iteration sees the same answer for the
+    same arguments. A memo created with per_run=False has no runs: it only
+    joins concurrent identical calls and otherwise relies on the TTLs of the
+    shared cache.
+    """
+
+    def __init__(
+        self,
+        shared: Optional[SharedToolCache] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = TOOL_CACHE_TTL,
+        mode: str = TOOL_CACHE_MODE,
+        per_run: bool = True,
+    ):
+        self.mode = mode
+        self.per_run = per_run
+        self.shared = shared if shared is not None else (get_shared_tool_cache() if mode == "on" else None)
+        self.ttls = TOOL_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self._run: Dict[str, Any] = {}
+        self._pending: Dict[str, threading.Event] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._run_counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def new_run(self) -> None:
+        """Forget the previous run's results and counters"""
+        with self._lock:
+            self._run = {}
+            self._run_counts = {}
+
+    def _count(self, name: str, outcome: str) -> None:
+        with self._lock:
+            for counts in (self._counts, self._run_counts):
+                tool = counts.setdefault(name, {"run_hits": 0, "shared_hits": 0, "misses": 0})
+                tool[outcome] += 1
+        get_tracer().tool_cache_result(outcome)
+
+    def stats(self, run_only: bool = False) -> Dict[str, Dict[str, int]]:
+        """Hit and miss counts per tool, since creation or for the current run"""
+        with self._lock:
+            counts = self._run_counts if run_only else self._counts
+            return {name: dict(tool) for name, tool in counts.items()}
+
+    def call(self, name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self.mode not in ("on", "run"):
+            return func(*args, **kwargs)
+        key = call_key(name, func, args, kwargs)
+        while True:
+            with self._lock:
+                found, value = key in self._run, self._run.get(key)
+                pending = None if found else self._pending.get(key)
+                if not found and pending is None:
+                    # Claimed before the shared lookup so an identical concurrent call waits instead of running too
+                    done = self._pending[key] = threading.Event()
+            if pending is None:
+                break
+            # Re-checked once the running call finishes; if it failed, this call takes over
+            pending.wait()
+        if found:
+            self._count(name, "run_hits")
+            return copy.deepcopy(value)
+
+        try:
+            ttl = self.ttls.get(name, self.default_ttl)
+            if self.shared is not None and ttl > 0:
+                found, value = self.shared.get(key)
+                if found:
+                    self._count(name, "shared_hits")
+                    if self.per_run:
+                        with self._lock:
+                            self._run[key] = value
+                    return copy.deepcopy(value)
+
+            self._count(name, "misses")
+            value = func(*args, **kwargs)
+            if not is_failure(value):
+                if self.per_run:
+                    with self._lock:
+                        self._run[key] = value
+                if self.shared is not None and ttl > 0:
+                    self.shared.set(key, value, ttl)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            done.set()
+        return copy.deepcopy(value)
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """func, with its calls memoized under the tool name"""
+        @functools.wraps(func)
+        def memoized(*args: Any, **kwargs: Any) -> Any:
+            return self.call(name, func, *args, **kwargs)
+        return memoized
+
+    def tool(self, tool: Any) -> Any:
+        """Copy of a crewai tool whose function goes through this memo"""
+        return tool.model_copy(update={"func": self.wrap(tool.name, tool.func)})
+
+
+_memo: Optional[ToolMemo] = None
+_memo_lock = threading.Lock()
+
+
+def get_tool_memo() -> ToolMemo:
+    """Return the process-wide memo used by tools created without a crew of their own
+
+    Nothing delimits runs for it, so it keeps no per-run results and answers
+    repeats only from the shared cache, within each tool's TTL.
+    """
+    global _memo
+    if _memo is None:
+        with _memo_lock:
+            if _memo is None:
+                _memo = ToolMemo(per_run=False)
+    return _memo
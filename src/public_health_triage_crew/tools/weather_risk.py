@@ -0,0 +1,247 @@
+"""
+Weather health-risk grid over every known state, city and LGA, cached with a TTL
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .facility_index import DATA_DIR
+from .fetcher import get_fetcher
+from .location_resolver import Place, get_location_resolver, resolve_location
+
+logger = logging.getLogger(__name__)
+
+# Observation file or http(s) URL returning the same CSV or a JSON list of objects
+WEATHER_SOURCE = os.getenv("TRIAGE_WEATHER_SOURCE", str(DATA_DIR / "weather" / "observations.csv"))
+
+# Seconds a grid is served before a background rebuild is started
+WEATHER_TTL_SECONDS = float(os.getenv("TRIAGE_WEATHER_TTL_SECONDS", "1800"))
+
+# Heat index bands in °C (US NWS): caution, extreme caution, danger, extreme danger
+HEAT_BANDS = (27.0, 32.0, 41.0, 54.0)
+HEAT_LEVELS = ("none", "caution", "extreme caution", "danger", "extreme danger")
+
+# Relative humidity (%) from which damp conditions favour infections and mosquito breeding
+HUMIDITY_BANDS = (60.0, 80.0)
+HUMIDITY_LEVELS = ("low", "moderate", "high")
+
+# 24-hour PM10 bands in µg/m³ (US EPA AQI)
+PM10_BANDS = (55.0, 155.0, 255.0, 355.0)
+AIR_QUALITY_LEVELS = ("good", "moderate", "unhealthy for sensitive groups", "unhealthy", "very unhealthy")
+
+# Dry, dusty air: the harmattan signature
+HARMATTAN_MAX_HUMIDITY = 40.0
+HARMATTAN_MIN_PM10 = 150.0
+
+
+@dataclass(frozen=True)
+class WeatherRisk:
+    """Weather and the health risks it implies at one place"""
+
+    location: str
+    temperature_c: float
+    relative_humidity: float
+    heat_index_c: float
+    pm10: float
+    heat_stress: str
+    humidity_risk: str
+    air_quality: str
+    harmattan: bool
+    observed_at: str = ""
+
+    @property
+    def risks(self) -> List[str]:
+        risks = []
+        if self.heat_stress != "none":
+            risks.append(f"Heat stress risk ({self.heat_stress}, feels like {self.heat_index_c:.0f}°C) - stay hydrated")
+        if self.humidity_risk == "high":
+            risks.append("High humidity - increased infection and mosquito-borne disease risk")
+        if self.harmattan:
+            risks.append("Harmattan dust and dry air - protect airways, watch for respiratory and meningitis symptoms")
+        elif AIR_QUALITY_LEVELS.index(self.air_quality) >= 2:
+            risks.append(f"Poor air quality ({self.air_quality}) - respiratory issues")
+        return risks
+
+
+def heat_index_c(temperature_c: np.ndarray, humidity: np.ndarray) -> np.ndarray:
+    """Apparent temperature (Rothfusz regression with the NWS low-heat formula), vectorized"""
+    t = temperature_c * 9 / 5 + 32
+    rh = humidity
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    full = (
+        -42.379 + 2.04901523 * t + 10.14333127 * rh - 0.22475541 * t * rh
+        - 6.83783e-3 * t ** 2 - 5.481717e-2 * rh ** 2 + 1.22874e-3 * t ** 2 * rh
+        + 8.5282e-4 * t * rh ** 2 - 1.99e-6 * t ** 2 * rh ** 2
+    )
+    dry = (rh < 13) & (t >= 80) & (t <= 112)
+    full = full - np.where(dry, (13 - rh) / 4 * np.sqrt(np.clip(17 - np.abs(t - 95), 0, None) / 17), 0)
+    damp = (rh > 85) & (t >= 80) & (t <= 87)
+    full = full + np.where(damp, (rh - 85) / 10 * (87 - t) / 5, 0)
+    fahrenheit = np.where((simple + t) / 2 < 80, simple, full)
+    return (fahrenheit - 32) * 5 / 9
+
+
+def parse_observations(text: str) -> Dict[str, np.ndarray]:
+    """Columns of a station observation file: latitude, longitude, temperature_c, relative_humidity, pm10"""
+    if text.lstrip().startswith(("[", "{")):
+        data = json.loads(text)
+        rows = data.get("observations", []) if isinstance(data, dict) else data
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+    numeric = ("latitude", "longitude", "temperature_c", "relative_humidity", "pm10")
+    rows = [row for row in rows if all(str(row.get(column, "")).strip() for column in numeric)]
+    columns = {column: np.array([float(row[column]) for row in rows], dtype=float) for column in numeric}
+    columns["observed_at"] = np.array([str(row.get("observed_at") or "") for row in rows], dtype=object)
+    return columns
+
+
+class WeatherRiskGrid:
+    """Risk levels for every place, computed in one vectorized pass
+
+    Each place takes the observation of its nearest station; heat index,
+    humidity, air quality and harmattan flags are then derived for all
+    places at once, so a lookup is a single dict hit.
+    """
+
+    def __init__(self, places: Sequence[Place], observations: Dict[str, np.ndarray]):
+        if not len(observations["latitude"]):
+            raise ValueError("No usable weather observations")
+        self.built_at = time.time()
+        self._observations = observations
+        lats = np.array([place.latitude for place in places], dtype=float)
+        lons = np.array([place.longitude for place in places], dtype=float)
+        columns = self._assess(self._nearest_station(lats, lons))
+        self._risks = {place.id: self._risk(columns, row, place.label) for row, place in enumerate(places)}
+
+    def _nearest_station(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Index of the closest station to each point (places x stations great-circle distances)"""
+        lat1, lon1 = np.radians(lats)[:, None], np.radians(lons)[:, None]
+        lat2, lon2 = np.radians(self._observations["latitude"]), np.radians(self._observations["longitude"])
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return a.argmin(axis=1)  # Monotonic in distance, so no need for arcsin
+
+    def _assess(self, stations: np.ndarray) -> Dict[str, np.ndarray]:
+        temperature = self._observations["temperature_c"][stations]
+        humidity = self._observations["relative_humidity"][stations]
+        pm10 = self._observations["pm10"][stations]
+        heat = heat_index_c(temperature, humidity)
+        return {
+            "temperature_c": temperature,
+            "relative_humidity": humidity,
+            "heat_index_c": heat,
+            "pm10": pm10,
+            "heat_stress": np.searchsorted(HEAT_BANDS, heat, side="right"),
+            "humidity_risk": np.searchsorted(HUMIDITY_BANDS, humidity, side="right"),
+            "air_quality": np.searchsorted(PM10_BANDS, pm10, side="right"),
+            "harmattan": (humidity <= HARMATTAN_MAX_HUMIDITY) & (pm10 >= HARMATTAN_MIN_PM10),
+            "observed_at": self._observations["observed_at"][stations],
+        }
+
+    def _risk(self, columns: Dict[str, np.ndarray], row: int, label: str) -> WeatherRisk:
+        return WeatherRisk(
+            location=label,
+            temperature_c=float(columns["temperature_c"][row]),
+            relative_humidity=float(columns["relative_humidity"][row]),
+            heat_index_c=float(columns["heat_index_c"][row]),
+            pm10=float(columns["pm10"][row]),
+            heat_stress=HEAT_LEVELS[columns["heat_stress"][row]],
+            humidity_risk=HUMIDITY_LEVELS[columns["humidity_risk"][row]],
+            air_quality=AIR_QUALITY_LEVELS[columns["air_quality"][row]],
+            harmattan=bool(columns["harmattan"][row]),
+            observed_at=str(columns["observed_at"][row]),
+        )
+
+    def lookup(self, place: Place) -> WeatherRisk:
+        risk = self._risks.get(place.id)
+        if risk is not None:
+            return risk
+        # Coordinates (or a place added after the grid was built) are assessed on the spot
+        columns = self._assess(self._nearest_station(np.array([place.latitude]), np.array([place.longitude])))
+        return self._risk(columns, 0, place.label)
+
+
+def load_grid(source: str = WEATHER_SOURCE) -> WeatherRiskGrid:
+    """Build a grid over every resolver place from the current observations"""
+    if source.startswith(("http://", "https://")):
+        result = get_fetcher().fetch(source)
+        if result.error:
+            raise IOError(f"{source}: {result.error}")
+        text = result.text
+    else:
+        with open(source, encoding="utf-8") as handle:
+            text = handle.read()
+    return WeatherRiskGrid(list(get_location_resolver().places.values()), parse_observations(text))
+
+
+class WeatherRiskCache:
+    """Serves the current grid; once it is older than the TTL a rebuild runs in the background
+
+    Only the first call builds synchronously. Afterwards callers always get
+    the grid on hand, possibly stale by one refresh, and a failed rebuild
+    leaves it in place until the next attempt.
+    """
+
+    def __init__(self, source: str = WEATHER_SOURCE, ttl: float = WEATHER_TTL_SECONDS):
+        self.source = source
+        self.ttl = ttl
+        self.last_error: Optional[str] = None
+        self._grid: Optional[WeatherRiskGrid] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._attempted = 0.0
+
+    def grid(self) -> WeatherRiskGrid:
+        grid = self._grid
+        if grid is None:
+            with self._lock:
+                if self._grid is None:
+                    self._grid = load_grid(self.source)
+                return self._grid
+        now = time.time()
+        if now - max(grid.built_at, self._attempted) > self.ttl:
+            with self._lock:
+                start = not self._refreshing
+                if start:
+                    self._refreshing, self._attempted = True, now
+            if start:
+                threading.Thread(target=self._refresh, name="weather-risk-refresh", daemon=True).start()
+        return grid
+
+    def _refresh(self) -> None:
+        try:
+            self._grid = load_grid(self.source)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            logger.warning("Weather risk refresh failed: %s", e)
+        finally:
+            self._refreshing = False
+
+    def risks_for(self, locations: Sequence[str]) -> List[Optional[WeatherRisk]]:
+        """Bulk lookup for batch triage; None where a location is not recognised"""
+        grid = self.grid()
+        resolved = [resolve_location(location) for location in locations]
+        return [grid.lookup(place) if place is not None else None for place in resolved]
+
+
+_cache: Optional[WeatherRiskCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_weather_risks() -> WeatherRiskCache:
+    """Return the process-wide weather risk cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = WeatherRiskCache()
+    return _cache
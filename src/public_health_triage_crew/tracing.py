@@ -0,0 +1,301 @@
+"""
+Structured spans for kickoffs, tasks, agents, tool calls and LLM requests
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .rate_limiter import estimate_tokens
+
+# Comma-separated exporters: "jsonl", "memory"; unset disables tracing entirely
+TRACING = os.getenv("TRIAGE_TRACING", "").lower()
+TRACE_FILE = os.getenv("TRIAGE_TRACE_FILE", ".triage_cache/traces.jsonl")
+TRACE_BUFFER_SIZE = int(os.getenv("TRIAGE_TRACE_BUFFER_SIZE", "2000"))
+
+
+@dataclass
+class Span:
+    """One timed operation; spans of a kickoff share a trace_id"""
+
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    duration_ms: Optional[float] = None
+    status: str = "ok"
+    error: Optional[str] = None
+    _started: float = field(default=0.0, repr=False)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("_started")
+        return data
+
+
+class _NoopSpan:
+    """Stand-in handed out while tracing is disabled"""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class RingBufferExporter:
+    """Keeps the most recent spans in memory for inspection"""
+
+    def __init__(self, size: int = TRACE_BUFFER_SIZE):
+        self._spans: "deque[Dict[str, Any]]" = deque(maxlen=size)
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span.to_dict())
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        spans = list(self._spans)
+        return [span for span in spans if span["trace_id"] == trace_id] if trace_id else spans
+
+
+class JsonlExporter:
+    """Appends each finished span as one JSON line"""
+
+    def __init__(self, path: str = TRACE_FILE):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            self._handle.write(line)
+            self._handle.flush()
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("triage_current_span", default=None)
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporters
+
+    With no exporters the tracer is disabled: span() returns a shared no-op
+    and no crewai event handlers are registered.
+    """
+
+    def __init__(self, exporters: Iterable[Any] = ()):
+        self.exporters = list(exporters)
+        self.enabled = bool(self.exporters)
+        self._lock = threading.Lock()
+        self._open: Dict[Any, Span] = {}
+        self._task_parents: Dict[str, Span] = {}
+        self._agent_spans: Dict[str, Span] = {}
+
+    def start_span(self, name: str, kind: str, parent: Optional[Span] = None, **attributes: Any) -> Span:
+        return Span(
+            name=name,
+            kind=kind,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            start=time.time(),
+            attributes=attributes,
+            _started=time.perf_counter(),
+        )
+
+    def end_span(self, span: Optional[Span], error: Optional[str] = None) -> None:
+        if span is None:
+            return
+        span.duration_ms = round((time.perf_counter() - span._started) * 1000, 3)
+        if error:
+            span.status = "error"
+            span.error = error
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    def span(self, name: str, kind: str, **attributes: Any) -> Any:
+        """Context manager timing a block as a child of the current span"""
+        if not self.enabled:
+            return nullcontext(NOOP_SPAN)
+        return self._span(name, kind, attributes)
+
+    @contextmanager
+    def _span(self, name: str, kind: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        span = self.start_span(name, kind, _current_span.get(), **attributes)
+        token = _current_span.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = str(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span, error)
+
+    def bind_tasks(self, tasks: Iterable[Any], span: Any) -> None:
+        """Parent the spans of tasks (which may run on other threads) under span"""
+        if self.enabled and isinstance(span, Span):
+            with self._lock:
+                for task in tasks:
+                    self._task_parents[str(task.id)] = span
+
+    def _open_span(self, key: Any, span: Span) -> None:
+        with self._lock:
+            self._open[key] = span
+
+    def _close_span(self, key: Any, error: Optional[str] = None, **attributes: Any) -> None:
+        with self._lock:
+            span = self._open.pop(key, None)
+        if span is not None:
+            span.set(**attributes)
+            self.end_span(span, error)
+
+    # crewai event handlers ------------------------------------------------
+
+    def on_task_started(self, source: Any, event: Any) -> None:
+        task = event.task
+        with self._lock:
+            parent = self._task_parents.pop(str(task.id), None)
+        self._open_span(("task", str(task.id)), self.start_span(f"task:{task.name}", "task", parent, task=task.name))
+
+    def on_task_finished(self, source: Any, event: Any) -> None:
+        output = getattr(event, "output", None)
+        self._close_span(
+            ("task", str(event.task.id)),
+            getattr(event, "error", None),
+            output_chars=len(output.raw) if output is not None else 0,
+        )
+
+    def on_agent_started(self, source: Any, event: Any) -> None:
+        with self._lock:
+            parent = self._open.get(("task", str(event.task.id)))
+        span = self.start_span(f"agent:{event.agent.role.strip()}", "agent", parent, agent=event.agent.role.strip(), iterations=0)
+        with self._lock:
+            self._agent_spans[str(event.agent.id)] = span
+        self._open_span(("agent", str(event.agent.id)), span)
+
+    def on_agent_finished(self, source: Any, event: Any) -> None:
+        with self._lock:
+            self._agent_spans.pop(str(event.agent.id), None)
+        self._close_span(("agent", str(event.agent.id)), getattr(event, "error", None))
+
+    def on_llm_started(self, source: Any, event: Any) -> None:
+        with self._lock:
+            parent = self._agent_spans.get(str(event.agent_id)) if event.agent_id else None
+            if parent is not None:
+                parent.attributes["iterations"] += 1
+        span = self.start_span(
+            "llm",
+            "llm",
+            parent,
+            model=getattr(source, "model", None),
+            task=event.task_name,
+            iteration=parent.attributes["iterations"] if parent else None,
+            prompt_tokens=estimate_tokens(event.messages or ""),
+        )
+        self._open_span(("llm", threading.get_ident()), span)
+
+    def on_llm_finished(self, source: Any, event: Any) -> None:
+        response = getattr(event, "response", None)
+        self._close_span(
+            ("llm", threading.get_ident()),
+            getattr(event, "error", None),
+            completion_tokens=estimate_tokens(str(response)) if response is not None else 0,
+        )
+
+    def on_tool_started(self, source: Any, event: Any) -> None:
+        with self._lock:
+            parent = self._agent_spans.get(str(event.agent.id)) if event.agent else None
+        span = self.start_span(
+            f"tool:{event.tool_name}", "tool", parent, tool=event.tool_name, agent=event.agent_role, from_cache=False
+        )
+        self._open_span(("tool", threading.get_ident()), span)
+
+    def on_tool_finished(self, source: Any, event: Any) -> None:
+        error = getattr(event, "error", None)
+        # crewai's own tool cache is off, so hits are normally marked by ToolMemo (see tool_cache_result)
+        cached = {"from_cache": True} if getattr(event, "from_cache", False) else {}
+        self._close_span(("tool", threading.get_ident()), str(error) if error is not None else None, **cached)
+
+    def tool_cache_result(self, outcome: str) -> None:
+        """Record on this thread's open tool span how ToolMemo answered the call
+
+        outcome is "run_hits", "shared_hits" or "misses".
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            span = self._open.get(("tool", threading.get_ident()))
+        if span is not None:
+            span.set(from_cache=outcome != "misses", cache=outcome)
+
+    def register(self) -> None:
+        from crewai.utilities.events import crewai_event_bus
+        from crewai.utilities.events.agent_events import (
+            AgentExecutionCompletedEvent, AgentExecutionErrorEvent, AgentExecutionStartedEvent
+        )
+        from crewai.utilities.events.llm_events import LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent
+        from crewai.utilities.events.task_events import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent
+        from crewai.utilities.events.tool_usage_events import (
+            ToolUsageErrorEvent, ToolUsageFinishedEvent, ToolUsageStartedEvent
+        )
+
+        for event_type, handler in (
+            (TaskStartedEvent, self.on_task_started),
+            (TaskCompletedEvent, self.on_task_finished),
+            (TaskFailedEvent, self.on_task_finished),
+            (AgentExecutionStartedEvent, self.on_agent_started),
+            (AgentExecutionCompletedEvent, self.on_agent_finished),
+            (AgentExecutionErrorEvent, self.on_agent_finished),
+            (LLMCallStartedEvent, self.on_llm_started),
+            (LLMCallCompletedEvent, self.on_llm_finished),
+            (LLMCallFailedEvent, self.on_llm_finished),
+            (ToolUsageStartedEvent, self.on_tool_started),
+            (ToolUsageFinishedEvent, self.on_tool_finished),
+            (ToolUsageErrorEvent, self.on_tool_finished),
+        ):
+            crewai_event_bus.register_handler(event_type, handler)
+
+
+def build_exporters(spec: str = TRACING) -> List[Any]:
+    """Exporters named in TRIAGE_TRACING"""
+    exporters: List[Any] = []
+    for name in filter(None, (part.strip() for part in spec.split(","))):
+        if name == "jsonl":
+            exporters.append(JsonlExporter())
+        elif name == "memory":
+            exporters.append(RingBufferExporter())
+        elif name not in ("off", "0", "false"):
+            raise ValueError(f"Unknown TRIAGE_TRACING exporter '{name}'; expected jsonl or memory")
+    return exporters
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer, registering its event handlers if enabled"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                tracer = Tracer(build_exporters())
+                if tracer.enabled:
+                    tracer.register()
+                _tracer = tracer
+    return _tracer
@@ -0,0 +1,61 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from public_health_triage_crew import batch  # noqa: E402
+
+
+class FakeWeather:
+    def __init__(self):
+        self.calls = []
+
+    def risks_for(self, locations):
+        self.calls.append(list(locations))
+        return [SimpleNamespace(risks=[f"heat in {location}"]) for location in locations]
+
+
+class FakePool:
+    def kickoff(self, inputs):
+        return SimpleNamespace(raw=f"report for {inputs['patient_name']}", tasks_output=[])
+
+
+@pytest.fixture
+def weather(monkeypatch):
+    weather = FakeWeather()
+    monkeypatch.setattr(batch, "get_weather_risks", lambda: weather)
+    monkeypatch.setattr(batch, "get_crew_pool", lambda: FakePool())
+    monkeypatch.setattr(batch, "BATCH_CHUNK_SIZE", 2)
+    return weather
+
+
+def test_weather_is_looked_up_once_per_chunk(tmp_path, weather):
+    source = tmp_path / "intake.jsonl"
+    records = [{"id": str(index), "name": f"P{index}", "location": f"City {index}"} for index in range(3)]
+    source.write_text("\n".join(json.dumps(record) for record in records) + "\nnot json\n", encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+
+    counts = batch.run_batch(str(source), str(output), concurrency=2, progress=None)
+
+    assert counts == {"ok": 3, "error": 1, "skipped": 0}
+    assert weather.calls == [["City 0", "City 1"], ["City 2", ""]]
+    entries = {entry["record_id"]: entry for entry in map(json.loads, output.read_text().splitlines())}
+    assert entries["2"]["weather_risks"] == ["heat in City 2"]
+    assert entries["line-4"]["status"] == "error"
+
+
+def test_weather_failure_does_not_fail_the_records(tmp_path, monkeypatch, weather):
+    def broken(locations):
+        raise RuntimeError("grid unavailable")
+
+    monkeypatch.setattr(weather, "risks_for", broken)
+    source = tmp_path / "intake.jsonl"
+    source.write_text(json.dumps({"id": "a", "location": "Lagos"}) + "\n", encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+
+    counts = batch.run_batch(str(source), str(output), progress=None)
+
+    assert counts["ok"] == 1
+    assert json.loads(output.read_text())["weather_risks"] == []
@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.tasks.task_output import TaskOutput  # noqa: E402
+
+from public_health_triage_crew.model_tiers import GEMINI_STRONG_MODEL  # noqa: E402
+
+
+@pytest.fixture
+def triage_crew(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    from public_health_triage_crew.crew import PublicHealthTriageCrew
+
+    triage = PublicHealthTriageCrew(parallel=False)
+    triage.crew()
+    return triage
+
+
+def test_low_confidence_output_escalates_to_strong_tier(triage_crew):
+    task = triage_crew.public_health_triage_task()
+    assert task._guardrail is not None
+
+    passed, feedback = task._guardrail(
+        TaskOutput(description=task.description, agent=task.agent.role, raw="I'm not sure.")
+    )
+
+    assert not passed
+    assert "too short" in feedback
+    assert task.name in triage_crew._escalated
+    assert task.agent.llm.model == f"gemini/{GEMINI_STRONG_MODEL}"
+
+    triage_crew.reset()
+    assert task.name not in triage_crew._escalated
+    assert task.agent.llm.model != f"gemini/{GEMINI_STRONG_MODEL}"
+
+
+class _FakeCrew:
+    task_callback = None
+
+    def kickoff(self, inputs):
+        from crewai.crews.crew_output import CrewOutput
+
+        return CrewOutput(raw="report")
+
+
+class _FakeSpan:
+    def set(self, **attributes):
+        pass
+
+
+def test_skipped_specialist_does_not_keep_previous_output(triage_crew, monkeypatch):
+    from public_health_triage_crew import crew as crew_module
+
+    maternal = triage_crew.maternal_child_health_task()
+    maternal.output = TaskOutput(description=maternal.description, agent="previous run", raw="stale advice")
+    monkeypatch.setattr(crew_module, "get_task_cache", lambda: None)
+    monkeypatch.setattr(triage_crew, "_crew_for", lambda tasks: _FakeCrew())
+
+    inputs = {"age": 60, "gender": "Male", "symptoms": "Headache", "symptom_severity": "Mild"}
+    result = triage_crew._run_assessment(inputs, None, None, _FakeSpan())
+
+    assert maternal.output is None
+    assert all(output.raw != "stale advice" for output in result.tasks_output)
+
+
+def test_custom_tools_are_given_to_the_agents_that_use_them(triage_crew):
+    names = lambda agent: {tool.name for tool in agent.tools}  # noqa: E731
+    assert "csv_lookup" in names(triage_crew.medicine_availability_locator())
+    assert {"web_fetch", "web_fetch_many"} <= names(triage_crew.health_finance_coach())
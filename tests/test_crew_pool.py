@@ -0,0 +1,49 @@
+import gc
+import weakref
+
+import pytest
+
+pytest.importorskip("crewai")
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    from public_health_triage_crew.crew_pool import CrewPool
+
+    return CrewPool(size=2, auto_reload=False)
+
+
+def test_reload_frees_discarded_crews(pool):
+    pool.warm()
+    idle = [weakref.ref(instance) for _, instance in list(pool._idle.queue)]
+    with pool.checkout() as instance:
+        checked_out = weakref.ref(instance)
+        pool.reload()
+    del instance
+
+    gc.collect()
+
+    assert all(ref() is None for ref in idle + [checked_out])
+
+
+def test_pooled_crews_stay_memoized_until_released(pool):
+    with pool.checkout() as instance:
+        assert instance.crew() is instance.crew()
+        assert instance.public_health_triage() is instance.public_health_triage()
+
+
+def test_release_degrades_when_memoize_layout_changes(pool, monkeypatch, caplog):
+    from public_health_triage_crew import crew as crew_module
+
+    monkeypatch.setattr(crew_module, "_MEMOIZED_CACHE_CELL", None)
+    monkeypatch.setattr(crew_module, "_release_warned", False)
+    with pool.checkout() as instance:
+        built = instance.crew()
+        with caplog.at_level("WARNING", logger=crew_module.__name__):
+            instance.release()
+            instance.release()
+
+    assert instance.crew() is built
+    warnings = [record for record in caplog.records if record.name == crew_module.__name__]
+    assert len(warnings) == 1 and "memoize" in warnings[0].message
@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from public_health_triage_crew.tools import custom_tool  # noqa: E402
+
+
+def test_tools_are_importable_and_named():
+    assert custom_tool.csv_lookup_tool.name == "csv_lookup"
+    assert custom_tool.web_fetch_tool.name == "web_fetch"
+    assert custom_tool.web_fetch_many_tool.name == "web_fetch_many"
+
+
+def test_csv_lookup_tool_searches_the_index(tmp_path):
+    path = tmp_path / "medicines.csv"
+    path.write_text("name,form\nAmoxicillin,capsule\nParacetamol,tablet\n", encoding="utf-8")
+
+    rows = custom_tool.csv_lookup_tool.run(path=str(path), query="amox")
+
+    assert rows == [{"name": "Amoxicillin", "form": "capsule"}]
+
+
+def test_custom_tools_go_through_the_memo(tmp_path):
+    from public_health_triage_crew.tools.tool_cache import SharedToolCache, ToolMemo
+
+    path = tmp_path / "medicines.csv"
+    path.write_text("name,form\nAmoxicillin,capsule\n", encoding="utf-8")
+    memo = ToolMemo(shared=SharedToolCache())
+    tools = {tool.name: tool for tool in custom_tool.create_custom_tools(memo)}
+
+    assert set(tools) == {"csv_lookup", "web_fetch", "web_fetch_many"}
+    tools["csv_lookup"].run(path=str(path), query="amox")
+    tools["csv_lookup"].run(path=str(path), query="amox")
+    assert memo.stats()["csv_lookup"] == {"run_hits": 1, "shared_hits": 0, "misses": 1}
@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from public_health_triage_crew.tools.facility_index import Facility, FacilityIndex, describe_distance  # noqa: E402
+
+IBADAN = (7.3775, 3.9470)
+
+
+def facility(name, lat, lon, precision):
+    return Facility(
+        name=name,
+        facility_type="General Hospital",
+        level="secondary",
+        specialties=("emergency",),
+        state="Oyo",
+        lga="Ibadan North",
+        city="Ibadan",
+        latitude=lat,
+        longitude=lon,
+        coordinate_precision=precision,
+    )
+
+
+def test_nearest_ranks_by_distance_whatever_the_precision():
+    near_approximate = facility("Near", IBADAN[0] + 0.009, IBADAN[1], "city")
+    far_exact = facility("Far", IBADAN[0] + 0.36, IBADAN[1], "exact")
+    index = FacilityIndex([far_exact, near_approximate])
+
+    ranked = index.nearest(*IBADAN, k=2)
+
+    assert [found.name for found, _ in ranked] == ["Near", "Far"]
+    assert ranked[0][1] == pytest.approx(1.0, abs=0.1)
+    assert ranked[1][1] == pytest.approx(40.0, abs=0.5)
+
+
+def test_describe_distance_matches_coordinate_precision():
+    assert describe_distance(facility("A", *IBADAN, "exact"), 1.234) == "1.2km, Ibadan"
+    assert describe_distance(facility("B", *IBADAN, "city"), 3.0) == "in Ibadan"
+    assert describe_distance(facility("C", *IBADAN, "city"), 42.4) == "about 42km, Ibadan"
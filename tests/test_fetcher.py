@@ -0,0 +1,114 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from public_health_triage_crew.tools.fetcher import Fetcher, HttpCache  # noqa: E402
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Local stand-in for guidance pages, counting what it is asked"""
+
+    requests = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", **headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        StandIn.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, ETag='"v1"', Cache_Control="no-cache")
+            else:
+                self._send(200, b"<html><title>NHIA</title><p>Enrol</p></html>", Content_Type="text/html",
+                           ETag='"v1"', Cache_Control="no-cache")
+        elif self.path == "/fresh":
+            self._send(200, b"fresh page", Content_Type="text/plain", Cache_Control="max-age=60")
+        elif self.path == "/big":
+            self._send(200, b"x" * 100000, Content_Type="text/plain")
+        elif self.path.startswith("/slow"):
+            with StandIn.lock:
+                StandIn.active += 1
+                StandIn.peak = max(StandIn.peak, StandIn.active)
+            time.sleep(0.1)
+            with StandIn.lock:
+                StandIn.active -= 1
+            self._send(200, self.path.encode(), Content_Type="text/plain")
+        else:
+            self._send(404)
+
+
+@pytest.fixture(scope="module")
+def address():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def server(address):
+    StandIn.requests, StandIn.active, StandIn.peak = [], 0, 0
+    return address
+
+
+@pytest.fixture
+def fetcher():
+    return Fetcher(cache=HttpCache(":memory:"), concurrency=2)
+
+
+def test_etag_is_revalidated_with_a_conditional_request(server, fetcher):
+    first = fetcher.fetch(server + "/etag")
+    second = fetcher.fetch(server + "/etag")
+
+    assert (first.cache, second.cache) == ("miss", "revalidated")
+    assert first.text == second.text == "# NHIA\n\nEnrol"
+    assert StandIn.requests == [("/etag", None), ("/etag", '"v1"')]
+
+
+def test_max_age_response_is_served_without_a_request(server, fetcher):
+    first = fetcher.fetch(server + "/fresh")
+    second = fetcher.fetch(server + "/fresh")
+
+    assert (first.cache, second.cache) == ("miss", "hit")
+    assert second.text == "fresh page"
+    assert len(StandIn.requests) == 1
+
+
+def test_body_is_truncated_at_max_bytes(server, fetcher):
+    result = fetcher.fetch(server + "/big", max_bytes=1000)
+
+    assert result.truncated
+    assert result.text == "x" * 1000
+
+
+def test_fetch_many_keeps_order_and_bounds_concurrency(server, fetcher):
+    urls = [f"{server}/slow/{index}" for index in range(6)]
+
+    results = fetcher.fetch_many(urls)
+
+    assert [result.text for result in results] == [f"/slow/{index}" for index in range(6)]
+    assert StandIn.peak == 2
+
+
+def test_errors_are_reported_on_the_result(server, fetcher):
+    result = fetcher.fetch(server + "/missing")
+
+    assert result.status == 0
+    assert "404" in result.error
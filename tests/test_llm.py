@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai import LLM  # noqa: E402
+
+from public_health_triage_crew.llm import Cassette, RecordReplayLLM, StubLLM, create_llm  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "Assessment at 2026-10-18 09:00:00: fever in Kano"}]
+
+
+def test_stub_answers_are_deterministic_and_sized():
+    llm = StubLLM(model="gemini/gemini-1.5-flash", latency=0, output_chars=300)
+
+    first = llm.call(MESSAGES)
+
+    assert first == llm.call(MESSAGES)
+    assert first.startswith("Thought: I now know the final answer\nFinal Answer: ")
+    assert len(first.split("Final Answer: ", 1)[1]) <= 300
+    assert llm.call([{"role": "user", "content": "cough in Lagos"}]) != first
+
+
+def test_create_llm_picks_the_backend():
+    assert isinstance(create_llm("stub", model="gemini/x"), StubLLM)
+    assert create_llm("replay", model="gemini/x").mode == "replay"
+    with pytest.raises(ValueError):
+        create_llm("nope", model="gemini/x")
+
+
+def test_record_then_replay_round_trip(tmp_path, monkeypatch):
+    path = tmp_path / "cassette.jsonl"
+    live_answers = iter(["Final Answer: first", "Final Answer: second"])
+    monkeypatch.setattr(LLM, "call", lambda self, messages, **kwargs: next(live_answers))
+
+    recorder = RecordReplayLLM(model="gemini/gemini-1.5-flash", mode="record", cassette=Cassette(str(path)))
+    assert recorder.call(MESSAGES) == "Final Answer: first"
+    assert recorder.call(MESSAGES) == "Final Answer: second"
+
+    monkeypatch.setattr(LLM, "call", lambda self, messages, **kwargs: pytest.fail("replay must not call the provider"))
+    player = RecordReplayLLM(model="gemini/gemini-1.5-flash", mode="replay", cassette=Cassette(str(path)))
+    # Timestamps in the prompt do not change the key
+    later = [{"role": "user", "content": "Assessment at 2026-10-19 17:45:12: fever in Kano"}]
+    assert [player.call(later), player.call(MESSAGES)] == ["Final Answer: first", "Final Answer: second"]
+
+
+def test_replay_of_an_unrecorded_prompt_fails_clearly(tmp_path):
+    player = RecordReplayLLM(model="gemini/x", mode="replay", cassette=Cassette(str(tmp_path / "empty.jsonl")))
+    with pytest.raises(LookupError, match="Re-record"):
+        player.call(MESSAGES)
+
+
+def test_cassette_keys_depend_on_the_model():
+    assert Cassette.key("gemini/a", MESSAGES) != Cassette.key("gemini/b", MESSAGES)
@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from public_health_triage_crew.tools.location_resolver import (  # noqa: E402
+    LocationResolver,
+    Place,
+    get_location_resolver,
+)
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return get_location_resolver()
+
+
+@pytest.mark.parametrize("text, place_id", [
+    ("Ibadna", "NG-OY/ibadan"),
+    ("Kanno", "NG-KN"),
+    ("port harcort", "NG-RI/port-harcourt"),
+])
+def test_one_edit_misspellings_resolve(resolver, text, place_id):
+    assert resolver.resolve(text).id == place_id
+
+
+@pytest.mark.parametrize("text, place_id", [
+    ("PH", "NG-RI/port-harcourt"),
+    ("Benin", "NG-ED/benin-city"),
+    ("VI", "NG-LA/victoria-island"),
+    ("Federal Capital Territory", "NG-FC"),
+])
+def test_aliases_resolve(resolver, text, place_id):
+    assert resolver.resolve(text).id == place_id
+
+
+def test_city_state_and_country_resolve_to_the_city(resolver):
+    place = resolver.resolve("Ibadan, Oyo, Nigeria")
+    assert place.id == "NG-OY/ibadan"
+    assert place.label == "Ibadan, Oyo"
+
+
+def test_named_state_picks_between_cities_of_the_same_name():
+    resolver = LocationResolver([
+        Place("NG-AA", "state", "Alpha", "Alpha", "NG-AA", 1.0, 1.0),
+        Place("NG-BB", "state", "Bravo", "Bravo", "NG-BB", 2.0, 2.0),
+        Place("NG-AA/ojoko", "city", "Ojoko", "Alpha", "NG-AA", 1.1, 1.1),
+        Place("NG-BB/ojoko", "city", "Ojoko", "Bravo", "NG-BB", 2.1, 2.1),
+    ])
+    assert resolver.resolve("Ojoko, Bravo").id == "NG-BB/ojoko"
+    assert resolver.resolve("Ojoko, Alpha").id == "NG-AA/ojoko"
+    assert resolver.resolve("Bravo State").label == "Bravo State"
+
+
+def test_coordinates_resolve_to_a_point(resolver):
+    place = resolver.resolve("6.5, 3.4")
+    assert place.kind == "point"
+    assert (place.latitude, place.longitude) == (6.5, 3.4)
+
+
+@pytest.mark.parametrize("text", ["", "Nigeria", "Xyzzy town", "Ib"])
+def test_unrecognised_text_resolves_to_none(resolver, text):
+    assert resolver.resolve(text) is None
@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from public_health_triage_crew.tools import outbreak_monitor  # noqa: E402
+from public_health_triage_crew.tools.location_resolver import resolve_location  # noqa: E402
+from public_health_triage_crew.tools.outbreak_monitor import OutbreakMonitor  # noqa: E402
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_refresh_thread_survives_a_failed_rebuild(tmp_path, monkeypatch, caplog):
+    (tmp_path / "report.csv").write_text("disease,state,status\nCholera,Lagos,active\n", encoding="utf-8")
+    real_apply_updates = outbreak_monitor.apply_updates
+    calls = []
+
+    def flaky_apply_updates(snapshot, records):
+        calls.append(len(records))
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return real_apply_updates(snapshot, records)
+
+    monkeypatch.setattr(outbreak_monitor, "apply_updates", flaky_apply_updates)
+    monitor = OutbreakMonitor(sources=[str(tmp_path)], interval=0.05)
+    monitor.start()
+    try:
+        assert wait_for(lambda: monitor.snapshot.version)
+        assert monitor.alive
+        # The states from the failed rebuild are published by the retry
+        assert calls == [1, 1]
+        assert [record.disease for record in monitor.snapshot.for_place(resolve_location("Lagos"))] == ["Cholera"]
+        assert "Outbreak refresh failed" in caplog.text
+    finally:
+        monitor.stop()
+    assert wait_for(lambda: not monitor.alive)
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from public_health_triage_crew.tools.price_store import get_price_store  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def store():
+    return get_price_store()
+
+
+def generic(store, name):
+    medicine = store.find(name)
+    return None if medicine is None else store.medicines[medicine].generic
+
+
+@pytest.mark.parametrize("name", ["a", "c", "amo", "", "Nonexistentol"])
+def test_short_or_unknown_names_are_not_priced(store, name):
+    assert store.find(name) is None
+
+
+def test_names_brands_and_prefixes_resolve(store):
+    assert generic(store, "Panadol") == "paracetamol"
+    assert generic(store, "paracetamol 500mg tablets") == "paracetamol"
+    assert generic(store, "cipro") == "ciprofloxacin"
+    assert generic(store, "artem") == "artemether-lumefantrine"
+
+
+@pytest.mark.parametrize("name", ["para", "amox"])
+def test_prefix_of_several_medicines_is_unknown(store, name):
+    assert store.find(name) is None
+
+
+def test_quote_reports_unknown_medicines_and_locations(store):
+    unknown, unknown_locations, quotes = store.quote(["a", "Panadol"], ["Nowhere", "Lagos"])
+
+    assert unknown == ["a"]
+    assert unknown_locations == ["Nowhere"]
+    assert len(quotes) == 1
+    assert [quote.location for quote in quotes[0]] == ["Lagos State"]
+
+
+def test_quote_falls_back_to_the_national_range(store):
+    _, unknown_locations, quotes = store.quote(["Panadol"], ["Nowhere"])
+
+    assert unknown_locations == ["Nowhere"]
+    assert [(quote.location, quote.state_level) for quote in quotes[0]] == [("Nigeria", False)]
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from public_health_triage_crew.rate_limiter import AdaptiveRateLimiter
+
+
+def test_concurrent_calls_under_quota_do_not_wait():
+    limiter = AdaptiveRateLimiter(rpm=15, max_concurrency=8)
+    barrier = threading.Barrier(4)
+    started = []
+
+    def call():
+        barrier.wait()
+        with limiter.slot(tokens=100):
+            started.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert limiter.waited == 0
+    assert max(started) - min(started) < 0.5
+
+
+def test_burst_beyond_quota_waits():
+    limiter = AdaptiveRateLimiter(rpm=600, max_concurrency=2)
+    for _ in range(61):
+        with limiter.slot(tokens=1):
+            pass
+    assert limiter.waited > 0
+
+
+def test_rate_limit_halves_the_window_and_success_grows_it_back():
+    limiter = AdaptiveRateLimiter(rpm=600, max_concurrency=8)
+    assert limiter.limit == 4
+
+    pause = limiter.on_rate_limited(RuntimeError("429 Too Many Requests, retry_delay: 0.01"))
+    assert pause == 0.01
+    assert limiter.limit == 2
+    limiter.on_rate_limited(RuntimeError("rate limit exceeded"))
+    assert limiter.limit == 1
+    assert limiter.rate_limited == 2
+
+    for _ in range(3):
+        limiter.on_success(latency=0.1, estimated_tokens=10, used_tokens=10)
+    assert 2 < limiter.limit < 3
+    assert limiter.stats()["rate_limited"] == 2
+
+
+def test_backoff_without_retry_hint_doubles():
+    limiter = AdaptiveRateLimiter(min_concurrency=1)
+    first = limiter.on_rate_limited(RuntimeError("429"))
+    second = limiter.on_rate_limited(RuntimeError("429"))
+    assert (first, second) == (2.0, 4.0)
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from public_health_triage_crew.report_renderer import _next_steps  # noqa: E402
+from public_health_triage_crew.schemas import TriageAssessment  # noqa: E402
+
+
+def triage(care_level, urgency="Soon", within="within 48 hours"):
+    return TriageAssessment(
+        care_level=care_level,
+        urgency=urgency,
+        seek_care_within=within,
+        symptom_analysis="Mild fever for two days.",
+        initial_care=["Drink plenty of fluids"],
+    )
+
+
+@pytest.mark.parametrize("care_level, step", [
+    ("Home Care", "1. Manage at home; see a health worker within 48 hours if symptoms do not improve."),
+    ("Primary Health Centre", "1. Go to a primary health centre within 48 hours."),
+    ("General Hospital", "1. Go to a general hospital within 48 hours."),
+    ("Teaching Hospital", "1. Go to a teaching hospital within 48 hours."),
+])
+def test_first_step_reads_naturally_for_each_care_level(care_level, step):
+    lines = _next_steps(triage(care_level), None)
+    assert lines[1] == step
+    assert lines[2] == "2. Drink plenty of fluids"
+
+
+def test_emergencies_go_to_the_emergency_department():
+    lines = _next_steps(triage("Teaching Hospital", urgency="Emergency", within="immediately"), None)
+    assert lines[1] == "1. Go to the emergency department now."
@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.crews.crew_output import CrewOutput  # noqa: E402
+from crewai.tasks.task_output import TaskOutput  # noqa: E402
+from crewai.types.usage_metrics import UsageMetrics  # noqa: E402
+
+from public_health_triage_crew.result_cache import (  # noqa: E402
+    DiskBackend,
+    MemoryBackend,
+    ResultCache,
+    age_band,
+    cache_key,
+)
+
+INTAKE = {
+    "patient_name": "Ada Obi",
+    "age": 34,
+    "gender": "Female",
+    "location": "Ibadan, Oyo",
+    "symptoms": "Fever and headache",
+    "selected_symptoms": ["Fever", "Headache"],
+    "assessment_date": "2026-10-18 09:00:00",
+    "current_year": 2026,
+    "phone": "08030000000",
+}
+
+
+def test_key_ignores_formatting_order_and_volatile_fields():
+    variant = dict(
+        INTAKE,
+        location="  IBADAN,   oyo ",
+        symptoms="fever and HEADACHE",
+        selected_symptoms=["headache", "fever"],
+        assessment_date="2026-10-19 17:30:00",
+        phone="",
+        age="40",
+    )
+    assert cache_key(variant) == cache_key(INTAKE)
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("patient_name", "Bola Ade"), ("symptoms", "Fever and chest pain"), ("location", "Kano"), ("age", 70)],
+)
+def test_key_changes_with_fields_that_shape_the_report(field, value):
+    assert cache_key(dict(INTAKE, **{field: value})) != cache_key(INTAKE)
+
+
+def test_age_bands():
+    assert [age_band(age) for age in (0.5, 3, 10, 16, 30, 60, 80)] == [
+        "infant", "under-5", "child", "adolescent", "adult", "older adult", "elderly"
+    ]
+    assert age_band("Unknown") == "unknown"
+
+
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+def test_outputs_round_trip(tmp_path, backend):
+    store = MemoryBackend() if backend == "memory" else DiskBackend(str(tmp_path / "results.sqlite3"))
+    cache = ResultCache(store)
+    output = CrewOutput(
+        raw="# Report",
+        token_usage=UsageMetrics(),
+        tasks_output=[TaskOutput(name="triage", description="Triage", agent="Triage", raw="Go to a PHC")],
+    )
+
+    assert cache.get(INTAKE) is None
+    cache.put(INTAKE, output)
+    cached = cache.get(dict(INTAKE, phone="0809"))
+
+    assert cached.raw == "# Report"
+    assert [task.raw for task in cached.tasks_output] == ["Go to a PHC"]
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    store = MemoryBackend(ttl=10)
+    clock = [1000.0]
+    monkeypatch.setattr("public_health_triage_crew.result_cache.time.time", lambda: clock[0])
+    store.set("key", "value")
+    clock[0] += 11
+    assert store.get("key") is None
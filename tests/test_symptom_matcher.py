@@ -0,0 +1,28 @@
+import pytest
+
+from public_health_triage_crew.tools.symptom_matcher import detect_critical_symptoms
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("No appetite and severe chest pain since morning", ["chest pain"]),
+        ("Not eating and cannot breathe", ["difficulty breathing"]),
+        ("No fever, just a cough with chest pain", ["chest pain"]),
+        ("Baby no dey breathe", ["not breathing"]),
+        ("She fits the profile", []),
+        ("He has been having fits the whole night", ["seizure"]),
+        ("No chest pain or difficulty breathing", []),
+        ("Denies chest pain", []),
+        ("No breathing problems, just a headache", []),
+        ("My father has stroke", ["stroke"]),
+        ("stroke", ["stroke"]),
+        ("He get stroke", ["stroke"]),
+        ("Had a stroke of luck at the market", []),
+        ("She is bleeding severely", ["severe bleeding"]),
+        ("He is bleeding heavily from the leg", ["severe bleeding"]),
+        ("Woman dey bleed heavily", ["severe bleeding"]),
+    ],
+)
+def test_detect_critical_symptoms(text, expected):
+    assert detect_critical_symptoms(text) == expected
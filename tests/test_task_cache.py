@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.tasks.task_output import TaskOutput  # noqa: E402
+
+from public_health_triage_crew.result_cache import MemoryBackend  # noqa: E402
+from public_health_triage_crew.task_cache import TaskOutputCache, condition_bucket, declared_key_fields  # noqa: E402
+
+FIELDS = ["location", "condition_bucket", "age_band"]
+
+
+@pytest.mark.parametrize(
+    "symptoms, selected, bucket",
+    [
+        ("I am 7 months pregnant and have a fever", [], "maternal"),
+        ("Chest pain and cough", [], "cardiovascular"),
+        ("Dry cough for a week", [], "respiratory"),
+        ("Watery diarrhoea since yesterday", [], "gastrointestinal"),
+        ("", ["Fever", "Chills"], "febrile"),
+        ("Itchy rash on the arms", [], "skin"),
+        ("Feeling tired", [], "general"),
+    ],
+)
+def test_condition_buckets(symptoms, selected, bucket):
+    assert condition_bucket({"symptoms": symptoms, "selected_symptoms": selected}) == bucket
+
+
+def test_patients_sharing_the_key_fields_share_an_entry():
+    first = {"patient_name": "Ada", "age": 30, "location": "Kano", "symptoms": "High fever"}
+    second = {"patient_name": "Bola", "age": 41, "location": "kano", "symptoms": "Malaria and chills"}
+    assert TaskOutputCache.key("finance", FIELDS, first) == TaskOutputCache.key("finance", FIELDS, second)
+
+
+@pytest.mark.parametrize("change", [{"location": "Lagos"}, {"age": 70}, {"symptoms": "Cough"}])
+def test_key_changes_with_each_declared_field(change):
+    intake = {"age": 30, "location": "Kano", "symptoms": "High fever"}
+    assert TaskOutputCache.key("finance", FIELDS, intake) != TaskOutputCache.key("finance", FIELDS, dict(intake, **change))
+
+
+def test_keys_are_per_task():
+    intake = {"age": 30, "location": "Kano", "symptoms": "High fever"}
+    assert TaskOutputCache.key("finance", FIELDS, intake) != TaskOutputCache.key("medicine", FIELDS, intake)
+
+
+def test_output_round_trip():
+    cache = TaskOutputCache(MemoryBackend())
+    intake = {"age": 30, "location": "Kano", "symptoms": "High fever"}
+    output = TaskOutput(name="finance", description="Finance", agent="Coach", raw="Enrol in NHIA")
+
+    assert cache.get("finance", FIELDS, intake) is None
+    cache.put("finance", FIELDS, intake, output)
+
+    assert cache.get("finance", FIELDS, dict(intake, age=35)).raw == "Enrol in NHIA"
+    assert cache.stats()["hits"] == 1
+
+
+def test_declared_key_fields():
+    assert declared_key_fields({"cache_key_fields": ["location"]}) == ["location"]
+    assert declared_key_fields({}) == []
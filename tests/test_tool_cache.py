@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from public_health_triage_crew.tools.tool_cache import SharedToolCache, ToolMemo  # noqa: E402
+
+
+def counter():
+    calls = []
+
+    def lookup(location):
+        calls.append(location)
+        return f"result for {location}"
+
+    return lookup, calls
+
+
+def test_repeats_within_a_run_are_served_from_the_run():
+    lookup, calls = counter()
+    memo = ToolMemo(shared=SharedToolCache(), ttls={"lookup": 0})
+
+    assert memo.call("lookup", lookup, "Lagos") == memo.call("lookup", lookup, location="Lagos")
+    assert calls == ["Lagos"]
+    assert memo.stats(run_only=True) == {"lookup": {"run_hits": 1, "shared_hits": 0, "misses": 1}}
+
+    memo.new_run()
+    memo.call("lookup", lookup, "Lagos")
+    assert calls == ["Lagos", "Lagos"]
+
+
+def test_memo_without_runs_keeps_nothing_beyond_the_shared_ttl():
+    lookup, calls = counter()
+    memo = ToolMemo(shared=SharedToolCache(), ttls={"lookup": 0}, per_run=False)
+
+    memo.call("lookup", lookup, "Lagos")
+    memo.call("lookup", lookup, "Lagos")
+
+    assert calls == ["Lagos", "Lagos"]
+    assert memo._run == {}
+
+
+def test_memo_without_runs_still_uses_the_shared_cache():
+    lookup, calls = counter()
+    shared = SharedToolCache()
+    memo = ToolMemo(shared=shared, ttls={"lookup": 60}, per_run=False)
+
+    memo.call("lookup", lookup, "Lagos")
+    memo.call("lookup", lookup, "Lagos")
+
+    assert calls == ["Lagos"]
+    assert memo.stats()["lookup"]["shared_hits"] == 1
+
+
+def test_failures_are_not_cached():
+    memo = ToolMemo(shared=SharedToolCache(), ttls={"lookup": 60})
+    calls = []
+
+    def failing(location):
+        calls.append(location)
+        return "Unable to get data"
+
+    memo.call("lookup", failing, "Lagos")
+    memo.call("lookup", failing, "Lagos")
+    assert len(calls) == 2
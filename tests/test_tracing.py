@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from public_health_triage_crew import tracing  # noqa: E402
+from public_health_triage_crew.tools.tool_cache import SharedToolCache, ToolMemo  # noqa: E402
+from public_health_triage_crew.tracing import RingBufferExporter, Tracer  # noqa: E402
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = RingBufferExporter()
+    monkeypatch.setattr(tracing, "_tracer", Tracer([exporter]))
+    return exporter
+
+
+def traced_call(memo, func, location):
+    tracer = tracing.get_tracer()
+    tracer.on_tool_started(None, SimpleNamespace(agent=None, tool_name="lookup", agent_role="Triage"))
+    result = memo.call("lookup", func, location)
+    tracer.on_tool_finished(None, SimpleNamespace(error=None, from_cache=False))
+    return result
+
+
+def test_tool_spans_record_memo_hits(exporter):
+    memo = ToolMemo(shared=SharedToolCache(), ttls={"lookup": 60})
+
+    def lookup(location):
+        return f"result for {location}"
+
+    traced_call(memo, lookup, "Lagos")
+    traced_call(memo, lookup, "Lagos")
+    memo.new_run()
+    traced_call(memo, lookup, "Lagos")
+
+    spans = [span["attributes"] for span in exporter.spans()]
+    assert [(span["from_cache"], span["cache"]) for span in spans] == [
+        (False, "misses"),
+        (True, "run_hits"),
+        (True, "shared_hits"),
+    ]
+
+
+def test_disabled_tracer_ignores_cache_results(monkeypatch):
+    monkeypatch.setattr(tracing, "_tracer", Tracer())
+    tracing.get_tracer().tool_cache_result("run_hits")
@@ -0,0 +1,133 @@
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from public_health_triage_crew.tools import weather_risk  # noqa: E402
+from public_health_triage_crew.tools.location_resolver import Place  # noqa: E402
+from public_health_triage_crew.tools.weather_risk import (  # noqa: E402
+    WeatherRiskCache,
+    WeatherRiskGrid,
+    heat_index_c,
+    parse_observations,
+)
+
+PLACES = [
+    Place("NG-AA", "state", "Alpha", "Alpha", "NG-AA", 10.0, 10.0),
+    Place("NG-BB", "state", "Bravo", "Bravo", "NG-BB", 5.0, 5.0),
+]
+
+
+def observations(*rows):
+    """Stations as (latitude, longitude, temperature_c, relative_humidity, pm10) rows"""
+    columns = np.array(rows, dtype=float).T
+    names = ("latitude", "longitude", "temperature_c", "relative_humidity", "pm10")
+    data = dict(zip(names, columns))
+    data["observed_at"] = np.array([""] * len(rows), dtype=object)
+    return data
+
+
+def test_heat_index_matches_the_nws_table():
+    # 90°F at 60% humidity feels like 100°F
+    assert heat_index_c(np.array([32.22]), np.array([60.0]))[0] == pytest.approx(37.8, abs=0.3)
+    # Below 80°F the simple formula applies and stays close to the air temperature
+    assert heat_index_c(np.array([25.0]), np.array([50.0]))[0] == pytest.approx(24.9, abs=0.3)
+
+
+def test_each_place_takes_its_nearest_station_bands():
+    grid = WeatherRiskGrid(PLACES, observations((10.1, 10.1, 25.0, 50.0, 40.0), (5.1, 5.1, 35.0, 70.0, 200.0)))
+    mild, hot = grid.lookup(PLACES[0]), grid.lookup(PLACES[1])
+    assert (mild.heat_stress, mild.humidity_risk, mild.air_quality) == ("none", "low", "good")
+    assert mild.risks == []
+    assert (hot.heat_stress, hot.humidity_risk, hot.air_quality) == ("danger", "moderate", "unhealthy for sensitive groups")
+    assert hot.location == "Bravo State"
+    assert any("Poor air quality" in risk for risk in hot.risks)
+
+
+def test_band_edges_fall_in_the_upper_band():
+    grid = WeatherRiskGrid(PLACES[:1], observations((10.0, 10.0, 20.0, 80.0, 55.0)))
+    risk = grid.lookup(PLACES[0])
+    assert (risk.humidity_risk, risk.air_quality) == ("high", "moderate")
+
+
+def test_dry_dusty_air_is_flagged_as_harmattan():
+    grid = WeatherRiskGrid(PLACES[:1], observations((10.0, 10.0, 30.0, 20.0, 300.0)))
+    risk = grid.lookup(PLACES[0])
+    assert risk.harmattan and risk.air_quality == "unhealthy"
+    assert any("Harmattan" in line for line in risk.risks)
+    assert not any("Poor air quality" in line for line in risk.risks)
+
+
+def test_points_off_the_grid_are_assessed_on_the_spot():
+    grid = WeatherRiskGrid(PLACES, observations((10.0, 10.0, 25.0, 50.0, 40.0), (5.0, 5.0, 25.0, 90.0, 40.0)))
+    point = Place("5.2000,5.2000", "point", "5.2000, 5.2000", "", "", 5.2, 5.2)
+    assert grid.lookup(point).humidity_risk == "high"
+
+
+def test_no_observations_is_an_error():
+    with pytest.raises(ValueError):
+        WeatherRiskGrid(PLACES, parse_observations("latitude,longitude,temperature_c,relative_humidity,pm10\n"))
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Replace load_grid with a counter; a build raises while builds.fail is set"""
+    class Builds:
+        count = 0
+        fail = False
+        done = threading.Event()
+
+    def load_grid(source):
+        try:
+            if Builds.fail:
+                raise IOError("station feed down")
+            Builds.count += 1
+            return WeatherRiskGrid(PLACES, observations((10.0, 10.0, 25.0, 50.0, 40.0)))
+        finally:
+            Builds.done.set()
+
+    monkeypatch.setattr(weather_risk, "load_grid", load_grid)
+    return Builds
+
+
+def wait_for_refresh(builds):
+    assert builds.done.wait(5)
+    for thread in threading.enumerate():
+        if thread.name == "weather-risk-refresh":
+            thread.join(5)
+
+
+def test_fresh_grid_is_served_without_rebuilding(builds):
+    cache = WeatherRiskCache("unused", ttl=60)
+    first = cache.grid()
+    assert cache.grid() is first
+    assert builds.count == 1
+
+
+def test_stale_grid_is_served_while_a_rebuild_runs(builds):
+    cache = WeatherRiskCache("unused", ttl=60)
+    stale = cache.grid()
+    stale.built_at -= 120
+    builds.done.clear()
+    assert cache.grid() is stale
+    wait_for_refresh(builds)
+    assert builds.count == 2
+    assert cache.grid() is not stale
+    assert cache.last_error is None
+
+
+def test_failed_rebuild_keeps_the_old_grid_until_the_next_ttl(builds):
+    cache = WeatherRiskCache("unused", ttl=60)
+    stale = cache.grid()
+    stale.built_at -= 120
+    builds.fail = True
+    builds.done.clear()
+    cache.grid()
+    wait_for_refresh(builds)
+    assert cache.grid() is stale
+    assert cache.last_error == "station feed down"
+    # The failed attempt counts as a refresh, so no rebuild is retried before the TTL
+    builds.done.clear()
+    cache.grid()
+    assert not builds.done.wait(0.1)